@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.transient import (
+    EnsembleIntegrator,
+)
+
+# a steel pipe cooling from random initial temperatures
+L = 5.0
+D = 0.5
+THRM_COND = 45.0
+DENSITY = 7850.0
+SPEC_HEAT_CAP = 490.0
+HEAT_TRANS_COEF = 2.0
+T_INF = 35.0
+DT = 60.0
+NUM_STEPS = 100
+
+
+def build_mesh(num_nodes):
+    mesh = Mesh.from_coords(np.linspace(0.0, L, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = THRM_COND
+            ip.density = DENSITY
+            ip.spec_heat_cap = SPEC_HEAT_CAP
+            ip.heat_trans_coef = HEAT_TRANS_COEF
+            ip.perimeter = np.pi * D
+            ip.area = 0.25 * np.pi * D ** 2
+            ip.temp_inf = T_INF
+    return mesh
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'nodes':>8} {'k':>5} {'separate [s]':>13} {'ensemble [s]':>13}"
+          f" {'speedup':>8} {'max diff':>10}")
+    for num_nodes in (1_001, 10_001):
+        mesh = build_mesh(num_nodes)
+        fixed = [0, num_nodes - 1]
+        for k in (10, 100):
+            temps = rng.uniform(0.0, 100.0, (num_nodes, k))
+            fixed_temps = temps[fixed]
+
+            tic = time.perf_counter()
+            separate = np.empty_like(temps)
+            for j in range(k):
+                it = EnsembleIntegrator(mesh, temps[:, [j]], DT, fixed,
+                                        fixed_temps[:, [j]])
+                separate[:, j] = it.step(NUM_STEPS)[:, 0]
+            t_separate = time.perf_counter() - tic
+
+            tic = time.perf_counter()
+            ens = EnsembleIntegrator(mesh, temps, DT, fixed, fixed_temps)
+            ens.step(NUM_STEPS)
+            t_ensemble = time.perf_counter() - tic
+
+            diff = np.abs(ens.temps - separate).max()
+            print(f"{num_nodes:>8} {k:>5} {t_separate:>13.3f}"
+                  f" {t_ensemble:>13.3f} {t_separate / t_ensemble:>8.1f}"
+                  f" {diff:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
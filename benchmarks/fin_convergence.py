@@ -0,0 +1,180 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from goph420_examples.assembly import (  # noqa: E402
+    apply_dirichlet,
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+)
+from goph420_examples.functions import (  # noqa: E402
+    fin_temperature,
+)
+from goph420_examples.interpolation import (  # noqa: E402
+    shape,
+)
+from goph420_examples.mesh import (  # noqa: E402
+    Mesh,
+)
+from goph420_examples.solvers import (  # noqa: E402
+    ConjugateGradientSolver,
+    SteadyStateSolver,
+)
+
+# the steady state pipe problem of examples/steady_state_heat.py
+T_0 = 2.0
+T_L = 18.0
+T_INF = 35.0
+L = 5.0
+D = 0.5
+THRM_COND = 25.0
+HEAT_TRANS_COEF = 2.0
+PERIMETER = np.pi * D
+AREA = 0.25 * np.pi * D ** 2
+
+NUM_ELEMENTS = (10, 40, 160, 640, 2_560, 10_240, 40_960)
+# element orders supported by interpolation.shape
+ORDERS = (1,)
+BACKENDS = (
+    "lu",
+    "lu-mixed",
+    "lu-float32",
+    "cg-jacobi",
+    "cg-ichol",
+    "cg-multigrid",
+)
+
+# 5-point Gauss-Legendre rule on [0, 1] for the L2 error
+_GAUSS_S, _GAUSS_W = np.polynomial.legendre.leggauss(5)
+_GAUSS_S = 0.5 * (_GAUSS_S + 1.0)
+_GAUSS_W = 0.5 * _GAUSS_W
+
+
+def exact(x):
+    return fin_temperature(x, L, T_0, T_L, T_INF, THRM_COND,
+                           HEAT_TRANS_COEF, PERIMETER, AREA)
+
+
+def build_mesh(num_elements, order, dtype):
+    x = np.linspace(0.0, L, order * num_elements + 1)
+    mesh = Mesh.from_coords(x, order=order, dtype=dtype)
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = THRM_COND
+            ip.heat_trans_coef = HEAT_TRANS_COEF
+            ip.perimeter = PERIMETER
+            ip.area = AREA
+            ip.temp_inf = T_INF
+    return mesh
+
+
+def solve(mesh, backend):
+    """The temperatures and the number of nonzeros of the sparse
+    LU factors, which SuperLU allocates outside of tracemalloc.
+    Zero for the conjugate gradient backends."""
+    fixed = np.array([0, mesh.num_nodes - 1])
+    fixed_temps = np.array([T_0, T_L])
+    if backend.startswith("lu"):
+        precision = "mixed" if backend == "lu-mixed" else "native"
+        solver = SteadyStateSolver(mesh, fixed, precision)
+        lu = solver.factorization
+        lu = getattr(lu, "lu", lu)
+        return solver.solve(fixed_temps), lu.L.nnz + lu.U.nnz
+    H = assemble_conduction_matrix(mesh)
+    Q = assemble_flux_vector(mesh)
+    H_ff, Q_f, free = apply_dirichlet(H, Q, fixed, fixed_temps)
+    cg = ConjugateGradientSolver(
+        H_ff, backend[3:], coords=mesh.coords[free], tol=1.0e-12)
+    T = np.empty(mesh.num_nodes)
+    T[free] = cg.solve(Q_f)
+    T[fixed] = fixed_temps
+    return T, 0
+
+
+def errors(mesh, temps):
+    """The L2 norm of the error over the pipe
+    and the largest nodal error."""
+    conn = mesh.connectivity
+    N = shape(_GAUSS_S, conn.shape[1] - 1)
+    x_q = mesh.coords[conn] @ N.T
+    T_q = np.asarray(temps, dtype=float)[conn] @ N.T
+    err2 = ((T_q - exact(x_q)) ** 2) @ _GAUSS_W
+    l2 = np.sqrt(np.sum(err2 * mesh.jacobians))
+    max_err = np.abs(temps - exact(mesh.coords)).max()
+    return l2, max_err
+
+
+def run():
+    results = []
+    for order in ORDERS:
+        for backend in BACKENDS:
+            dtype = np.float32 if backend == "lu-float32" else np.float64
+            for num_elements in NUM_ELEMENTS:
+                mesh = build_mesh(num_elements, order, dtype)
+                tracemalloc.start()
+                tic = time.perf_counter()
+                T, factor_nnz = solve(mesh, backend)
+                runtime = time.perf_counter() - tic
+                # python allocations only, see factor_nnz
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                l2, max_err = errors(mesh, T)
+                results.append((order, backend, mesh.num_nodes, l2,
+                                max_err, runtime, peak, factor_nnz))
+                print(f"{order:>5} {backend:>13} {mesh.num_nodes:>8}"
+                      f" {l2:>10.2e} {max_err:>10.2e}"
+                      f" {runtime:>10.4f} {peak / 1e6:>10.2f}"
+                      f" {factor_nnz:>11}")
+    return results
+
+
+def plot(results, path):
+    fig, ax = plt.subplots(figsize=(8.0, 5.0))
+    for order in ORDERS:
+        for backend in BACKENDS:
+            rows = [r for r in results if r[:2] == (order, backend)]
+            ax.loglog([r[5] for r in rows], [r[3] for r in rows], "o-",
+                      label=f"p={order} {backend}")
+    ax.set_xlabel("runtime [s]")
+    ax.set_ylabel("L2 error")
+    ax.set_title("Accuracy versus cost, steady state fin")
+    ax.legend(fontsize="small")
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convergence and cost of steady state solves "
+                    "against the analytic fin solution.")
+    parser.add_argument("--tol", type=float, default=1.0e-4,
+                        help="the required L2 error")
+    parser.add_argument("--plot", default="benchmarks/fin_convergence.png",
+                        help="where to save the accuracy-cost curves")
+    args = parser.parse_args()
+
+    print(f"{'order':>5} {'backend':>13} {'nodes':>8} {'L2 err':>10}"
+          f" {'max err':>10} {'time [s]':>10} {'py [MB]':>10}"
+          f" {'factor nnz':>11}")
+    results = run()
+    plot(results, args.plot)
+
+    passing = [r for r in results if r[3] <= args.tol]
+    if not passing:
+        print(f"\nno configuration reaches an L2 error of {args.tol:.1e}")
+        return
+    order, backend, num_nodes, l2, _, runtime, _, _ = min(
+        passing, key=lambda r: r[5])
+    print(f"\ncheapest configuration with L2 error <= {args.tol:.1e}:"
+          f" order {order}, {backend}, {num_nodes} nodes"
+          f" ({l2:.2e} in {runtime:.4f} s)")
+
+
+if __name__ == "__main__":
+    main()
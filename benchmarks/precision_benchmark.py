@@ -0,0 +1,72 @@
+import time
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.solvers import (
+    SteadyStateSolver,
+)
+
+# the steady state pipe problem of examples/steady_state_heat.py
+T_0 = 2.0
+T_L = 18.0
+T_INF = 35.0
+L = 5.0
+D = 0.5
+THRM_COND = 25.0
+HEAT_TRANS_COEF = 2.0
+
+# (label, mesh dtype, solver precision)
+MODES = (
+    ("float64", np.float64, "native"),
+    ("float32", np.float32, "native"),
+    ("mixed", np.float64, "mixed"),
+)
+
+
+def build_mesh(num_nodes, dtype):
+    mesh = Mesh.from_coords(np.linspace(0.0, L, num_nodes), dtype=dtype)
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = THRM_COND
+            ip.heat_trans_coef = HEAT_TRANS_COEF
+            ip.perimeter = np.pi * D
+            ip.area = 0.25 * np.pi * D ** 2
+            ip.temp_inf = T_INF
+    return mesh
+
+
+def factor_bytes(lu):
+    lu = getattr(lu, "lu", lu)
+    return (lu.L.nnz + lu.U.nnz) * lu.L.dtype.itemsize
+
+
+def main():
+    print(f"{'nodes':>8} {'mode':>8} {'factor [s]':>11} {'solve [s]':>10}"
+          f" {'factors [kB]':>13} {'max err':>10} {'refine':>7}")
+    for num_nodes in (1_001, 10_001, 100_001):
+        reference = None
+        for label, dtype, precision in MODES:
+            mesh = build_mesh(num_nodes, dtype)
+            fixed = [0, num_nodes - 1]
+            tic = time.perf_counter()
+            solver = SteadyStateSolver(mesh, fixed, precision=precision)
+            t_factor = time.perf_counter() - tic
+            tic = time.perf_counter()
+            T = solver.solve([T_0, T_L])
+            t_solve = time.perf_counter() - tic
+            if reference is None:
+                reference = T
+            err = np.abs(T.astype(np.float64) - reference).max()
+            stats = getattr(solver.factorization, "stats", None)
+            refine = "-" if stats is None else str(stats.iterations)
+            print(f"{num_nodes:>8} {label:>8} {t_factor:>11.4f}"
+                  f" {t_solve:>10.5f}"
+                  f" {factor_bytes(solver.factorization) / 1e3:>13.1f}"
+                  f" {err:>10.2e} {refine:>7}")
+
+
+if __name__ == "__main__":
+    main()
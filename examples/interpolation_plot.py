@@ -2,28 +2,20 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 from goph420_examples.interpolation import (
-    shape,
+    PiecewiseInterpolator,
 )
 
 
 def main():
-    x = np.linspace(-5.0, 5.0, 11)
+    x = np.linspace(-5.0, 5.0, 13)
     y = np.exp(x)
-    xi = []
-    yi = []
-    s = np.linspace(0, 1, 5)
-    for i, _ in enumerate(x[:-1]):
-        xd = x[i:i+2]
-        yd = y[i:i+2]
-        for sj in s:
-            N = shape(sj)
-            x_i = N @ xd
-            y_i = N @ yd
-            xi.append(x_i)
-            yi.append(y_i)
+    xi = np.linspace(-5.0, 5.0, 241)
 
     plt.plot(x, y, 'ok', label='data')
-    plt.plot(xi, yi, '--r', label='shape')
+    for order, style in zip((1, 2, 3), ('--r', '-.b', ':g')):
+        f = PiecewiseInterpolator(x, y, order=order)
+        plt.plot(xi, f(xi, assume_sorted=True), style,
+                 label=f'order {order}')
     plt.xlabel('x')
     plt.ylabel('y = exp(x)')
     plt.legend()
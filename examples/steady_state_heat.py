@@ -5,6 +5,13 @@ from goph420_examples.classes import (
     Node,
     Element,
 )
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.plotting import (
+    plot_field,
+    plot_mesh,
+)
 
 
 def main():
@@ -42,14 +49,10 @@ def main():
         )
 
     # plot the mesh
+    # markers are decimated to the figure resolution and
+    # labels are only drawn for small meshes
     plt.figure(figsize=(8.0, 3.0))
-    plt.plot([nd.x for nd in nodes], np.zeros(nnod), "or", label="nodes")
-    for nd in nodes:
-        plt.text(nd.x, -0.02, f"{nd.index}", color="r")
-    plt.plot([e.int_pts[0].x for e in elements],
-             np.zeros(nnod-1), "xg", label="int_pts")
-    for k, e in enumerate(elements):
-        plt.text(e.int_pts[0].x, 0.02, f"{k}", color="g")
+    plot_mesh(plt.gca(), Mesh(nodes, elements))
     plt.xlabel("x [m]")
     plt.legend()
     plt.title("Finite Element Mesh")
@@ -103,7 +106,7 @@ def main():
 
     # TODO: plot the temperature distribution
     plt.figure(figsize=(8.0, 3.0))
-    plt.plot(x, Tg, "-r", label="temp dist")
+    plot_field(plt.gca(), x, Tg, "-r", label="temp dist")
     plt.plot([x[0], x[-1]], [T_inf, T_inf], "--k", label="ambient")
     plt.xlabel("x [m]")
     plt.ylabel("temp [deg C]")
@@ -0,0 +1,125 @@
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .interpolation import (
+    reference_matrices,
+)
+from .mesh import (
+    PointLocator,
+)
+from .solvers import (
+    SteadyStateSolver,
+)
+
+
+class Sensitivities(NamedTuple):
+    """Gradients of a scalar objective
+    with respect to the properties of each element.
+
+    Attributes
+    ----------
+    thrm_cond : numpy.ndarray, shape=(num_elements,)
+        dJ/d(thrm_cond) of each element.
+    heat_trans_coef : numpy.ndarray, shape=(num_elements,)
+        dJ/d(heat_trans_coef) of each element.
+    """
+    thrm_cond: npt.NDArray[np.floating]
+    heat_trans_coef: npt.NDArray[np.floating]
+
+
+def probe_misfit(
+    locator: PointLocator,
+    temps: npt.ArrayLike,
+    xs: npt.ArrayLike,
+    observed: npt.ArrayLike,
+):
+    """Compute the least squares misfit between a temperature field
+    and measurements at probe points, and its gradient.
+
+    The misfit is J = 0.5 * sum((T(xs) - observed) ** 2).
+
+    Inputs
+    ------
+    locator : PointLocator
+        The point-location index of the mesh.
+    temps : array_like, shape=(num_nodes,)
+        The nodal temperatures.
+    xs : array_like, shape=(m,)
+        The probe positions.
+    observed : array_like, shape=(m,)
+        The measured temperatures.
+
+    Returns
+    -------
+    J : float
+        The misfit.
+    dJ_dT : numpy.ndarray, shape=(num_nodes,)
+        The gradient of the misfit with respect to the nodal temperatures.
+
+    Raises
+    ------
+    ValueError
+        If any probe position is outside the mesh.
+    """
+    P = locator.probe_matrix(xs)
+    if np.any(np.diff(P.indptr) == 0):
+        raise ValueError("probe positions must be inside the mesh")
+    residual = P @ np.asarray(temps, dtype=float) - observed
+    return 0.5 * float(residual @ residual), P.T @ residual
+
+
+def adjoint_sensitivities(
+    solver: SteadyStateSolver,
+    temps: npt.ArrayLike,
+    dJ_dT: npt.ArrayLike,
+) -> Sensitivities:
+    """Compute the gradient of a scalar objective J(T)
+    with respect to the properties of every element
+    using one adjoint solve with the forward factorization.
+
+    With residual R(T, p) = H(p) T - Q(p) on the free nodes
+    and adjoint H_ff^T lam = dJ/dT_f, the gradient is
+    dJ/dp = -lam^T dR/dp.
+
+    Inputs
+    ------
+    solver : SteadyStateSolver
+        The factorized forward solver.
+        The mesh properties must not have changed since
+        the last factorization.
+    temps : array_like, shape=(num_nodes,)
+        The forward solution.
+    dJ_dT : array_like, shape=(num_nodes,)
+        The gradient of the objective with respect to the
+        nodal temperatures. Values at fixed nodes are ignored.
+
+    Returns
+    -------
+    Sensitivities
+    """
+    mesh = solver.mesh
+    temps = np.asarray(temps, dtype=float)
+    dJ_dT = np.asarray(dJ_dT, dtype=float)
+    lam = np.zeros(mesh.num_nodes)
+    lam[solver.free] = solver.factorization.solve(
+        dJ_dT[solver.free], trans="T")
+
+    conn = mesh.connectivity
+    jac = mesh.jacobians
+    mass, stiffness, load = reference_matrices(conn.shape[1] - 1)
+    P = mesh.int_pt_values("perimeter")[:, 0]
+    A = mesh.int_pt_values("area")[:, 0]
+    T_inf = mesh.int_pt_values("temp_inf")[:, 0]
+    T_e = temps[conn]
+    lam_e = lam[conn]
+
+    # dH_e/d(thrm_cond) = A K / jac
+    d_cond = np.einsum("ei,ij,ej->e", lam_e, stiffness, T_e) * (A / jac)
+    # dH_e/dh = P jac M, dQ_e/dh = P jac T_inf load
+    d_conv = P * jac * (
+        np.einsum("ei,ij,ej->e", lam_e, mass, T_e)
+        - T_inf * (lam_e @ load)
+    )
+    return Sensitivities(thrm_cond=-d_cond, heat_trans_coef=-d_conv)
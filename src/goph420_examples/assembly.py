@@ -0,0 +1,254 @@
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+
+from .interpolation import (
+    reference_matrices,
+)
+from .mesh import (
+    Mesh,
+)
+
+
+def assemble_conduction_matrix(mesh: Mesh) -> sparse.csr_matrix:
+    """Assemble the global conduction matrix.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+        The result has the mesh dtype.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix, shape=(num_nodes, num_nodes)
+    """
+    mats = np.empty(
+        (mesh.num_elements,) + _element_shape(mesh) * 2, dtype=mesh.dtype,
+    )
+    for e, out in zip(mesh.elements, mats):
+        e.compute_conduction_matrix(out=out)
+    return stamp_element_matrices(mesh, mats)
+
+
+def assemble_storage_matrix(mesh: Mesh) -> sparse.csr_matrix:
+    """Assemble the global storage matrix.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+        The result has the mesh dtype.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix, shape=(num_nodes, num_nodes)
+    """
+    mats = np.empty(
+        (mesh.num_elements,) + _element_shape(mesh) * 2, dtype=mesh.dtype,
+    )
+    for e, out in zip(mesh.elements, mats):
+        e.compute_storage_matrix(out=out)
+    return stamp_element_matrices(mesh, mats)
+
+
+def assemble_mass_matrix(mesh: Mesh) -> sparse.csr_matrix:
+    """Assemble the global (consistent) mass matrix,
+    the integral of N_i * N_j over the mesh.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+        The result has the mesh dtype.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix, shape=(num_nodes, num_nodes)
+    """
+    mass, _, _ = reference_matrices(mesh.connectivity.shape[1] - 1)
+    mats = mesh.jacobians[:, None, None] * mass.astype(mesh.dtype)
+    return stamp_element_matrices(mesh, mats)
+
+
+def assemble_lumped_storage(mesh: Mesh) -> npt.NDArray[np.floating]:
+    """Assemble the row-sum lumped (diagonal) global storage matrix.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+        The result has the mesh dtype.
+
+    Returns
+    -------
+    numpy.ndarray, shape=(num_nodes,)
+        The diagonal of the lumped storage matrix.
+    """
+    mats = np.empty(
+        (mesh.num_elements,) + _element_shape(mesh) * 2, dtype=mesh.dtype,
+    )
+    for e, out in zip(mesh.elements, mats):
+        e.compute_storage_matrix(out=out)
+    return np.bincount(
+        mesh.connectivity.ravel(),
+        weights=mats.sum(axis=2).ravel(),
+        minlength=mesh.num_nodes,
+    ).astype(mesh.dtype)
+
+
+def assemble_flux_vector(mesh: Mesh) -> npt.NDArray[np.floating]:
+    """Assemble the global flux vector.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+        The result has the mesh dtype.
+
+    Returns
+    -------
+    numpy.ndarray, shape=(num_nodes,)
+    """
+    vecs = np.empty(
+        (mesh.num_elements,) + _element_shape(mesh), dtype=mesh.dtype,
+    )
+    for e, out in zip(mesh.elements, vecs):
+        e.compute_flux_vector(out=out)
+    return np.bincount(
+        mesh.connectivity.ravel(),
+        weights=vecs.ravel(),
+        minlength=mesh.num_nodes,
+    ).astype(mesh.dtype)
+
+
+def assemble_unit_flux_vector(mesh: Mesh) -> npt.NDArray[np.floating]:
+    """Assemble the global flux vector for a unit ambient temperature.
+
+    The flux vector is linear in temp_inf, so for a uniform
+    ambient temperature T_inf the flux vector is
+    T_inf times this vector.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+        The result has the mesh dtype.
+
+    Returns
+    -------
+    numpy.ndarray, shape=(num_nodes,)
+    """
+    _, _, load = reference_matrices(mesh.connectivity.shape[1] - 1)
+    # element properties are taken from the first integration point,
+    # consistent with the element matrices
+    h = mesh.int_pt_values("heat_trans_coef")[:, 0]
+    P = mesh.int_pt_values("perimeter")[:, 0]
+    vecs = np.outer(h * P * mesh.jacobians, load)
+    return np.bincount(
+        mesh.connectivity.ravel(),
+        weights=vecs.ravel(),
+        minlength=mesh.num_nodes,
+    ).astype(mesh.dtype)
+
+
+def assemble_source_vector(mesh: Mesh) -> npt.NDArray[np.floating]:
+    """Assemble the global load vector for a unit volumetric
+    heat source, the integral of N_i over the pipe volume.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+        The result has the mesh dtype.
+
+    Returns
+    -------
+    numpy.ndarray, shape=(num_nodes,)
+    """
+    _, _, load = reference_matrices(mesh.connectivity.shape[1] - 1)
+    A = mesh.int_pt_values("area")[:, 0]
+    vecs = np.outer(A * mesh.jacobians, load)
+    return np.bincount(
+        mesh.connectivity.ravel(),
+        weights=vecs.ravel(),
+        minlength=mesh.num_nodes,
+    ).astype(mesh.dtype)
+
+
+def stamp_element_matrices(mesh: Mesh, mats) -> sparse.csr_matrix:
+    """Stamp element matrices into a global sparse matrix.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+    mats : numpy.ndarray, shape=(num_elements, k, k)
+        The element matrices, in the order of mesh.elements,
+        where k is the number of nodes per element.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix, shape=(num_nodes, num_nodes)
+    """
+    conn = mesh.connectivity
+    k = conn.shape[1]
+    rows = np.repeat(conn, k, axis=1).ravel()
+    cols = np.tile(conn, (1, k)).ravel()
+    # duplicate entries are summed on conversion to csr
+    return sparse.coo_matrix(
+        (np.ravel(mats), (rows, cols)),
+        shape=(mesh.num_nodes, mesh.num_nodes),
+    ).tocsr()
+
+
+def apply_dirichlet(H, Q, fixed, values):
+    """Eliminate prescribed nodal temperatures from a global system.
+
+    Inputs
+    ------
+    H : scipy.sparse matrix or numpy.ndarray, shape=(n, n)
+        The global system matrix.
+    Q : numpy.ndarray, shape=(n,) or (n, k)
+        The global right-hand side vector(s).
+    fixed : array_like of int
+        The global indices of nodes with prescribed temperature.
+    values : array_like, shape=(len(fixed),) or (len(fixed), k)
+        The prescribed temperatures.
+
+    Returns
+    -------
+    H_ff : same type as H
+        The system matrix for the free nodes.
+    Q_f : numpy.ndarray
+        The right-hand side for the free nodes,
+        with the contribution of the fixed nodes moved across.
+    free : numpy.ndarray of int
+        The global indices of the free nodes.
+
+    Raises
+    ------
+    ValueError
+        If fixed contains repeated indices.
+        If fixed and values have different lengths.
+    """
+    n = H.shape[0]
+    fixed = np.asarray(fixed, dtype=int)
+    values = np.asarray(values, dtype=H.dtype)
+    if len(np.unique(fixed)) != len(fixed):
+        raise ValueError("fixed node indices must be unique")
+    if len(values) != len(fixed):
+        raise ValueError(
+            f"got {len(values)} values for {len(fixed)} fixed nodes"
+        )
+    free = np.setdiff1d(np.arange(n), fixed)
+    if sparse.issparse(H):
+        H = H.tocsr()
+    H_ff = H[free][:, free]
+    H_fc = H[free][:, fixed]
+    Q_f = np.asarray(Q)[free] - H_fc @ values
+    return H_ff, Q_f, free
+
+
+def _element_shape(mesh):
+    return (mesh.connectivity.shape[1],)
@@ -0,0 +1,226 @@
+import hashlib
+import os
+
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+
+from .checkpoint import (
+    atomic_savez,
+    mesh_fingerprint,
+)
+from .mesh import (
+    Mesh,
+)
+from .solvers import (
+    SteadyStateSolver,
+    TriangularFactors,
+)
+
+
+class SolutionCache:
+    """Content-addressed on-disk cache of steady-state
+    factorizations and solutions.
+
+    Entries are keyed on a SHA-256 hash of the mesh geometry
+    and integration point properties (see mesh_fingerprint),
+    the fixed node indices and, for solutions, the fixed
+    temperatures. The mesh fingerprint is kept with the mesh until
+    a property changes, so a repeated request for the same mesh
+    object is answered from disk without a pass over the mesh.
+    A request with the same mesh and fixed nodes but new fixed
+    temperatures reuses the cached factorization and skips
+    assembly. The cache is bounded in size by deleting the least
+    recently used entries.
+
+    Attributes
+    ----------
+    directory
+    max_bytes
+    size
+    num_hits
+    num_factor_hits
+    num_misses
+
+    Parameters
+    ----------
+    directory : str
+        The cache directory, created if it does not exist.
+    max_bytes : int, optional, default=2**28
+        The largest total size of the cache files.
+
+    Raises
+    ------
+    ValueError
+        If max_bytes < 0.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 2 ** 28):
+        max_bytes = int(max_bytes)
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes {max_bytes} must be >= 0")
+        self._directory = os.fspath(directory)
+        os.makedirs(self._directory, exist_ok=True)
+        self._max_bytes = max_bytes
+        self.num_hits = 0
+        self.num_factor_hits = 0
+        self.num_misses = 0
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def size(self) -> int:
+        """The total size of the cache files in bytes.
+
+        Returns
+        -------
+        int
+        """
+        return sum(os.path.getsize(path) for path in self._entries())
+
+    def solve(
+        self,
+        mesh: Mesh,
+        fixed: npt.ArrayLike,
+        fixed_temps: npt.ArrayLike,
+    ) -> npt.NDArray[np.floating]:
+        """Solve the steady state problem, using cached results.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            The finite element mesh.
+        fixed : array_like of int
+            The global indices of nodes with prescribed temperature.
+        fixed_temps : array_like, shape=(len(fixed),) or (len(fixed), k)
+            The prescribed temperatures.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,) or (num_nodes, k)
+        """
+        fingerprint = mesh_fingerprint(mesh)
+        fixed = np.asarray(fixed, dtype=int)
+        fixed_temps = np.asarray(fixed_temps, dtype=float)
+        key = _hash(fingerprint, fixed, fixed_temps)
+        temps = self._load(key, "sol")
+        if temps is not None:
+            self.num_hits += 1
+            return temps["temps"]
+        solver = self._solver(mesh, fixed, fingerprint)
+        temps = solver.solve(fixed_temps)
+        self._store(key, "sol", {"temps": temps})
+        return temps
+
+    def solver(self, mesh: Mesh, fixed: npt.ArrayLike) -> SteadyStateSolver:
+        """Get a steady state solver, using a cached factorization.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            The finite element mesh.
+        fixed : array_like of int
+            The global indices of nodes with prescribed temperature.
+
+        Returns
+        -------
+        SteadyStateSolver
+        """
+        return self._solver(mesh, np.asarray(fixed, dtype=int),
+                            mesh_fingerprint(mesh))
+
+    def clear(self) -> None:
+        """Delete all cache files."""
+        for path in self._entries():
+            os.unlink(path)
+
+    def _solver(self, mesh, fixed, fingerprint):
+        key = _hash(fingerprint, fixed)
+        data = self._load(key, "lu")
+        if data is not None:
+            self.num_factor_hits += 1
+            n = len(data["perm_r"])
+            L = sparse.csr_matrix(
+                (data["L_data"], data["L_indices"], data["L_indptr"]),
+                shape=(n, n))
+            U = sparse.csr_matrix(
+                (data["U_data"], data["U_indices"], data["U_indptr"]),
+                shape=(n, n))
+            H_fc = sparse.csr_matrix(
+                (data["H_fc_data"], data["H_fc_indices"],
+                 data["H_fc_indptr"]),
+                shape=(n, len(fixed)))
+            factors = TriangularFactors(L, U, data["perm_r"], data["perm_c"])
+            return SteadyStateSolver.from_system(
+                mesh, fixed, factors, H_fc, data["Q_f"])
+        self.num_misses += 1
+        solver = SteadyStateSolver(mesh, fixed)
+        lu = solver.factorization
+        arrays = {"perm_r": lu.perm_r, "perm_c": lu.perm_c,
+                  "Q_f": solver.flux}
+        for name, A in (("L", lu.L), ("U", lu.U), ("H_fc", solver.coupling)):
+            A = sparse.csr_matrix(A)
+            arrays[f"{name}_data"] = A.data
+            arrays[f"{name}_indices"] = A.indices
+            arrays[f"{name}_indptr"] = A.indptr
+        self._store(key, "lu", arrays)
+        return solver
+
+    def _path(self, key, kind):
+        return os.path.join(self._directory, f"{key}.{kind}.npz")
+
+    def _entries(self):
+        return [
+            os.path.join(self._directory, name)
+            for name in os.listdir(self._directory)
+            if name.endswith(".npz") and not name.startswith(".")
+        ]
+
+    def _load(self, key, kind):
+        path = self._path(key, kind)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        # the modification time records the last use for eviction
+        os.utime(path)
+        return arrays
+
+    def _store(self, key, kind, arrays):
+        atomic_savez(self._path(key, kind), arrays)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self._max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def _hash(fingerprint, *arrays):
+    digest = hashlib.sha256(fingerprint.encode())
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        digest.update(f"{a.dtype.str}{a.shape}".encode())
+        digest.update(a)
+    return digest.hexdigest()
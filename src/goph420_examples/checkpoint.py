@@ -0,0 +1,309 @@
+import hashlib
+import operator
+import os
+import tempfile
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import numpy.typing as npt
+
+from .mesh import (
+    Mesh,
+)
+from .transient import (
+    ExplicitIntegrator,
+)
+
+# version of the checkpoint file layout
+_FORMAT_VERSION = 1
+
+# integration point properties that define the assembled operators
+_PROPERTIES = (
+    "density",
+    "thrm_cond",
+    "spec_heat_cap",
+    "heat_trans_coef",
+    "temp_inf",
+    "perimeter",
+    "area",
+)
+
+# mesh -> (mesh revision, fingerprint) of the last hash
+_fingerprints = weakref.WeakKeyDictionary()
+
+
+def mesh_fingerprint(mesh: Mesh) -> str:
+    """Hash the geometry and material properties of a mesh.
+
+    Two meshes with the same fingerprint assemble to the same
+    operators. Integration point temperatures are solution state
+    and are not included. The hash is kept with the mesh and only
+    recomputed after an integration point property of the mesh
+    has been set (see Mesh.revision).
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 digest.
+    """
+    revision = mesh.revision
+    cached = _fingerprints.get(mesh)
+    if cached is not None and cached[0] == revision:
+        return cached[1]
+    digest = hashlib.sha256()
+    digest.update(np.dtype(mesh.dtype).str.encode())
+    digest.update(np.ascontiguousarray(mesh.coords, dtype=float))
+    digest.update(np.ascontiguousarray(mesh.connectivity, dtype=np.int64))
+    # gather all properties in a single pass over the mesh
+    get = operator.attrgetter(*_PROPERTIES)
+    values = np.array(
+        [get(ip) for e in mesh.elements for ip in e.int_pts], dtype=float)
+    digest.update(",".join(_PROPERTIES).encode())
+    digest.update(values)
+    fingerprint = digest.hexdigest()
+    _fingerprints[mesh] = (revision, fingerprint)
+    return fingerprint
+
+
+def write_checkpoint(
+    path: str,
+    integrator: ExplicitIntegrator,
+    fingerprint: str = None,
+) -> None:
+    """Write the state of an integrator to a binary checkpoint file.
+
+    The file is written to a temporary file in the same directory
+    and moved into place, so an existing checkpoint is never left
+    partially overwritten.
+
+    Inputs
+    ------
+    path : str
+        The checkpoint file path.
+    integrator : ExplicitIntegrator
+        The integrator to save.
+    fingerprint : str, optional
+        The mesh fingerprint, if it is already known.
+    """
+    atomic_savez(path, _snapshot(integrator, fingerprint))
+
+
+def read_checkpoint(path: str, mesh: Mesh) -> ExplicitIntegrator:
+    """Resume an integrator from a checkpoint file.
+
+    If the mesh fingerprint matches the checkpoint, the stored
+    operators are reused and stepping continues bit-for-bit.
+    Otherwise the operators are re-assembled from the mesh
+    and the stored temperatures, time and step count are restored.
+    Integration point temperatures are restored in both cases.
+
+    Inputs
+    ------
+    path : str
+        The checkpoint file path.
+    mesh : Mesh
+        The mesh to resume on.
+
+    Returns
+    -------
+    ExplicitIntegrator
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint format version is not supported.
+        If the checkpoint does not match the mesh size.
+        If dt exceeds the stable time step of a changed mesh.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        state = {key: data[key] for key in data.files}
+    version = int(state.pop("version"))
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"checkpoint version {version} is not supported")
+    int_pt_temps = state.pop("int_pt_temps")
+    if int_pt_temps.shape[0] != mesh.num_elements:
+        raise ValueError(
+            f"checkpoint has {int_pt_temps.shape[0]} elements, "
+            f"mesh has {mesh.num_elements}"
+        )
+    fingerprint = str(state.pop("fingerprint"))
+    integrator = ExplicitIntegrator.from_state(
+        mesh, state, reassemble=fingerprint != mesh_fingerprint(mesh))
+    for e, temps in zip(mesh.elements, int_pt_temps):
+        for ip, T in zip(e.int_pts, temps):
+            ip.temp = T
+    return integrator
+
+
+def atomic_savez(path: str, arrays: dict) -> None:
+    """Save arrays to an uncompressed .npz file atomically.
+
+    The arrays are written to a temporary file in the same directory,
+    flushed to disk and moved into place, so readers see either
+    the old file or the complete new one.
+
+    Inputs
+    ------
+    path : str
+        The file path.
+    arrays : dict
+        The arrays to save, by name.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=".tmp-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class Checkpointer:
+    """Periodically checkpoint an integrator in the background.
+
+    The state is copied when a checkpoint is requested,
+    so the integrator can keep stepping while the file is written
+    by a worker thread. Writes happen in request order
+    and each one is atomic.
+
+    Attributes
+    ----------
+    path
+    interval
+
+    Parameters
+    ----------
+    path : str
+        The checkpoint file path.
+    interval : int, optional, default=100
+        The number of time steps between checkpoints in step.
+
+    Raises
+    ------
+    ValueError
+        If interval < 1.
+    """
+
+    def __init__(self, path: str, interval: int = 100):
+        interval = int(interval)
+        if interval < 1:
+            raise ValueError(f"interval {interval} must be >= 1")
+        self._path = os.fspath(path)
+        self._interval = interval
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = []
+        self._mesh = None
+        self._fingerprint = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def interval(self) -> int:
+        return self._interval
+
+    def save(self, integrator: ExplicitIntegrator) -> Future:
+        """Copy the integrator state and write it in the background.
+
+        Parameters
+        ----------
+        integrator : ExplicitIntegrator
+            The integrator to save.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Completes when the checkpoint file is in place.
+        """
+        # the operators are fixed at construction,
+        # so the fingerprint is computed once per mesh
+        if integrator.mesh is not self._mesh:
+            self._mesh = integrator.mesh
+            self._fingerprint = mesh_fingerprint(self._mesh)
+        data = _snapshot(integrator, self._fingerprint)
+        self._pending = [f for f in self._pending if not f.done()]
+        future = self._executor.submit(atomic_savez, self._path, data)
+        self._pending.append(future)
+        return future
+
+    def step(
+        self,
+        integrator: ExplicitIntegrator,
+        num_steps: int,
+    ) -> npt.NDArray[np.floating]:
+        """Advance an integrator, checkpointing every interval steps.
+
+        Parameters
+        ----------
+        integrator : ExplicitIntegrator
+            The integrator to advance.
+        num_steps : int
+            The number of time steps to take.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+            The nodal temperatures after the last step.
+        """
+        end = integrator.step_count + num_steps
+        while integrator.step_count < end:
+            to_next = self._interval - integrator.step_count % self._interval
+            integrator.step(min(to_next, end - integrator.step_count))
+            if integrator.step_count % self._interval == 0:
+                self.save(integrator)
+        return integrator.temps
+
+    def wait(self) -> None:
+        """Block until all pending checkpoints are written.
+
+        Raises
+        ------
+        OSError
+            If a checkpoint could not be written.
+        """
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """Wait for pending checkpoints and stop the worker thread."""
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown()
+
+
+def _int_pt_array(mesh, name):
+    return np.array(
+        [[getattr(ip, name) for ip in e.int_pts] for e in mesh.elements],
+        dtype=float,
+    ).reshape(mesh.num_elements, -1)
+
+
+def _snapshot(integrator, fingerprint=None):
+    mesh = integrator.mesh
+    if fingerprint is None:
+        fingerprint = mesh_fingerprint(mesh)
+    data = integrator.get_state()
+    data["version"] = _FORMAT_VERSION
+    data["fingerprint"] = fingerprint
+    data["int_pt_temps"] = _int_pt_array(mesh, "temp")
+    return data
@@ -1,11 +1,223 @@
+import contextvars
+import threading
+from functools import lru_cache
+from itertools import chain, count
+from operator import attrgetter, mul
+
 import numpy as np
 import numpy.typing as npt
 
 from .interpolation import (
     shape,
+    reference_matrices,
+)
+
+
+# the active DeferredValidation, if any
+_deferred = contextvars.ContextVar("deferred_validation", default=None)
+
+# per-thread work arrays for element matrix terms, see _scratch_buffer
+_scratch = threading.local()
+
+# messages for properties that cannot be negative
+_NEGATIVE = {
+    "weight": "weight cannot be negative",
+    "density": "density cannot be negative",
+    "thrm_cond": "thermal conductivity cannot be negative",
+    "spec_heat_cap": "specific heat capacity cannot be negative",
+    "heat_trans_coef": "heat transfer coefficient cannot be negative",
+    "perimeter": "value {value} for perimeter cannot be negative",
+    "area": "value {value} for area cannot be negative",
+}
+
+# unique values drawn when an integration point property
+# other than temp is set, see Mesh.revision
+_revisions = count(1)
+
+_NODE_FIELDS = ("x", "temp")
+_INT_PT_FIELDS = ("local_coord", "weight", "x")
+_INT_PT_PROPERTIES = (
+    "temp", "density", "thrm_cond", "spec_heat_cap",
+    "heat_trans_coef", "temp_inf", "perimeter", "area",
 )
 
 
+def _touch(refs):
+    # give each live mesh of the weak references a new revision,
+    # next() on a count is atomic, so no lock is needed
+    revision = next(_revisions)
+    for ref in refs:
+        mesh = ref()
+        if mesh is not None:
+            mesh._revision = revision
+
+
+class DeferredValidation:
+    """Context manager that defers input validation
+    of Node, IntegrationPoint and Element constructors.
+
+    Outside of this context every constructor converts
+    and checks each value as it is given.
+    Inside it, constructor arguments are stored as given,
+    and on exit (or on a call to validate) each argument of all
+    objects created in the block is converted to float and checked
+    at once with vectorized predicates.
+    Failures raise the same error types and messages as the
+    per-value checks, followed by the indices of the offending
+    objects among the objects of that class created in the block,
+    which are also the indices attribute of the error.
+    Values read inside the block are as given, not yet converted,
+    and the integration point positions of Elements created in the
+    block are only computed once their nodes have been validated.
+    Validation is skipped if the block exits with an exception.
+
+    Property setters always check immediately. To assign
+    a property of many integration points with one vectorized
+    check, use IntegrationPoint.set_values.
+
+    Attributes
+    ----------
+    num_pending
+    """
+
+    def __init__(self):
+        self._nodes = []
+        self._int_pts = []
+        self._elements = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _deferred.set(self)
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        _deferred.reset(self._token)
+        if exc_type is None:
+            self.validate()
+        else:
+            self._clear()
+
+    @property
+    def num_pending(self) -> int:
+        """The number of objects created in the block
+        and not yet validated.
+
+        Returns
+        -------
+        int
+        """
+        return len(self._nodes) + len(self._int_pts) + len(self._elements)
+
+    def validate(self) -> None:
+        """Validate and convert the arguments of all objects
+        created so far.
+
+        Raises
+        ------
+        TypeError
+            If a Node index is not an int.
+            If objects in the nodes of an Element are not Nodes.
+            If a value cannot be converted to float.
+        ValueError
+            If a Node index is negative.
+            If a value cannot be converted to float.
+            If a value that cannot be negative is negative.
+        """
+        nodes, int_pts, elements = self._nodes, self._int_pts, self._elements
+        self._clear()
+        if nodes:
+            _validate_indices(nodes, "deferred Node.index")
+            for field in _NODE_FIELDS:
+                _validate_floats(nodes, field, f"deferred Node.{field}")
+        if int_pts:
+            for field in _INT_PT_FIELDS + _INT_PT_PROPERTIES:
+                _validate_floats(int_pts, field,
+                                 f"deferred IntegrationPoint.{field}")
+        if elements:
+            _validate_nodes(elements, "deferred Element.nodes")
+            for e in elements:
+                e._locate_int_pts()
+
+    def _clear(self):
+        self._nodes, self._int_pts, self._elements = [], [], []
+
+
+def _indexed_error(error_type, message, indices, where):
+    shown = ", ".join(str(k) for k in indices[:10])
+    if len(indices) > 10:
+        shown += ", ..."
+    err = error_type(f"{message} ({where} at indices [{shown}])")
+    err.indices = np.asarray(indices, dtype=int)
+    return err
+
+
+def _check_floats(values, field, where):
+    # convert to a float array with vectorized checks
+    try:
+        arr = np.array(values, dtype=float)
+        # numpy converts None to nan, float does not
+        if arr.shape != (len(values),) or np.isnan(arr).any():
+            raise ValueError
+    except (TypeError, ValueError):
+        arr = _to_float(values, where)
+    if field in _NEGATIVE:
+        bad = np.flatnonzero(arr < 0.0)
+        if len(bad):
+            message = _NEGATIVE[field].format(value=float(arr[bad[0]]))
+            raise _indexed_error(ValueError, message, bad, where)
+    return arr
+
+
+def _to_float(values, where):
+    out = np.empty(len(values))
+    bad, first = [], None
+    for k, value in enumerate(values):
+        try:
+            out[k] = float(value)
+        except (TypeError, ValueError) as err:
+            bad.append(k)
+            first = first or err
+    if bad:
+        raise _indexed_error(type(first), first, bad, where) from None
+    return out
+
+
+def _validate_floats(objs, field, where):
+    attr = "_" + field
+    values = list(map(attrgetter(attr), objs))
+    converted = set(map(type, values)) <= {float}
+    if converted and field not in _NEGATIVE:
+        return
+    arr = _check_floats(values, field, where)
+    if not converted:
+        for obj, value in zip(objs, arr.tolist()):
+            setattr(obj, attr, value)
+
+
+def _validate_indices(objs, where):
+    values = list(map(attrgetter("_index"), objs))
+    if not all(issubclass(t, int) for t in set(map(type, values))):
+        bad = [k for k, v in enumerate(values) if not isinstance(v, int)]
+        raise _indexed_error(
+            TypeError, f"type of index {type(values[bad[0]])} is not int",
+            bad, where)
+    bad = np.flatnonzero(np.array(values) < 0)
+    if len(bad):
+        raise _indexed_error(
+            ValueError, f"value of index {values[bad[0]]} is negative",
+            bad, where)
+
+
+def _validate_nodes(objs, where):
+    nodes = list(map(attrgetter("_nodes"), objs))
+    types = set(map(type, chain.from_iterable(nodes)))
+    if not all(issubclass(t, Node) for t in types):
+        bad = [k for k, nds in enumerate(nodes)
+               if not all(isinstance(nd, Node) for nd in nds)]
+        raise _indexed_error(
+            TypeError, "objects in nodes must be of type Node", bad, where)
+
+
 class Point:
     _x: float
 
@@ -28,6 +240,9 @@ class Point:
 class Node:
     """Store solution variable information.
 
+    Inputs are checked as they are given,
+    or in bulk inside a DeferredValidation block.
+
     Attributes
     ----------
     index
@@ -61,6 +276,14 @@ class Node:
         x: float,
         temp: float = 0.0,
     ):
+        batch = _deferred.get()
+        if batch is not None:
+            self._index = index
+            self._x = x
+            self._temp = temp
+            batch._nodes.append(self)
+            return
+
         if not isinstance(index, int):
             raise TypeError(f"type of index {type(index)} is not int")
         if index < 0:
@@ -122,6 +345,10 @@ class IntegrationPoint:
     and interpolated values of solutions variables
     for integrating element matrices and vectors.
 
+    Inputs are checked as they are given. Constructor arguments
+    can be checked in bulk inside a DeferredValidation block,
+    and properties of many points assigned with set_values.
+
     Attributes
     ----------
     local_coord
@@ -197,6 +424,9 @@ class IntegrationPoint:
     _temp_inf: float = 0.0
     _perimeter: float = 0.0
     _area: float = 0.0
+    # weak references to the meshes holding the parent element,
+    # the list of the element, empty for a point on its own
+    _meshes: list = ()
 
     def __init__(
         self,
@@ -212,12 +442,28 @@ class IntegrationPoint:
         perimeter: float = 0.0,
         area: float = 0.0,
     ):
+        batch = _deferred.get()
+        if batch is not None:
+            self._local_coord = local_coord
+            self._weight = weight
+            self._x = x
+            self._temp = temp
+            self._density = density
+            self._thrm_cond = thrm_cond
+            self._spec_heat_cap = spec_heat_cap
+            self._heat_trans_coef = heat_trans_coef
+            self._temp_inf = temp_inf
+            self._perimeter = perimeter
+            self._area = area
+            batch._int_pts.append(self)
+            return
+
         # data validation on immutable properties
         x = float(x)
         local_coord = float(local_coord)
         weight = float(weight)
         if weight < 0.0:
-            raise ValueError("weight cannot be negative")
+            raise ValueError(_NEGATIVE["weight"])
 
         # assign immutable properties to private attributes
         self._x = x
@@ -234,6 +480,60 @@ class IntegrationPoint:
         self.perimeter = perimeter
         self.area = area
 
+    @classmethod
+    def _at(cls, local_coord: float, weight: float, x: float):
+        # create with default properties from values that are
+        # already valid floats, without checks, x may be None
+        # until the element sets it
+        self = cls.__new__(cls)
+        self._local_coord = local_coord
+        self._weight = weight
+        self._x = x
+        return self
+
+    @classmethod
+    def set_values(
+        cls,
+        int_pts,
+        name: str,
+        values: npt.ArrayLike,
+    ) -> None:
+        """Assign a property of many integration points
+        with one vectorized check of all values.
+
+        Parameters
+        ----------
+        int_pts : sequence of IntegrationPoint
+            The integration points.
+        name : str
+            The property, e.g. "thrm_cond".
+        values : float or array_like, shape=(len(int_pts),)
+            The values, one per integration point.
+
+        Raises
+        ------
+        AttributeError
+            If name is not a settable IntegrationPoint property.
+        TypeError
+            If a value cannot be converted to float.
+        ValueError
+            If values cannot be broadcast to (len(int_pts),).
+            If a value cannot be converted to float.
+            If the property cannot be negative and a value is.
+            Errors for individual values give their indices.
+        """
+        if name not in _INT_PT_PROPERTIES:
+            raise AttributeError(
+                f"{name} is not a settable IntegrationPoint property")
+        values = np.broadcast_to(np.asarray(values), (len(int_pts),))
+        arr = _check_floats(values, name, f"IntegrationPoint.{name}")
+        attr = "_" + name
+        for ip, value in zip(int_pts, arr.tolist()):
+            setattr(ip, attr, value)
+        if name != "temp":
+            meshes = {id(ip._meshes): ip._meshes for ip in int_pts}
+            _touch(chain.from_iterable(meshes.values()))
+
     @property
     def local_coord(self) -> float:
         """The local coordinate of the integration point
@@ -314,8 +614,9 @@ class IntegrationPoint:
     def perimeter(self, value: float) -> None:
         value = float(value)
         if value < 0.0:
-            raise ValueError(f"value {value} for perimeter cannot be negative")
+            raise ValueError(_NEGATIVE["perimeter"].format(value=value))
         self._perimeter = value
+        _touch(self._meshes)
 
     @property
     def area(self):
@@ -341,8 +642,9 @@ class IntegrationPoint:
     def area(self, value: float) -> None:
         value = float(value)
         if value < 0.0:
-            raise ValueError(f"value {value} for area cannot be negative")
+            raise ValueError(_NEGATIVE["area"].format(value=value))
         self._area = value
+        _touch(self._meshes)
 
     @property
     def temp_inf(self) -> float:
@@ -367,6 +669,7 @@ class IntegrationPoint:
     def temp_inf(self, value: float) -> None:
         value = float(value)
         self._temp_inf = value
+        _touch(self._meshes)
 
     @property
     def density(self) -> float:
@@ -392,8 +695,9 @@ class IntegrationPoint:
     def density(self, value: float) -> None:
         value = float(value)
         if value < 0.0:
-            raise ValueError("density cannot be negative")
+            raise ValueError(_NEGATIVE["density"])
         self._density = value
+        _touch(self._meshes)
 
     @property
     def thrm_cond(self) -> float:
@@ -419,8 +723,9 @@ class IntegrationPoint:
     def thrm_cond(self, value: float) -> None:
         value = float(value)
         if value < 0.0:
-            raise ValueError("thermal conductivity cannot be negative")
+            raise ValueError(_NEGATIVE["thrm_cond"])
         self._thrm_cond = value
+        _touch(self._meshes)
 
     @property
     def spec_heat_cap(self):
@@ -446,8 +751,9 @@ class IntegrationPoint:
     def spec_heat_cap(self, value: float) -> None:
         value = float(value)
         if value < 0.0:
-            raise ValueError("specific heat capacity cannot be negative")
+            raise ValueError(_NEGATIVE["spec_heat_cap"])
         self._spec_heat_cap = value
+        _touch(self._meshes)
 
     @property
     def heat_trans_coef(self):
@@ -472,14 +778,19 @@ class IntegrationPoint:
     def heat_trans_coef(self, value: float) -> None:
         value = float(value)
         if value < 0:
-            raise ValueError("heat transfer coefficient cannot be negative")
+            raise ValueError(_NEGATIVE["heat_trans_coef"])
         self._heat_trans_coef = value
+        _touch(self._meshes)
 
 
 class Element:
     """Class for grouping Nodes
     and computing element matrices and vectors.
 
+    The types of nodes are checked as they are given,
+    or in bulk inside a DeferredValidation block.
+    Integration points are created with default properties.
+
     Attributes
     ----------
     order
@@ -496,6 +807,11 @@ class Element:
         The nodes contained in the element.
     order : int
         The order of interpolation.
+    length : float, optional
+        The length of the element.
+        Default is the distance between the end nodes.
+        Provide it when node positions are not distances
+        along the element, e.g. in pipe network meshes.
 
     Raises
     ------
@@ -505,10 +821,14 @@ class Element:
     ValueError
         If order < 0.
         If len(nodes) is not consistent with order.
+        If length cannot be converted to float.
+        If length <= 0.
     """
     _order: int
     _nodes: tuple[Node, ...]
     _int_pts: tuple[IntegrationPoint, ...]
+    _length: float = None
+    _meshes: list
 
     _int_pt_coords_0 = (
         0.5,
@@ -517,7 +837,12 @@ class Element:
         1.0,
     )
 
-    def __init__(self, nodes: tuple[Node], order: int):
+    def __init__(
+        self,
+        nodes: tuple[Node],
+        order: int,
+        length: float = None,
+    ):
         # validate input arguments
         if not isinstance(order, int):
             raise TypeError(f"order is {type(order)}, must be int")
@@ -528,9 +853,16 @@ class Element:
                 f"provided {len(nodes)} nodes, "
                 + f"should be {order + 1}"
             )
-        for nd in nodes:
-            if not isinstance(nd, Node):
-                raise TypeError("objects in nodes must be of type Node")
+        batch = _deferred.get()
+        if batch is None:
+            for nd in nodes:
+                if not isinstance(nd, Node):
+                    raise TypeError("objects in nodes must be of type Node")
+        if length is not None:
+            length = float(length)
+            if length <= 0.0:
+                raise ValueError(f"length {length} must be positive")
+            self._length = length
 
         self._order = order
         self._nodes = tuple(nodes)
@@ -540,14 +872,20 @@ class Element:
         int_pt_coords = Element._int_pt_coords_0
         int_pt_weights = Element._int_pt_weights_0
 
-        # create integration points
-        xe = np.array([nd.x for nd in self.nodes])
-        int_pts = []
-        for s, w in zip(int_pt_coords, int_pt_weights):
-            N = shape(s, self.order)
-            xip = (N @ xe)[0]
-            int_pts.append(IntegrationPoint(local_coord=s, weight=w, x=xip))
-        self._int_pts = tuple(int_pts)
+        # create integration points, positioned once the nodes are valid
+        self._int_pts = tuple(
+            IntegrationPoint._at(s, w, None)
+            for s, w in zip(int_pt_coords, int_pt_weights)
+        )
+        # shared with the integration points, whose setters renew
+        # the revision of each mesh added to it, see Mesh.revision
+        self._meshes = []
+        for ip in self._int_pts:
+            ip._meshes = self._meshes
+        if batch is None:
+            self._locate_int_pts()
+        else:
+            batch._elements.append(self)
 
     @property
     def order(self) -> int:
@@ -571,33 +909,147 @@ class Element:
 
     @property
     def jacobian(self) -> float:
+        if self._length is not None:
+            return self._length
         return self.nodes[-1].x - self.nodes[0].x
 
     @property
     def conduction_matrix(self) -> npt.NDArray[np.floating]:
+        return self.compute_conduction_matrix()
+
+    @property
+    def storage_matrix(self) -> npt.NDArray[np.floating]:
+        return self.compute_storage_matrix()
+
+    @property
+    def flux_vector(self) -> npt.NDArray[np.floating]:
+        return self.compute_flux_vector()
+
+    def compute_conduction_matrix(
+        self,
+        out: npt.NDArray[np.floating] = None,
+    ) -> npt.NDArray[np.floating]:
+        """Compute the element conduction matrix.
+
+        Parameters
+        ----------
+        out : numpy.ndarray, shape=(num_nodes, num_nodes), optional
+            Buffer to write the matrix into, which sets the dtype.
+            If not provided, a new float64 array is allocated.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes, num_nodes)
+            The conduction matrix (out, if it was provided).
+
+        Raises
+        ------
+        ValueError
+            If out does not have shape (num_nodes, num_nodes).
+        """
         h = self.int_pts[0].heat_trans_coef
         lam = self.int_pts[0].thrm_cond
         P = self.int_pts[0].perimeter
         A = self.int_pts[0].area
         jac = self.jacobian
-        cond_mat = (h * (P / A) * jac / 6.0) * np.array(
-            [[2.0, 1.0], [1.0, 2.0]]
-        )
-        cond_mat += (lam / jac) * np.array([[1.0, -1.0], [-1.0, 1.0]])
-        return cond_mat
+        mass, stiffness, _ = reference_matrices(self.order)
+        out = self._check_out(out, mass.shape)
+        work = _scratch_buffer(mass.shape)
+        np.multiply(mass, h * P * jac, out=out)
+        np.multiply(stiffness, lam * A / jac, out=work)
+        np.add(out, work, out=out)
+        return out
+
+    def compute_storage_matrix(
+        self,
+        out: npt.NDArray[np.floating] = None,
+    ) -> npt.NDArray[np.floating]:
+        """Compute the element storage matrix.
 
-    @property
-    def storage_matrix(self) -> npt.NDArray[np.floating]:
+        Parameters
+        ----------
+        out : numpy.ndarray, shape=(num_nodes, num_nodes), optional
+            Buffer to write the matrix into, which sets the dtype.
+            If not provided, a new float64 array is allocated.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes, num_nodes)
+            The storage matrix (out, if it was provided).
+
+        Raises
+        ------
+        ValueError
+            If out does not have shape (num_nodes, num_nodes).
+        """
         rho = self.int_pts[0].density
         c = self.int_pts[0].spec_heat_cap
+        A = self.int_pts[0].area
         jac = self.jacobian
-        return (rho * c * jac / 6.0) * np.array([[2.0, 1.0], [1.0, 2.0]])
+        mass, _, _ = reference_matrices(self.order)
+        out = self._check_out(out, mass.shape)
+        np.multiply(mass, rho * c * A * jac, out=out)
+        return out
 
-    @property
-    def flux_vector(self) -> npt.NDArray[np.floating]:
+    def compute_flux_vector(
+        self,
+        out: npt.NDArray[np.floating] = None,
+    ) -> npt.NDArray[np.floating]:
+        """Compute the element flux vector.
+
+        Parameters
+        ----------
+        out : numpy.ndarray, shape=(num_nodes,), optional
+            Buffer to write the vector into, which sets the dtype.
+            If not provided, a new float64 array is allocated.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+            The flux vector (out, if it was provided).
+
+        Raises
+        ------
+        ValueError
+            If out does not have shape (num_nodes,).
+        """
         h = self.int_pts[0].heat_trans_coef
         P = self.int_pts[0].perimeter
-        A = self.int_pts[0].area
         T_inf = self.int_pts[0].temp_inf
         jac = self.jacobian
-        return h * (P/A) * jac * T_inf * np.array([0.5, 0.5])
+        _, _, load = reference_matrices(self.order)
+        out = self._check_out(out, load.shape)
+        np.multiply(load, h * P * jac * T_inf, out=out)
+        return out
+
+    def _locate_int_pts(self):
+        # interpolate the integration point positions from the nodes
+        xe = [nd.x for nd in self._nodes]
+        N = _int_pt_shapes(Element._int_pt_coords_0, self._order)
+        for ip, N_q in zip(self._int_pts, N):
+            ip._x = sum(map(mul, N_q, xe))
+
+    @staticmethod
+    def _check_out(out, shape):
+        if out is None:
+            return np.empty(shape)
+        if out.shape != shape:
+            raise ValueError(
+                f"out has shape {out.shape}, should be {shape}"
+            )
+        return out
+
+
+@lru_cache(maxsize=None)
+def _int_pt_shapes(coords, order):
+    # shape function values at the integration points, as floats
+    # because small numpy products cost more than python arithmetic
+    return tuple(map(tuple, shape(np.array(coords), order).tolist()))
+
+
+def _scratch_buffer(shape):
+    # a float64 array reused by every call on this thread
+    buffers = _scratch.__dict__.setdefault("buffers", {})
+    if shape not in buffers:
+        buffers[shape] = np.empty(shape)
+    return buffers[shape]
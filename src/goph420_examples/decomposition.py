@@ -0,0 +1,454 @@
+import multiprocessing
+import os
+
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import splu
+
+from .mesh import (
+    Mesh,
+)
+
+
+class DomainDecompositionSolver:
+    """Steady-state solver for H T = Q that splits the mesh
+    into subdomains solved in separate worker processes.
+
+    Elements are partitioned into num_subdomains contiguous groups
+    along a reverse Cuthill-McKee ordering of the nodes, which for
+    a pipe is the order along its length. Free nodes shared by
+    elements of different subdomains form the interface, all other
+    free nodes are interior to one subdomain. Each subdomain is
+    assembled from its own elements and its interior blocks
+    A_II, A_IG, A_Ic and Q_I are sent to a worker, which factorizes
+    A_II and returns the interface Schur complement contribution
+    A_GI A_II^-1 A_IG. Subdomains are assembled one per worker at
+    a time, so neither this process nor any worker holds the
+    matrix or the factors of the whole mesh. The assembled
+    Schur complement
+    S = A_GG - sum_s A_GI A_II^-1 A_IG
+    is small (about one row per subdomain boundary) and is
+    factorized densely.
+
+    A solve sends the fixed temperatures to the workers, which
+    condense their right-hand sides onto the interface, solves
+    with S, and recovers the interior temperatures in the workers.
+    The subdomain factorizations are kept, so repeated solves with
+    new fixed temperatures cost one triangular solve per subdomain.
+
+    Attributes
+    ----------
+    mesh
+    fixed
+    free
+    num_subdomains
+    num_workers
+    interface
+    schur_complement
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    fixed : array_like of int
+        The global indices of nodes with prescribed temperature.
+    num_subdomains : int, optional
+        The number of subdomains, default is the number of CPUs.
+    num_workers : int, optional
+        The number of worker processes, each owning an equal share
+        of the subdomains. Default is min(num_subdomains, CPUs).
+        With 0, the subdomains are solved in this process.
+
+    Raises
+    ------
+    ValueError
+        If fixed contains repeated indices.
+        If num_subdomains < 1 or num_workers < 0.
+    RuntimeError
+        If the interior matrix of a subdomain is singular.
+        Errors in the workers are raised after they are stopped.
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        fixed: npt.ArrayLike,
+        num_subdomains: int = None,
+        num_workers: int = None,
+    ):
+        cpus = os.cpu_count() or 1
+        num_subdomains = cpus if num_subdomains is None else num_subdomains
+        num_subdomains = min(int(num_subdomains), mesh.num_elements)
+        if num_subdomains < 1:
+            raise ValueError(
+                f"num_subdomains {num_subdomains} must be >= 1")
+        if num_workers is None:
+            num_workers = min(num_subdomains, cpus)
+        num_workers = min(int(num_workers), num_subdomains)
+        if num_workers < 0:
+            raise ValueError(f"num_workers {num_workers} must be >= 0")
+        fixed = np.asarray(fixed, dtype=int)
+        if len(np.unique(fixed)) != len(fixed):
+            raise ValueError("fixed node indices must be unique")
+
+        n = mesh.num_nodes
+        conn = mesh.connectivity
+        k = conn.shape[1]
+        # label each element by the position of its first node
+        # in a bandwidth reducing order of the node graph,
+        # then cut into equal groups
+        graph = sparse.csr_matrix(
+            (np.ones(conn.size * k, dtype=np.int8),
+             (np.repeat(conn, k, axis=1).ravel(),
+              np.tile(conn, (1, k)).ravel())),
+            shape=(n, n),
+        )
+        rank = np.empty(n, dtype=int)
+        rank[csgraph.reverse_cuthill_mckee(graph, symmetric_mode=True)] = (
+            np.arange(n))
+        del graph
+        order = np.argsort(rank[conn].min(axis=1), kind="stable")
+        part = np.empty(mesh.num_elements, dtype=int)
+        part[order] = (np.arange(mesh.num_elements) * num_subdomains
+                       // mesh.num_elements)
+
+        # the subdomains touching each node
+        node_part = sparse.csr_matrix(
+            (np.ones(conn.size),
+             (conn.ravel(), np.repeat(part, k))),
+            shape=(n, num_subdomains),
+        )
+        node_part.sum_duplicates()
+        num_parts = np.diff(node_part.indptr)
+        is_fixed = np.zeros(n, dtype=bool)
+        is_fixed[fixed] = True
+        interface = np.flatnonzero((num_parts > 1) & ~is_fixed)
+        # the subdomain of each interior node, -1 elsewhere
+        owner = np.full(n, -1)
+        interior = (num_parts == 1) & ~is_fixed
+        owner[interior] = node_part.indices[node_part.indptr[:-1][interior]]
+        del node_part
+
+        self._mesh = mesh
+        self._fixed = fixed
+        self._free = np.flatnonzero(~is_fixed)
+        self._interface = interface
+        self._num_subdomains = num_subdomains
+        self._workers = []
+        try:
+            self._setup(part, owner, num_workers)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def fixed(self) -> npt.NDArray[np.integer]:
+        return self._fixed
+
+    @property
+    def free(self) -> npt.NDArray[np.integer]:
+        return self._free
+
+    @property
+    def num_subdomains(self) -> int:
+        return self._num_subdomains
+
+    @property
+    def num_workers(self) -> int:
+        return sum(isinstance(w, _ProcessWorker) for w in self._workers)
+
+    @property
+    def interface(self) -> npt.NDArray[np.integer]:
+        """The global indices of the interface nodes.
+
+        Returns
+        -------
+        numpy.ndarray of int
+        """
+        return self._interface
+
+    @property
+    def schur_complement(self) -> npt.NDArray[np.floating]:
+        """The interface Schur complement S.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(len(interface), len(interface))
+        """
+        return self._schur
+
+    def solve(self, fixed_temps: npt.ArrayLike) -> npt.NDArray:
+        """Solve for the nodal temperatures.
+
+        Parameters
+        ----------
+        fixed_temps : array_like, shape=(len(fixed),) or (len(fixed), k)
+            The prescribed temperatures. Each column of a 2D array
+            is a separate set, solved together.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,) or (num_nodes, k)
+        """
+        g = np.asarray(fixed_temps, dtype=float)
+        for worker in self._workers:
+            worker.send(("condense", g))
+        b_G = self._H_Gc @ g
+        b_G *= -1.0
+        b_G += self._Q_G if g.ndim == 1 else self._Q_G[:, None]
+        for s, y_s in _gather(self._workers):
+            b_G[self._coupled[s]] -= y_s
+        u_G = lu_solve(self._lu, b_G) if self._lu is not None else b_G
+
+        T = np.empty((self._mesh.num_nodes,) + g.shape[1:])
+        T[self._fixed] = g
+        T[self._interface] = u_G
+        for worker, share in zip(self._workers, self._shares):
+            worker.send(("expand",
+                         {s: u_G[self._coupled[s]] for s in share}))
+        for s, u_I in _gather(self._workers):
+            T[self._interior[s]] = u_I
+        return T
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for worker in self._workers:
+            worker.close()
+        self._workers = []
+
+    def _setup(self, part, owner, num_workers):
+        # assemble each subdomain from its own elements and send it
+        # to its worker, so that at most one subdomain per worker is
+        # held here, and sum the interface blocks
+        mesh = self._mesh
+        n_G = len(self._interface)
+        self._positions = _positions(mesh.num_nodes, self._interface)
+        self._fixed_positions = _positions(mesh.num_nodes, self._fixed)
+        self._Q_G = np.zeros(n_G)
+        self._H_Gc = sparse.csr_matrix((n_G, len(self._fixed)))
+        S = np.zeros((n_G, n_G))
+
+        elements = np.split(
+            np.argsort(part, kind="stable"),
+            np.cumsum(np.bincount(part, minlength=self._num_subdomains))[:-1],
+        )
+        num_interior = np.bincount(owner[owner >= 0],
+                                   minlength=self._num_subdomains)
+        # subdomains of a single element may have no interior
+        active = np.flatnonzero(num_interior)
+        shares = np.array_split(active, max(num_workers, 1))
+        self._shares = [share for share in shares if len(share)]
+        self._workers = _start_workers(len(self._shares),
+                                       local=num_workers == 0)
+        self._interior = {}
+        self._coupled = {}
+        for s in np.flatnonzero(num_interior == 0):
+            self._assemble(s, elements[s], owner, S)
+        for r in range(max(map(len, self._shares), default=0)):
+            busy = []
+            for worker, share in zip(self._workers, self._shares):
+                if r < len(share):
+                    s = share[r]
+                    blocks = self._assemble(s, elements[s], owner, S)
+                    worker.send(("setup", (s, blocks)))
+                    del blocks
+                    busy.append(worker)
+            for s, S_s in _gather(busy):
+                G_s = self._coupled[s]
+                S[np.ix_(G_s, G_s)] -= S_s
+        self._lu = lu_factor(S) if n_G else None
+        self._schur = S
+
+    def _assemble(self, s, elements, owner, S):
+        # the subdomain blocks of the interior nodes,
+        # the interface blocks are added to S, Q_G and H_Gc
+        mesh = self._mesh
+        conn = mesh.connectivity[elements]
+        k = conn.shape[1]
+        H_e = np.empty((len(elements), k, k), dtype=mesh.dtype)
+        Q_e = np.empty((len(elements), k), dtype=mesh.dtype)
+        for e, H, Q in zip(elements, H_e, Q_e):
+            mesh.elements[e].compute_conduction_matrix(out=H)
+            mesh.elements[e].compute_flux_vector(out=Q)
+        nodes, local = np.unique(conn, return_inverse=True)
+        local = local.reshape(conn.shape)
+        H_s = sparse.coo_matrix(
+            (H_e.ravel(),
+             (np.repeat(local, k, axis=1).ravel(),
+              np.tile(local, (1, k)).ravel())),
+            shape=(len(nodes), len(nodes)),
+        ).tocsr()
+        Q_s = np.bincount(local.ravel(), weights=Q_e.ravel(),
+                          minlength=len(nodes))
+
+        # local indices of the interior, interface and fixed nodes
+        I_s = np.flatnonzero(owner[nodes] == s)
+        G_s = np.flatnonzero(self._positions[nodes] >= 0)
+        c_s = np.flatnonzero(self._fixed_positions[nodes] >= 0)
+        G_pos = self._positions[nodes[G_s]]
+        c_pos = self._fixed_positions[nodes[c_s]]
+        H_G = H_s[G_s]
+        S[np.ix_(G_pos, G_pos)] += H_G[:, G_s].toarray()
+        self._Q_G[G_pos] += Q_s[G_s]
+        self._H_Gc = self._H_Gc + _widen(
+            H_G[:, c_s], G_pos, c_pos, self._H_Gc.shape)
+        if not len(I_s):
+            return None
+        H_I = H_s[I_s]
+        self._interior[s] = nodes[I_s]
+        self._coupled[s] = G_pos
+        H_Ic = _widen(H_I[:, c_s], None, c_pos,
+                      (len(I_s), len(self._fixed)))
+        return H_I[:, I_s], H_I[:, G_s], H_Ic, Q_s[I_s]
+
+
+class _Subdomain:
+    # the factorized interior of one subdomain
+
+    def __init__(self, A_II, A_IG, H_Ic, Q_I):
+        self._lu = splu(sparse.csc_matrix(A_II))
+        self._A_GI = sparse.csr_matrix(A_IG.T)
+        self._W = self._lu.solve(A_IG.toarray())
+        self._H_Ic = H_Ic
+        self._Q_I = Q_I
+        self._z = None
+
+    def schur(self):
+        return self._A_GI @ self._W
+
+    def condense(self, g):
+        b_I = self._H_Ic @ g
+        b_I *= -1.0
+        b_I += self._Q_I if g.ndim == 1 else self._Q_I[:, None]
+        self._z = self._lu.solve(b_I)
+        return self._A_GI @ self._z
+
+    def expand(self, u_G):
+        return self._z - self._W @ u_G
+
+
+def _handle(subdomains, message):
+    command, data = message
+    if command == "setup":
+        s, blocks = data
+        subdomains[s] = _Subdomain(*blocks)
+        return {s: subdomains[s].schur()}
+    if command == "condense":
+        return {s: sub.condense(data) for s, sub in subdomains.items()}
+    return {s: subdomains[s].expand(u_G) for s, u_G in data.items()}
+
+
+def _serve(conn):
+    subdomains = {}
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        try:
+            result = _handle(subdomains, message)
+        except Exception as err:
+            result = err
+        try:
+            conn.send(result)
+        except Exception as err:
+            # e.g. an exception that cannot be pickled
+            conn.send(RuntimeError(f"{type(err).__name__}: {err}"))
+    conn.close()
+
+
+def _gather(workers):
+    # receive one reply from every worker before raising
+    # the first error, so that no reply is left in a pipe
+    items = []
+    error = None
+    for worker in workers:
+        try:
+            result = worker.recv()
+        except Exception as err:
+            result = err
+        if isinstance(result, Exception):
+            error = error or result
+        else:
+            items.extend(result.items())
+    if error is not None:
+        raise error
+    return items
+
+
+def _positions(n, indices):
+    # position of each of n nodes in indices, -1 if absent
+    pos = np.full(n, -1)
+    pos[indices] = np.arange(len(indices))
+    return pos
+
+
+def _widen(A, rows, cols, shape):
+    # place the entries of A at the given rows and columns
+    A = A.tocoo()
+    rows = A.row if rows is None else rows[A.row]
+    return sparse.csr_matrix((A.data, (rows, cols[A.col])), shape=shape)
+
+
+class _LocalWorker:
+    # runs the subdomains in this process
+
+    def __init__(self):
+        self._subdomains = {}
+        self._result = None
+
+    def send(self, message):
+        try:
+            self._result = _handle(self._subdomains, message)
+        except Exception as err:
+            self._result = err
+
+    def recv(self):
+        return self._result
+
+    def close(self):
+        self._subdomains.clear()
+
+
+class _ProcessWorker:
+    # runs the subdomains in a child process
+
+    def __init__(self, context):
+        self._conn, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child,),
+                                        daemon=True)
+        self._process.start()
+        child.close()
+
+    def send(self, message):
+        self._conn.send(message)
+
+    def recv(self):
+        return self._conn.recv()
+
+    def close(self):
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join()
+        self._conn.close()
+
+
+def _start_workers(num_workers, local=False):
+    if local:
+        return [_LocalWorker() for _ in range(num_workers)]
+    context = multiprocessing.get_context()
+    return [_ProcessWorker(context) for _ in range(num_workers)]
@@ -0,0 +1,87 @@
+import numpy as np
+import numpy.typing as npt
+
+
+class TimeSeries:
+    """A piecewise linear function of time defined by a table,
+    e.g. an hourly record of ambient or inlet temperature.
+
+    Values are held constant before the first
+    and after the last tabulated time.
+    The slopes of all intervals are precomputed,
+    so evaluation at any number of times is one vectorized
+    search of the table.
+
+    Attributes
+    ----------
+    times
+    values
+
+    Parameters
+    ----------
+    times : array_like, shape=(num_times,)
+        The tabulated times, strictly increasing.
+    values : array_like, shape=(num_times,) or (num_times, k)
+        The tabulated values, with k channels for a 2D table,
+        e.g. one column per fixed node.
+
+    Raises
+    ------
+    ValueError
+        If times is not 1D and non-empty.
+        If times is not strictly increasing.
+        If values does not have one row per time.
+    """
+
+    def __init__(self, times: npt.ArrayLike, values: npt.ArrayLike):
+        times = np.array(times, dtype=float)
+        values = np.array(values, dtype=float)
+        if times.ndim != 1 or len(times) == 0:
+            raise ValueError("times must be a non-empty 1D array")
+        if np.any(np.diff(times) <= 0.0):
+            raise ValueError("times must be strictly increasing")
+        if values.ndim not in (1, 2) or values.shape[0] != len(times):
+            raise ValueError(
+                f"values has shape {values.shape}, "
+                f"should have {len(times)} rows"
+            )
+        times.flags.writeable = False
+        values.flags.writeable = False
+        self._times = times
+        self._values = values
+        if len(times) > 1:
+            dt = np.diff(times).reshape((-1,) + (1,) * (values.ndim - 1))
+            self._slopes = np.diff(values, axis=0) / dt
+        else:
+            self._slopes = np.zeros_like(values)
+
+    @property
+    def times(self) -> npt.NDArray[np.floating]:
+        return self._times
+
+    @property
+    def values(self) -> npt.NDArray[np.floating]:
+        return self._values
+
+    def __call__(self, t: npt.ArrayLike):
+        """Evaluate the series.
+
+        Parameters
+        ----------
+        t : float or array_like
+            The time(s).
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The interpolated values, of shape
+            np.shape(t) + values.shape[1:].
+        """
+        t = np.clip(np.asarray(t, dtype=float),
+                    self._times[0], self._times[-1])
+        i = np.searchsorted(self._times, t, side="right") - 1
+        i = np.minimum(i, len(self._slopes) - 1)
+        dt = (t - self._times[i]).reshape(
+            t.shape + (1,) * (self._values.ndim - 1))
+        result = self._values[i] + self._slopes[i] * dt
+        return float(result) if result.ndim == 0 else result
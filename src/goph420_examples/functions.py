@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def exp(x):
     """Compute values of the exponential function
     for real-valued arguments.
@@ -29,3 +32,60 @@ def exp(x):
         fact_n *= n
         eps_a = abs(term / result)
     return result
+
+
+def fin_temperature(
+    x,
+    length,
+    temp_0,
+    temp_L,
+    temp_inf,
+    thrm_cond,
+    heat_trans_coef,
+    perimeter,
+    area,
+):
+    """Compute the analytic steady state temperature of a fin
+    (pipe) with convection and prescribed end temperatures.
+
+    The solution of
+    -thrm_cond * area * T'' + heat_trans_coef * perimeter
+    * (T - temp_inf) = 0 on [0, length] is
+    T = temp_inf + (theta_L * sinh(m x) + theta_0 * sinh(m (L - x)))
+    / sinh(m L), where m^2 = heat_trans_coef * perimeter
+    / (thrm_cond * area) and theta = T - temp_inf at each end.
+
+    Inputs
+    ------
+    x : float or array_like
+        The position(s) along the fin.
+    length : float
+        The length of the fin, > 0.
+    temp_0 : float
+        The temperature at x = 0.
+    temp_L : float
+        The temperature at x = length.
+    temp_inf : float
+        The ambient temperature.
+    thrm_cond : float
+        The thermal conductivity, > 0.
+    heat_trans_coef : float
+        The heat transfer coefficient, > 0.
+    perimeter : float
+        The perimeter of the cross section, > 0.
+    area : float
+        The area of the cross section, > 0.
+
+    Returns
+    -------
+    numpy.ndarray
+        The temperature(s), of the same shape as x.
+    """
+    x = np.asarray(x, dtype=float)
+    m = np.sqrt(heat_trans_coef * perimeter / (thrm_cond * area))
+    # sinh(m y) * exp(-m L), which does not overflow for long fins
+    y = np.stack([x, length - x, np.full_like(x, length)])
+    s = 0.5 * (np.exp(m * (y - length)) - np.exp(-m * (y + length)))
+    return temp_inf + (
+        (temp_L - temp_inf) * s[0] + (temp_0 - temp_inf) * s[1]
+    ) / s[2]
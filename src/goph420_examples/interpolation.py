@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 
 
@@ -7,24 +9,261 @@ def shape(s, order=1):
 
     Inputs
     ------
-    s : float
-        The local coordinate on the interval [0, 1]
+    s : float or array_like
+        The local coordinate(s) on the interval [0, 1]
     order : int, optional, default=1
         The order of interpolation.
         Valid values are [1].
 
     Returns
     -------
-    numpy.ndarray, shape=(1, order+1)
-        The array of shape function values
+    numpy.ndarray, shape=(len(s), order+1)
+        The array of shape function values,
+        one row per local coordinate.
+        A scalar s gives a single row.
 
     Raises
     ------
     ValueError
         If s cannot be converted to float.
+        If s has more than one dimension.
         If order is not in [1].
     """
-    s = float(s)
+    s = _local_coords(s)
     if order not in [1]:
         raise ValueError(f"order {order} is not valid")
-    return np.array([[(1.0-s), s]])
+    return np.stack([(1.0-s), s], axis=1)
+
+
+def shape_deriv(s, order=1):
+    """Compute derivatives of Lagrange interpolating polynomial
+    shape functions with respect to the local coordinate.
+
+    Inputs
+    ------
+    s : float or array_like
+        The local coordinate(s) on the interval [0, 1]
+    order : int, optional, default=1
+        The order of interpolation.
+        Valid values are [1].
+
+    Returns
+    -------
+    numpy.ndarray, shape=(len(s), order+1)
+        The array of shape function derivatives,
+        one row per local coordinate.
+
+    Raises
+    ------
+    ValueError
+        If s cannot be converted to float.
+        If s has more than one dimension.
+        If order is not in [1].
+    """
+    s = _local_coords(s)
+    if order not in [1]:
+        raise ValueError(f"order {order} is not valid")
+    dN = np.empty((len(s), 2))
+    dN[:, 0] = -1.0
+    dN[:, 1] = 1.0
+    return dN
+
+
+@lru_cache(maxsize=None)
+def reference_matrices(order=1, num_quad_pts=None):
+    """Compute reference element matrices on the interval [0, 1].
+
+    The matrices are integrated with Gauss-Legendre quadrature
+    and cached, so each combination of order and quadrature rule
+    is only computed once.
+    Element matrices are obtained by scaling these templates
+    by the element jacobian and material properties.
+
+    Inputs
+    ------
+    order : int, optional, default=1
+        The order of interpolation.
+        Valid values are [1].
+    num_quad_pts : int, optional
+        The number of Gauss-Legendre points.
+        The default, order + 1, integrates the mass matrix exactly.
+
+    Returns
+    -------
+    mass : numpy.ndarray, shape=(order+1, order+1)
+        The integral of N_i * N_j.
+    stiffness : numpy.ndarray, shape=(order+1, order+1)
+        The integral of dN_i/ds * dN_j/ds.
+    load : numpy.ndarray, shape=(order+1,)
+        The integral of N_i.
+        All returned arrays are read-only.
+
+    Raises
+    ------
+    ValueError
+        If order is not in [1].
+        If num_quad_pts < 1.
+    """
+    if num_quad_pts is None:
+        num_quad_pts = order + 1
+    if num_quad_pts < 1:
+        raise ValueError(
+            f"num_quad_pts {num_quad_pts} must be at least 1"
+        )
+    # map Gauss-Legendre points from [-1, 1] to [0, 1]
+    s, w = np.polynomial.legendre.leggauss(num_quad_pts)
+    s = 0.5 * (s + 1.0)
+    w = 0.5 * w
+    N = shape(s, order)
+    dN = shape_deriv(s, order)
+    mass = (N.T * w) @ N
+    stiffness = (dN.T * w) @ dN
+    load = w @ N
+    for arr in (mass, stiffness, load):
+        arr.setflags(write=False)
+    return mass, stiffness, load
+
+
+class PiecewiseInterpolator:
+    """Piecewise polynomial interpolation of tabulated data.
+
+    Consecutive groups of order + 1 data points define one interval,
+    like the nodes of an element, and the polynomial through them
+    is stored as coefficients in the local coordinate
+    s = (x - x_start) / (x_end - x_start) of the interval.
+    Evaluation locates the intervals of all query points
+    with one search and evaluates the polynomials by Horner's rule.
+
+    Attributes
+    ----------
+    order
+    breakpoints
+    coefficients
+
+    Parameters
+    ----------
+    x : array_like, shape=(n,)
+        The data positions, strictly increasing.
+    y : array_like, shape=(n,)
+        The data values.
+    order : int, optional, default=1
+        The polynomial order of each interval.
+        Valid values are [1, 2, 3].
+    extrapolate : bool, optional, default=False
+        If True, queries outside the data use the end intervals,
+        otherwise they give nan.
+
+    Raises
+    ------
+    ValueError
+        If order is not in [1, 2, 3].
+        If x and y are not 1D arrays of the same length.
+        If x is not strictly increasing.
+        If len(x) - 1 is not a positive multiple of order.
+    """
+
+    def __init__(self, x, y, order=1, extrapolate=False):
+        if order not in [1, 2, 3]:
+            raise ValueError(f"order {order} is not valid")
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.ndim != 1 or x.shape != y.shape:
+            raise ValueError(
+                f"x and y have shapes {x.shape} and {y.shape}, "
+                "must be 1D and equal"
+            )
+        if np.any(np.diff(x) <= 0.0):
+            raise ValueError("x must be strictly increasing")
+        if len(x) < 2 or (len(x) - 1) % order:
+            raise ValueError(
+                f"{len(x)} points cannot be split into "
+                f"intervals of order {order}"
+            )
+        # data points of each interval, shape (num_intervals, order + 1)
+        idx = (np.arange(0, len(x) - 1, order)[:, None]
+               + np.arange(order + 1)[None, :])
+        xe = x[idx]
+        start = xe[:, 0]
+        length = xe[:, -1] - start
+        s = (xe - start[:, None]) / length[:, None]
+        V = s[:, :, None] ** np.arange(order + 1)
+        self._coefs = np.linalg.solve(V, y[idx][:, :, None])[:, :, 0]
+        self._coefs.setflags(write=False)
+        self._breaks = np.append(start, xe[-1, -1])
+        self._breaks.setflags(write=False)
+        self._start = start
+        self._inv_length = 1.0 / length
+        self._order = order
+        self._extrapolate = extrapolate
+
+    @property
+    def order(self):
+        return self._order
+
+    @property
+    def breakpoints(self):
+        """The interval end points.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_intervals + 1,)
+        """
+        return self._breaks
+
+    @property
+    def coefficients(self):
+        """The polynomial coefficients of each interval
+        in increasing powers of the local coordinate.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_intervals, order + 1)
+        """
+        return self._coefs
+
+    def __call__(self, xq, assume_sorted=False):
+        """Evaluate the interpolant.
+
+        Parameters
+        ----------
+        xq : float or array_like
+            The query positions.
+        assume_sorted : bool, optional, default=False
+            If True, xq is taken to be 1D and non-decreasing,
+            and the intervals are found by locating the
+            breakpoints among the queries,
+            which is faster for many queries.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The interpolated values, of the shape of xq.
+        """
+        xq = np.asarray(xq, dtype=float)
+        flat = xq.reshape(-1)
+        nb = len(self._breaks)
+        if assume_sorted:
+            counts = np.diff(np.searchsorted(flat, self._breaks[1:-1]),
+                             prepend=0, append=len(flat))
+            i = np.repeat(np.arange(nb - 1), counts)
+        else:
+            i = np.searchsorted(self._breaks[1:-1], flat, side="right")
+        s = (flat - self._start[i]) * self._inv_length[i]
+        c = self._coefs[i]
+        result = c[:, -1].copy()
+        for k in range(self._order - 1, -1, -1):
+            result *= s
+            result += c[:, k]
+        if not self._extrapolate:
+            result[(flat < self._breaks[0]) | (flat > self._breaks[-1])] = (
+                np.nan
+            )
+        result = result.reshape(xq.shape)
+        return float(result) if result.ndim == 0 else result
+
+
+def _local_coords(s):
+    s = np.atleast_1d(np.asarray(s, dtype=float))
+    if s.ndim != 1:
+        raise ValueError(f"s has {s.ndim} dimensions, must be 1")
+    return s
@@ -0,0 +1,613 @@
+import weakref
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from .classes import (
+    DeferredValidation,
+    IntegrationPoint,
+    Node,
+    Element,
+)
+from .interpolation import (
+    shape,
+)
+
+
+class PipeSegment(NamedTuple):
+    """A straight pipe between two junctions of a network.
+
+    Attributes
+    ----------
+    start : int
+        The index of the junction at the start of the pipe.
+    end : int
+        The index of the junction at the end of the pipe.
+    length : float
+        The length of the pipe.
+    num_elements : int
+        The number of (linear) elements along the pipe.
+    perimeter : float, optional, default=0.0
+        The perimeter of the pipe cross section.
+    area : float, optional, default=0.0
+        The area of the pipe cross section.
+    """
+    start: int
+    end: int
+    length: float
+    num_elements: int
+    perimeter: float = 0.0
+    area: float = 0.0
+
+
+class Mesh:
+    """Group Nodes and Elements into a finite element mesh
+    and provide array views for global assembly.
+
+    Attributes
+    ----------
+    nodes
+    elements
+    num_nodes
+    num_elements
+    coords
+    connectivity
+    jacobians
+    bandwidth
+    locator
+    dtype
+    revision
+
+    Parameters
+    ----------
+    nodes : tuple[Node]
+        The nodes in the mesh.
+        Node indices must be 0, 1, ..., len(nodes) - 1
+        and are used as the global degrees of freedom.
+    elements : tuple[Element]
+        The elements in the mesh.
+    dtype : numpy.dtype, optional, default=numpy.float64
+        The floating point type of mesh arrays,
+        which is also used for element matrices and global assembly.
+
+    Raises
+    ------
+    TypeError
+        If objects in nodes are not of class Node.
+        If objects in elements are not of class Element.
+    ValueError
+        If node indices are not a permutation of range(len(nodes)).
+        If an element contains a node that is not in nodes.
+        If dtype is not a floating point type.
+    """
+    _nodes: tuple[Node, ...]
+    _elements: tuple[Element, ...]
+    _coords: npt.NDArray[np.floating]
+    _connectivity: npt.NDArray[np.integer]
+    _jacobians: npt.NDArray[np.floating]
+    _locator: "PointLocator" = None
+    _revision: int = 0
+
+    def __init__(
+        self,
+        nodes: tuple[Node],
+        elements: tuple[Element],
+        dtype: npt.DTypeLike = np.float64,
+    ):
+        dtype = np.dtype(dtype)
+        if not np.issubdtype(dtype, np.floating):
+            raise ValueError(f"dtype {dtype} is not a floating point type")
+        self._dtype = dtype
+        for nd in nodes:
+            if not isinstance(nd, Node):
+                raise TypeError("objects in nodes must be of type Node")
+        for e in elements:
+            if not isinstance(e, Element):
+                raise TypeError(
+                    "objects in elements must be of type Element"
+                )
+        num_nodes = len(nodes)
+        index = np.array([nd.index for nd in nodes], dtype=int)
+        if not np.array_equal(np.sort(index), np.arange(num_nodes)):
+            raise ValueError(
+                "node indices must be a permutation of "
+                + f"range({num_nodes})"
+            )
+        # sort nodes by global index so that nodes[k].index == k
+        self._nodes = tuple(nodes[k] for k in np.argsort(index))
+        for e in elements:
+            for nd in e.nodes:
+                if self._nodes[nd.index] is not nd:
+                    raise ValueError(
+                        f"element node {nd.index} is not in the mesh"
+                    )
+        self._elements = tuple(elements)
+
+        # node positions and element connectivity are immutable,
+        # so their array views can be computed once
+        self._coords = np.array([nd.x for nd in self._nodes], dtype=dtype)
+        self._connectivity = np.array(
+            [[nd.index for nd in e.nodes] for e in self._elements],
+            dtype=int,
+        ).reshape(len(self._elements), -1)
+        self._jacobians = np.array(
+            [e.jacobian for e in self._elements], dtype=dtype,
+        )
+        for arr in (self._coords, self._connectivity, self._jacobians):
+            arr.setflags(write=False)
+
+        # integration point setters renew the revision of the mesh
+        # through a weak reference kept with each element
+        ref = weakref.ref(self)
+        for e in self._elements:
+            e._meshes.append(ref)
+
+    @classmethod
+    def from_coords(
+        cls,
+        x: npt.ArrayLike,
+        order: int = 1,
+        dtype: npt.DTypeLike = np.float64,
+    ) -> "Mesh":
+        """Create a mesh of consecutive elements along a single pipe.
+
+        Parameters
+        ----------
+        x : array_like, shape=(num_nodes,)
+            The node positions, in increasing order.
+        order : int, optional, default=1
+            The order of interpolation of the elements.
+        dtype : numpy.dtype, optional, default=numpy.float64
+            The floating point type of mesh arrays.
+
+        Returns
+        -------
+        Mesh
+
+        Raises
+        ------
+        ValueError
+            If x is not strictly increasing.
+            If len(x) - 1 is not a multiple of order.
+        """
+        x = np.asarray(x, dtype=float)
+        if np.any(np.diff(x) <= 0.0):
+            raise ValueError("node positions must be strictly increasing")
+        if (len(x) - 1) % order:
+            raise ValueError(
+                f"{len(x)} nodes cannot be split into "
+                + f"elements of order {order}"
+            )
+        with DeferredValidation():
+            nodes = tuple(Node(k, xk) for k, xk in enumerate(x.tolist()))
+            elements = tuple(
+                Element(nodes[k:k + order + 1], order=order)
+                for k in range(0, len(nodes) - 1, order)
+            )
+        return cls(nodes, elements, dtype=dtype)
+
+    @classmethod
+    def from_network(
+        cls,
+        segments: tuple[PipeSegment],
+        reorder: bool = True,
+        dtype: npt.DTypeLike = np.float64,
+    ) -> "Mesh":
+        """Create a mesh of linear elements for a network of pipes
+        joined at junctions.
+
+        Each junction is a single node shared by all pipes
+        connected to it. Node x values are the distance along the
+        network from the first junction of each connected component
+        (through the start of each pipe) and are for reporting only;
+        element lengths are taken from the pipe lengths.
+
+        Parameters
+        ----------
+        segments : tuple[PipeSegment]
+            The pipes in the network.
+            Junctions are numbered 0, 1, ..., and every junction
+            must be the start or end of at least one pipe.
+        reorder : bool, optional, default=True
+            Whether to number nodes by reverse Cuthill-McKee
+            to minimize the bandwidth of global matrices.
+        dtype : numpy.dtype, optional, default=numpy.float64
+            The floating point type of mesh arrays.
+
+        Returns
+        -------
+        Mesh
+
+        Raises
+        ------
+        ValueError
+            If a pipe starts and ends at the same junction.
+            If a pipe length is not positive.
+            If a pipe has fewer than one element.
+            If a junction is not connected to any pipe.
+        """
+        segments = tuple(PipeSegment(*seg) for seg in segments)
+        for seg in segments:
+            if seg.start == seg.end:
+                raise ValueError(
+                    f"pipe starts and ends at junction {seg.start}"
+                )
+            if seg.length <= 0.0:
+                raise ValueError(f"pipe length {seg.length} not positive")
+            if seg.num_elements < 1:
+                raise ValueError(
+                    f"pipe has {seg.num_elements} elements, must be >= 1"
+                )
+        starts = np.array([seg.start for seg in segments], dtype=int)
+        ends = np.array([seg.end for seg in segments], dtype=int)
+        lengths = np.array([seg.length for seg in segments], dtype=float)
+        num_junctions = max(starts.max(), ends.max()) + 1
+        used = np.zeros(num_junctions, dtype=bool)
+        used[starts] = True
+        used[ends] = True
+        if not np.all(used):
+            raise ValueError(
+                f"junctions {np.flatnonzero(~used)} have no pipes"
+            )
+
+        # distance of each junction from the root of its component,
+        # keeping only the shortest of any parallel pipes
+        pairs = np.sort(np.stack([starts, ends], axis=1), axis=1)
+        order = np.lexsort((lengths, pairs[:, 1], pairs[:, 0]))
+        pairs, pair_lengths = pairs[order], lengths[order]
+        _, first = np.unique(pairs, axis=0, return_index=True)
+        graph = sparse.coo_matrix(
+            (pair_lengths[first], (pairs[first, 0], pairs[first, 1])),
+            shape=(num_junctions, num_junctions),
+        ).tocsr()
+        _, labels = csgraph.connected_components(graph, directed=False)
+        _, roots = np.unique(labels, return_index=True)
+        x_junction = np.atleast_2d(csgraph.dijkstra(
+            graph, directed=False, indices=roots,
+        )).min(axis=0)
+
+        # provisional numbering: junctions, then pipe interiors
+        x = [x_junction]
+        chains = []
+        next_id = num_junctions
+        for seg in segments:
+            n_int = seg.num_elements - 1
+            s = np.arange(1, seg.num_elements) / seg.num_elements
+            x.append(x_junction[seg.start] + s * seg.length)
+            chains.append(
+                [seg.start]
+                + list(range(next_id, next_id + n_int))
+                + [seg.end]
+            )
+            next_id += n_int
+        x = np.concatenate(x)
+        num_nodes = len(x)
+
+        edges = np.array(
+            [(a, b) for chain in chains for a, b in zip(chain, chain[1:])],
+            dtype=int,
+        )
+        if reorder:
+            adj = sparse.coo_matrix(
+                (np.ones(len(edges)), (edges[:, 0], edges[:, 1])),
+                shape=(num_nodes, num_nodes),
+            ).tocsr()
+            perm = csgraph.reverse_cuthill_mckee(
+                adj + adj.T, symmetric_mode=True,
+            )
+        else:
+            perm = np.arange(num_nodes)
+        new_index = np.empty(num_nodes, dtype=int)
+        new_index[perm] = np.arange(num_nodes)
+
+        with DeferredValidation():
+            nodes = [Node(k, xk) for k, xk in
+                     zip(new_index.tolist(), x.tolist())]
+            elements = [
+                Element((nodes[a], nodes[b]), order=1,
+                        length=seg.length / seg.num_elements)
+                for seg, chain in zip(segments, chains)
+                for a, b in zip(chain, chain[1:])
+            ]
+        int_pts = [ip for e in elements for ip in e.int_pts]
+        num_int_pts = len(int_pts) // len(elements)
+        for name in ("perimeter", "area"):
+            values = [getattr(seg, name) for seg in segments]
+            IntegrationPoint.set_values(int_pts, name, np.repeat(
+                values, [num_int_pts * seg.num_elements for seg in segments]))
+        # order elements by their nodes for locality in assembly
+        elements.sort(key=lambda e: min(nd.index for nd in e.nodes))
+        return cls(tuple(nodes), tuple(elements), dtype=dtype)
+
+    @property
+    def nodes(self) -> tuple[Node, ...]:
+        """The nodes of the mesh, sorted by global index.
+
+        Returns
+        -------
+        tuple[Node, ...]
+        """
+        return self._nodes
+
+    @property
+    def elements(self) -> tuple[Element, ...]:
+        """The elements of the mesh.
+
+        Returns
+        -------
+        tuple[Element, ...]
+        """
+        return self._elements
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def num_elements(self) -> int:
+        return len(self.elements)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def coords(self) -> npt.NDArray[np.floating]:
+        """The node positions, ordered by global index.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+            A read-only array.
+        """
+        return self._coords
+
+    @property
+    def connectivity(self) -> npt.NDArray[np.integer]:
+        """The global node indices of each element.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_elements, nodes per element)
+            A read-only array.
+        """
+        return self._connectivity
+
+    @property
+    def jacobians(self) -> npt.NDArray[np.floating]:
+        """The jacobian of each element.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_elements,)
+            A read-only array.
+        """
+        return self._jacobians
+
+    @property
+    def bandwidth(self) -> int:
+        """The largest difference in global index
+        between two nodes of the same element.
+
+        Returns
+        -------
+        int
+        """
+        conn = self.connectivity
+        return int((conn.max(axis=1) - conn.min(axis=1)).max())
+
+    @property
+    def locator(self) -> "PointLocator":
+        """The point-location index of the mesh,
+        built on first access.
+
+        Returns
+        -------
+        PointLocator
+
+        Raises
+        ------
+        ValueError
+            If elements overlap in x, as in network meshes.
+        """
+        if self._locator is None:
+            self._locator = PointLocator(self)
+        return self._locator
+
+    @property
+    def revision(self) -> int:
+        """The revision of the integration point material properties.
+
+        The value changes whenever a property other than temp
+        of an integration point of the mesh is set, so results
+        derived from the properties, e.g. the mesh fingerprint,
+        can be cached while it is unchanged.
+        Changes to other meshes do not affect it.
+
+        Returns
+        -------
+        int
+        """
+        return self._revision
+
+    def int_pt_values(self, name: str) -> npt.NDArray[np.floating]:
+        """Gather an integration point property from all elements.
+
+        Parameters
+        ----------
+        name : str
+            The IntegrationPoint property, e.g. "thrm_cond".
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_elements, num_int_pts)
+            An array of the mesh dtype.
+
+        Raises
+        ------
+        AttributeError
+            If name is not an IntegrationPoint property.
+        """
+        return np.array(
+            [[getattr(ip, name) for ip in e.int_pts]
+             for e in self.elements],
+            dtype=self.dtype,
+        ).reshape(self.num_elements, -1)
+
+    def set_int_pt_values(self, name: str, values: npt.ArrayLike) -> None:
+        """Assign an integration point property of all elements
+        with one vectorized check of all values.
+
+        Parameters
+        ----------
+        name : str
+            The IntegrationPoint property, e.g. "thrm_cond".
+        values : float or array_like
+            The values, broadcastable to (num_elements, num_int_pts).
+
+        Raises
+        ------
+        AttributeError
+            If name is not a settable IntegrationPoint property.
+        ValueError
+            If values cannot be broadcast.
+            If a value is not valid for the property,
+            see IntegrationPoint.set_values.
+            Indices are into the flattened values.
+        """
+        num_int_pts = self.elements[0].num_int_pts
+        values = np.broadcast_to(
+            np.asarray(values), (self.num_elements, num_int_pts))
+        int_pts = [ip for e in self.elements for ip in e.int_pts]
+        IntegrationPoint.set_values(int_pts, name, values.ravel())
+
+
+class PointLocator:
+    """Index of element extents for finding the element
+    that contains arbitrary positions.
+
+    Element extents are sorted by their left end,
+    so each position is located by bisection in O(log n).
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+        Elements must not overlap in x.
+    tol : float, optional, default=1e-12
+        The tolerance, relative to the mesh extent,
+        for positions just outside the mesh and for element overlap.
+
+    Raises
+    ------
+    ValueError
+        If elements overlap in x.
+    """
+
+    def __init__(self, mesh: Mesh, tol: float = 1.0e-12):
+        conn = mesh.connectivity
+        x_e = mesh.coords[conn]
+        x_min = x_e.min(axis=1)
+        x_max = x_e.max(axis=1)
+        order = np.argsort(x_min, kind="stable")
+        self._mesh = mesh
+        self._order = order
+        self._x_min = x_min[order]
+        self._x_max = x_max[order]
+        self._tol = tol * max(x_max.max() - x_min.min(), 1.0)
+        if np.any(self._x_min[1:] < self._x_max[:-1] - self._tol):
+            raise ValueError("elements overlap in x")
+        # end node positions of each element, in local coordinate order
+        self._x0 = x_e[:, 0]
+        self._dx = x_e[:, -1] - x_e[:, 0]
+
+    def locate(self, xs: npt.ArrayLike):
+        """Find the elements containing a set of positions.
+
+        Parameters
+        ----------
+        xs : array_like, shape=(m,)
+            The positions to locate.
+
+        Returns
+        -------
+        element_ids : numpy.ndarray of int, shape=(m,)
+            The index in mesh.elements of the containing element,
+            or -1 for positions outside the mesh.
+            Positions on a shared node go to the element on the right.
+        local_coords : numpy.ndarray, shape=(m,)
+            The local coordinate within the element,
+            or nan for positions outside the mesh.
+        """
+        xs = np.atleast_1d(np.asarray(xs, dtype=float))
+        k = np.searchsorted(self._x_min, xs, side="right") - 1
+        # a position just left of the mesh belongs to the first element
+        k[(k < 0) & (xs >= self._x_min[0] - self._tol)] = 0
+        inside = (k >= 0) & (xs <= self._x_max[k] + self._tol)
+        element_ids = np.where(inside, self._order[k], -1)
+        e = element_ids[inside]
+        local_coords = np.full(xs.shape, np.nan)
+        local_coords[inside] = np.clip(
+            (xs[inside] - self._x0[e]) / self._dx[e], 0.0, 1.0,
+        )
+        return element_ids, local_coords
+
+    def probe(
+        self,
+        field: npt.ArrayLike,
+        xs: npt.ArrayLike,
+    ) -> npt.NDArray[np.floating]:
+        """Evaluate a nodal field at arbitrary positions
+        by interpolation with the element shape functions.
+
+        Parameters
+        ----------
+        field : array_like, shape=(num_nodes,)
+            The nodal values, ordered by global index.
+        xs : array_like, shape=(m,)
+            The positions to evaluate at.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(m,)
+            The interpolated values, nan outside the mesh.
+        """
+        field = np.asarray(field, dtype=float)
+        element_ids, local_coords = self.locate(xs)
+        inside = element_ids >= 0
+        conn = self._mesh.connectivity
+        values = np.full(local_coords.shape, np.nan)
+        N = shape(local_coords[inside], conn.shape[1] - 1)
+        values[inside] = np.sum(
+            N * field[conn[element_ids[inside]]], axis=1,
+        )
+        return values
+
+    def probe_matrix(self, xs: npt.ArrayLike) -> sparse.csr_matrix:
+        """Build the sparse matrix that maps nodal values
+        to values at a set of positions, so that
+        probe(field, xs) == probe_matrix(xs) @ field inside the mesh.
+
+        Parameters
+        ----------
+        xs : array_like, shape=(m,)
+            The positions to evaluate at.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix, shape=(m, num_nodes)
+            Rows for positions outside the mesh are zero.
+        """
+        element_ids, local_coords = self.locate(xs)
+        inside = np.flatnonzero(element_ids >= 0)
+        conn = self._mesh.connectivity
+        k = conn.shape[1]
+        N = shape(local_coords[inside], k - 1)
+        return sparse.csr_matrix(
+            (N.ravel(),
+             (np.repeat(inside, k), conn[element_ids[inside]].ravel())),
+            shape=(len(element_ids), self._mesh.num_nodes),
+        )
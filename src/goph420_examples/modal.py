@@ -0,0 +1,211 @@
+import numpy as np
+import numpy.typing as npt
+from scipy.linalg import eigh
+from scipy.sparse.linalg import eigsh, splu
+
+from .assembly import (
+    apply_dirichlet,
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+    assemble_storage_matrix,
+)
+from .mesh import (
+    Mesh,
+)
+
+# below this many free nodes the eigenproblem is solved densely
+_DENSE_SIZE = 200
+
+
+class ModalSolver:
+    """Closed-form transient solution of C dT/dt + H T = Q
+    with constant properties and fixed temperatures
+    by truncated modal superposition.
+
+    The solution is T(t) = T_s + sum_i phi_i exp(-lam_i (t - t0)) c_i
+    on the free nodes, where T_s is the steady state,
+    (lam_i, phi_i) are the generalized eigenpairs
+    H phi = lam C phi with the smallest eigenvalues,
+    normalized so that phi_i^T C phi_i = 1,
+    and c_i = phi_i^T C (T(t0) - T_s).
+    The eigenpairs are computed once, so the temperature field
+    at any number of output times costs one small matrix product
+    and no time stepping.
+
+    Attributes
+    ----------
+    mesh
+    num_modes
+    eigenvalues
+    modes
+    time_constants
+    steady_state
+    truncation_error
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    temps : array_like, shape=(num_nodes,)
+        The initial nodal temperatures.
+        Values at fixed nodes are replaced by fixed_temps.
+    fixed : array_like of int, optional
+        The global indices of nodes with prescribed temperature.
+    fixed_temps : array_like, optional
+        The prescribed temperatures.
+    num_modes : int, optional, default=20
+        The number of modes kept, at most the number of free nodes.
+    time : float, optional, default=0.0
+        The time of the initial temperatures.
+
+    Raises
+    ------
+    ValueError
+        If num_modes < 1.
+        If fixed_temps does not have one value per fixed node.
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        temps: npt.ArrayLike,
+        fixed: npt.ArrayLike = (),
+        fixed_temps: npt.ArrayLike = (),
+        num_modes: int = 20,
+        time: float = 0.0,
+    ):
+        num_modes = int(num_modes)
+        if num_modes < 1:
+            raise ValueError(f"num_modes {num_modes} must be >= 1")
+        fixed = np.asarray(fixed, dtype=int)
+        fixed_temps = np.asarray(fixed_temps, dtype=float)
+        if fixed_temps.shape != fixed.shape:
+            raise ValueError(
+                f"got {fixed_temps.size} fixed temperatures "
+                f"for {len(fixed)} fixed nodes"
+            )
+        H = assemble_conduction_matrix(mesh)
+        C = assemble_storage_matrix(mesh)
+        Q = assemble_flux_vector(mesh)
+        H_ff, Q_f, free = apply_dirichlet(H, Q, fixed, fixed_temps)
+        C_ff = C[free][:, free]
+        H_ff = H_ff.tocsc()
+
+        steady = np.empty(mesh.num_nodes)
+        steady[free] = splu(H_ff).solve(np.asarray(Q_f, dtype=H_ff.dtype))
+        steady[fixed] = fixed_temps
+
+        num_modes = min(num_modes, len(free))
+        if len(free) <= _DENSE_SIZE or num_modes >= len(free) - 1:
+            lam, phi = eigh(H_ff.toarray(), C_ff.toarray(),
+                            subset_by_index=[0, num_modes - 1])
+        else:
+            # shift-invert about zero finds the slowest modes
+            lam, phi = eigsh(H_ff, k=num_modes, M=C_ff.tocsc(), sigma=0.0,
+                             which="LM")
+            order = np.argsort(lam)
+            lam, phi = lam[order], phi[:, order]
+
+        u0 = np.asarray(temps, dtype=float)[free] - steady[free]
+        C_u0 = C_ff @ u0
+        coefs = phi.T @ C_u0
+        # C-norm of the initial deviation the modes leave out
+        u0_norm2 = u0 @ C_u0
+        self._truncation_error = (
+            np.sqrt(max(u0_norm2 - coefs @ coefs, 0.0) / u0_norm2)
+            if u0_norm2 > 0.0 else 0.0
+        )
+
+        self._mesh = mesh
+        self._free = free
+        self._eigenvalues = lam
+        self._modes = phi
+        self._coefs = coefs
+        self._steady = steady
+        self._time = float(time)
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def num_modes(self) -> int:
+        return len(self._eigenvalues)
+
+    @property
+    def eigenvalues(self) -> npt.NDArray[np.floating]:
+        """The generalized eigenvalues lam_i in increasing order.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_modes,)
+        """
+        return self._eigenvalues
+
+    @property
+    def modes(self) -> npt.NDArray[np.floating]:
+        """The C-orthonormal eigenvectors of the free nodes.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_free, num_modes)
+        """
+        return self._modes
+
+    @property
+    def time_constants(self) -> npt.NDArray[np.floating]:
+        """The decay time 1 / lam_i of each mode.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_modes,)
+        """
+        return 1.0 / self._eigenvalues
+
+    @property
+    def steady_state(self) -> npt.NDArray[np.floating]:
+        """The nodal temperatures as t -> infinity.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+        """
+        return self._steady
+
+    @property
+    def truncation_error(self) -> float:
+        """The relative C-norm of the initial deviation from
+        the steady state that is not represented by the modes.
+        It bounds the relative error at all later times.
+
+        Returns
+        -------
+        float
+        """
+        return self._truncation_error
+
+    def evaluate(self, times: npt.ArrayLike) -> npt.NDArray[np.floating]:
+        """Evaluate the nodal temperatures at arbitrary times.
+
+        Parameters
+        ----------
+        times : float or array_like, shape=(m,)
+            The output times, not before the initial time.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,) or (m, num_nodes)
+
+        Raises
+        ------
+        ValueError
+            If any time is before the initial time.
+        """
+        times = np.asarray(times, dtype=float)
+        elapsed = np.atleast_1d(times) - self._time
+        if np.any(elapsed < 0.0):
+            raise ValueError("times must not be before the initial time")
+        amplitudes = np.exp(-np.outer(elapsed, self._eigenvalues))
+        temps = np.tile(self._steady, (len(elapsed), 1))
+        temps[:, self._free] += (amplitudes * self._coefs) @ self._modes.T
+        return temps[0] if times.ndim == 0 else temps
@@ -0,0 +1,283 @@
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, splu
+
+from .assembly import (
+    assemble_mass_matrix,
+)
+from .interpolation import (
+    shape,
+    reference_matrices,
+)
+from .mesh import (
+    Mesh,
+)
+
+
+class MatrixFreeOperator(LinearOperator):
+    """Apply an assembled global matrix of the form
+    sum_e (a_e * M + b_e * K)
+    without storing it, where M and K are the reference
+    mass and stiffness matrices of the elements.
+
+    Each product is a vectorized gather of element nodal values,
+    a multiply by the reference matrices
+    and a scatter-add back to the nodes,
+    so memory use is proportional to the mesh size.
+    Products are computed in the mesh dtype.
+
+    Attributes
+    ----------
+    mesh
+    mass_coef
+    stiffness_coef
+    free
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    mass_coef : array_like, shape=(num_elements,)
+        The scale factor a_e of the reference mass matrix.
+    stiffness_coef : array_like, shape=(num_elements,)
+        The scale factor b_e of the reference stiffness matrix.
+    free : array_like of int, optional
+        The global indices of the unknowns the operator acts on.
+        Other nodes are treated as zero and dropped from the result,
+        which gives the operator of the system after Dirichlet
+        elimination. Default is all nodes.
+
+    Raises
+    ------
+    ValueError
+        If mass_coef or stiffness_coef do not have one value
+        per element.
+    """
+    _mesh: Mesh
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        mass_coef: npt.ArrayLike,
+        stiffness_coef: npt.ArrayLike,
+        free: npt.ArrayLike = None,
+    ):
+        ne = mesh.num_elements
+        mass_coef = np.asarray(mass_coef, dtype=mesh.dtype)
+        stiffness_coef = np.asarray(stiffness_coef, dtype=mesh.dtype)
+        for name, coef in (("mass_coef", mass_coef),
+                           ("stiffness_coef", stiffness_coef)):
+            if coef.shape != (ne,):
+                raise ValueError(
+                    f"{name} has shape {coef.shape}, should be ({ne},)"
+                )
+        self._mesh = mesh
+        self._mass_coef = mass_coef
+        self._stiffness_coef = stiffness_coef
+        self._free = None if free is None else np.asarray(free, dtype=int)
+        n = mesh.num_nodes if free is None else len(self._free)
+        super().__init__(dtype=mesh.dtype, shape=(n, n))
+
+        order = mesh.connectivity.shape[1] - 1
+        mass, stiffness, _ = reference_matrices(order)
+        self._mass = mass.astype(mesh.dtype)
+        self._stiffness = stiffness.astype(mesh.dtype)
+        self._conn = mesh.connectivity
+        self._flat_conn = mesh.connectivity.ravel()
+
+    @classmethod
+    def conduction(cls, mesh: Mesh, free: npt.ArrayLike = None):
+        """Create the matrix-free global conduction operator.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            The finite element mesh.
+        free : array_like of int, optional
+            The global indices of the unknowns.
+
+        Returns
+        -------
+        MatrixFreeOperator
+        """
+        h = mesh.int_pt_values("heat_trans_coef")[:, 0]
+        lam = mesh.int_pt_values("thrm_cond")[:, 0]
+        P = mesh.int_pt_values("perimeter")[:, 0]
+        A = mesh.int_pt_values("area")[:, 0]
+        jac = mesh.jacobians
+        return cls(mesh, h * P * jac, lam * A / jac, free=free)
+
+    @classmethod
+    def storage(cls, mesh: Mesh, free: npt.ArrayLike = None):
+        """Create the matrix-free global storage operator.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            The finite element mesh.
+        free : array_like of int, optional
+            The global indices of the unknowns.
+
+        Returns
+        -------
+        MatrixFreeOperator
+        """
+        rho = mesh.int_pt_values("density")[:, 0]
+        c = mesh.int_pt_values("spec_heat_cap")[:, 0]
+        A = mesh.int_pt_values("area")[:, 0]
+        jac = mesh.jacobians
+        return cls(mesh, rho * c * A * jac, np.zeros(mesh.num_elements),
+                   free=free)
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def mass_coef(self) -> npt.NDArray[np.floating]:
+        return self._mass_coef
+
+    @property
+    def stiffness_coef(self) -> npt.NDArray[np.floating]:
+        return self._stiffness_coef
+
+    @property
+    def free(self) -> npt.NDArray[np.integer]:
+        return self._free
+
+    def diagonal(self) -> npt.NDArray[np.floating]:
+        """Compute the diagonal of the assembled matrix.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(n,)
+        """
+        diag_e = (np.outer(self._mass_coef, np.diag(self._mass))
+                  + np.outer(self._stiffness_coef, np.diag(self._stiffness)))
+        diag = self._scatter(diag_e)
+        return diag if self._free is None else diag[self._free]
+
+    def _matvec(self, x):
+        x = np.asarray(x, dtype=self.dtype).reshape(-1)
+        if self._free is not None:
+            x_full = np.zeros(self._mesh.num_nodes, dtype=self.dtype)
+            x_full[self._free] = x
+            x = x_full
+        # gather, multiply, scatter
+        ue = x[self._conn]
+        ye = ue @ self._mass
+        ye *= self._mass_coef[:, None]
+        ye += self._stiffness_coef[:, None] * (ue @ self._stiffness)
+        y = self._scatter(ye)
+        return y if self._free is None else y[self._free]
+
+    def _rmatvec(self, x):
+        # the reference matrices are symmetric
+        return self._matvec(x)
+
+    def _scatter(self, values_e):
+        return np.bincount(
+            self._flat_conn,
+            weights=values_e.ravel(),
+            minlength=self._mesh.num_nodes,
+        ).astype(self.dtype, copy=False)
+
+
+class IntegrationPointTransfer:
+    """Transfer fields between nodes and integration points.
+
+    Interpolation to integration points is a single product
+    with a precomputed sparse matrix of shape function values.
+    Transfer back to the nodes is an L2 projection,
+    solved with a factorization of the consistent mass matrix
+    that is computed once.
+
+    Attributes
+    ----------
+    mesh
+    interpolation_matrix
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    """
+    _mesh: Mesh
+
+    def __init__(self, mesh: Mesh):
+        conn = mesh.connectivity
+        ne, k = conn.shape
+        order = k - 1
+        int_pts = [ip for e in mesh.elements for ip in e.int_pts]
+        s = np.array([ip.local_coord for ip in int_pts])
+        w = np.array([ip.weight for ip in int_pts])
+        nip = len(int_pts) // ne
+        N = shape(s, order)
+        rows = np.repeat(np.arange(ne * nip), k)
+        cols = np.repeat(conn, nip, axis=0).ravel()
+        self._N = sparse.csr_matrix(
+            (N.ravel(), (rows, cols)),
+            shape=(ne * nip, mesh.num_nodes),
+        )
+        # integration weights scaled to physical length
+        self._wj = w * np.repeat(mesh.jacobians, nip)
+        self._mass_lu = splu(assemble_mass_matrix(mesh).tocsc())
+        self._mesh = mesh
+        self._int_pts = tuple(int_pts)
+        self._shape = (ne, nip)
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def interpolation_matrix(self) -> sparse.csr_matrix:
+        """The sparse matrix of shape function values
+        at all integration points.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix, shape=(num_int_pts_total, num_nodes)
+        """
+        return self._N
+
+    def to_int_pts(self, values: npt.ArrayLike) -> npt.NDArray:
+        """Interpolate nodal values to the integration points.
+
+        Parameters
+        ----------
+        values : array_like, shape=(num_nodes,)
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_elements, num_int_pts)
+        """
+        return (self._N @ np.asarray(values, dtype=float)).reshape(
+            self._shape
+        )
+
+    def to_nodes(self, values: npt.ArrayLike) -> npt.NDArray:
+        """Project integration point values to the nodes (L2).
+
+        Parameters
+        ----------
+        values : array_like, shape=(num_elements, num_int_pts)
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        return self._mass_lu.solve(self._N.T @ (self._wj * values))
+
+    def update_int_pt_temps(self, temps: npt.ArrayLike) -> None:
+        """Set the temperature of every integration point
+        from nodal temperatures.
+
+        Parameters
+        ----------
+        temps : array_like, shape=(num_nodes,)
+        """
+        for ip, T in zip(self._int_pts, self.to_int_pts(temps).ravel()):
+            ip.temp = T
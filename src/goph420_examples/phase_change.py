@@ -0,0 +1,467 @@
+import warnings
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from .assembly import (
+    apply_dirichlet,
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+    assemble_storage_matrix,
+)
+from .interpolation import (
+    shape,
+)
+from .mesh import (
+    Mesh,
+)
+
+
+def liquid_fraction(
+    temps: npt.ArrayLike,
+    melt_temp: npt.ArrayLike,
+    half_width: npt.ArrayLike,
+) -> npt.NDArray[np.floating]:
+    """Compute the smoothed liquid (unfrozen) fraction.
+
+    The fraction rises from 0 at melt_temp - half_width
+    to 1 at melt_temp + half_width along a smooth step
+    whose derivative is the cosine bump of phase_change_density.
+
+    Inputs
+    ------
+    temps : array_like
+        The temperatures.
+    melt_temp : array_like
+        The phase change temperature.
+    half_width : array_like
+        The half width of the phase change band, > 0.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    x = np.clip((np.asarray(temps) - melt_temp) / half_width, -1.0, 1.0)
+    return 0.5 * (1.0 + x) + np.sin(np.pi * x) / (2.0 * np.pi)
+
+
+def phase_change_density(
+    temps: npt.ArrayLike,
+    melt_temp: npt.ArrayLike,
+    half_width: npt.ArrayLike,
+) -> npt.NDArray[np.floating]:
+    """Compute the derivative of the liquid fraction
+    with respect to temperature.
+
+    Multiplied by the latent heat, this is the latent part
+    of the apparent heat capacity. It is zero outside the
+    phase change band and integrates to 1 across it.
+
+    Inputs
+    ------
+    temps : array_like
+        The temperatures.
+    melt_temp : array_like
+        The phase change temperature.
+    half_width : array_like
+        The half width of the phase change band, > 0.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    x = (np.asarray(temps) - melt_temp) / half_width
+    inside = np.abs(x) < 1.0
+    return np.where(inside, 0.5 * (1.0 + np.cos(np.pi * x)), 0.0) / half_width
+
+
+# the most step halvings in one Newton iteration
+_MAX_BACKTRACK = 30
+
+
+class NewtonStats(NamedTuple):
+    """Convergence statistics of the Newton iteration of one step.
+
+    Attributes
+    ----------
+    converged : bool
+        Whether the largest temperature update reached the tolerance.
+    iterations : int
+        The number of Newton iterations.
+    num_band_elements : int
+        The number of elements with an integration point
+        inside the phase change band at the last iteration.
+    """
+    converged: bool
+    iterations: int
+    num_band_elements: int
+
+
+class PhaseChangeIntegrator:
+    """Integrate heat flow with latent heat of freezing and thawing
+    by backward Euler in enthalpy form.
+
+    The enthalpy per unit volume is the sensible part
+    density * spec_heat_cap * T plus the latent part
+    density * latent_heat * f(T), where f is the liquid_fraction.
+    Each step solves
+    (E(T) - E(T_old)) / dt + H T = Q
+    by Newton's method, which conserves energy even when a step
+    crosses the phase change band. Updates are shortened until the
+    residual decreases, since a full update from outside the band
+    does not see the latent heat and can jump across it.
+    The Jacobian is A0 = C / dt + H plus the latent storage matrices,
+    i.e. the apparent heat capacity at the integration point
+    temperatures, of the elements inside the band.
+    A0 is assembled and factorized once. Only the band elements
+    are re-evaluated in each iteration, and their contribution
+    U K U^T, with U selecting the m free nodes of the band,
+    is applied as a low-rank correction of the A0 factorization
+    by the Sherman-Morrison-Woodbury identity (see IncrementalSolver).
+    Columns of A0^-1 U are cached while their node stays in the band,
+    so an iteration costs one triangular solve pair plus one for each
+    node entering the band. If m exceeds max_rank, the Jacobian is
+    factorized instead.
+
+    Integration point temperatures are kept as an array.
+    Use IntegrationPointTransfer.update_int_pt_temps
+    to copy them to the IntegrationPoint objects.
+
+    Attributes
+    ----------
+    mesh
+    dt
+    time
+    step_count
+    temps
+    int_pt_temps
+    liquid_fraction
+    stats
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    dt : float
+        The time step.
+    latent_heat : float or array_like, shape=(num_elements,)
+        The latent heat per unit mass.
+    melt_temp : float or array_like, shape=(num_elements,)
+        The phase change temperature.
+    half_width : float or array_like, shape=(num_elements,)
+        The half width of the phase change temperature band.
+    fixed : array_like of int, optional
+        The global indices of nodes with prescribed temperature.
+    fixed_temps : array_like, optional
+        The prescribed temperatures.
+    temps : array_like, shape=(num_nodes,), optional
+        The initial nodal temperatures, default is zero.
+        Values at fixed nodes are replaced by fixed_temps.
+    time : float, optional, default=0.0
+        The initial time.
+    tol : float, optional, default=1.0e-8
+        The Newton tolerance on the largest temperature update.
+    max_iter : int, optional, default=25
+        The maximum number of Newton iterations per step.
+        A RuntimeWarning is issued for steps that do not converge.
+    max_rank : int, optional, default=64
+        The largest number of band nodes applied as a low-rank
+        correction, which bounds the cached columns to
+        max_rank * num_nodes values.
+
+    Raises
+    ------
+    ValueError
+        If dt <= 0.
+        If any half_width <= 0.
+        If fixed_temps does not have one value per fixed node.
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        dt: float,
+        latent_heat: npt.ArrayLike,
+        melt_temp: npt.ArrayLike,
+        half_width: npt.ArrayLike,
+        fixed: npt.ArrayLike = (),
+        fixed_temps: npt.ArrayLike = (),
+        temps: npt.ArrayLike = None,
+        time: float = 0.0,
+        tol: float = 1.0e-8,
+        max_iter: int = 25,
+        max_rank: int = 64,
+    ):
+        dt = float(dt)
+        if dt <= 0.0:
+            raise ValueError(f"dt {dt} must be positive")
+        ne = mesh.num_elements
+        self._melt_temp = np.broadcast_to(
+            np.asarray(melt_temp, dtype=float), (ne,))[:, None]
+        self._half_width = np.broadcast_to(
+            np.asarray(half_width, dtype=float), (ne,))[:, None]
+        if np.any(self._half_width <= 0.0):
+            raise ValueError("half_width must be positive")
+        fixed = np.asarray(fixed, dtype=int)
+        fixed_temps = np.asarray(fixed_temps, dtype=float)
+        if fixed_temps.shape != fixed.shape:
+            raise ValueError(
+                f"got {fixed_temps.size} fixed temperatures "
+                f"for {len(fixed)} fixed nodes"
+            )
+
+        conn = mesh.connectivity
+        order = conn.shape[1] - 1
+        int_pts = mesh.elements[0].int_pts
+        s = np.array([ip.local_coord for ip in int_pts])
+        w = np.array([ip.weight for ip in int_pts])
+        self._N = shape(s, order)
+        # latent enthalpy weights rho * L * A * jac * w_q * N_i(s_q)
+        rho = mesh.int_pt_values("density")[:, 0]
+        A = mesh.int_pt_values("area")[:, 0]
+        latent_heat = np.broadcast_to(
+            np.asarray(latent_heat, dtype=float), (ne,))
+        self._latent_weights = (
+            (rho * latent_heat * A * mesh.jacobians)[:, None, None]
+            * (w[:, None] * self._N)[None]
+        )
+        self._latent = rho * latent_heat != 0.0
+
+        H = assemble_conduction_matrix(mesh)
+        self._C = assemble_storage_matrix(mesh)
+        self._H = H
+        self._Q = assemble_flux_vector(mesh)
+        A0 = (self._C / dt + H).tocsr()
+        A0_ff, _, free = apply_dirichlet(
+            A0, self._Q, fixed, fixed_temps)
+        self._A0_ff = A0_ff.tocsc()
+        self._lu0 = splu(self._A0_ff)
+        # map from global to free indices, -1 at fixed nodes
+        self._free_index = np.full(mesh.num_nodes, -1)
+        self._free_index[free] = np.arange(len(free))
+
+        self._mesh = mesh
+        self._conn = conn
+        self._free = free
+        self._fixed = fixed
+        self._dt = dt
+        self._tol = float(tol)
+        self._max_iter = int(max_iter)
+        self._max_rank = int(max_rank)
+        # columns of A0^-1 U by free node index
+        self._Z = {}
+        self._temps = np.zeros(mesh.num_nodes)
+        if temps is not None:
+            self._temps[:] = temps
+        self._temps[fixed] = fixed_temps
+        self._time = float(time)
+        self._step_count = 0
+        self._stats = None
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @property
+    def time(self) -> float:
+        return self._time
+
+    @property
+    def step_count(self) -> int:
+        return self._step_count
+
+    @property
+    def temps(self) -> npt.NDArray[np.floating]:
+        """The current nodal temperatures.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+        """
+        return self._temps
+
+    @property
+    def int_pt_temps(self) -> npt.NDArray[np.floating]:
+        """The current integration point temperatures.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_elements, num_int_pts)
+        """
+        return self._temps[self._conn] @ self._N.T
+
+    @property
+    def liquid_fraction(self) -> npt.NDArray[np.floating]:
+        """The current liquid fraction at the integration points.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_elements, num_int_pts)
+        """
+        return liquid_fraction(
+            self.int_pt_temps, self._melt_temp, self._half_width)
+
+    @property
+    def stats(self) -> NewtonStats:
+        """The Newton statistics of the most recent step.
+
+        Returns
+        -------
+        NewtonStats or None
+        """
+        return self._stats
+
+    def enthalpy(self, temps: npt.ArrayLike = None) -> float:
+        """Compute the total enthalpy of the mesh.
+
+        Parameters
+        ----------
+        temps : array_like, shape=(num_nodes,), optional
+            The nodal temperatures, default is the current ones.
+
+        Returns
+        -------
+        float
+        """
+        T = self._temps if temps is None else np.asarray(temps, float)
+        return float(np.sum(self._C @ T) + np.sum(self._latent_enthalpy(T)))
+
+    def step(self, num_steps: int = 1) -> npt.NDArray[np.floating]:
+        """Advance the solution.
+
+        Parameters
+        ----------
+        num_steps : int, optional, default=1
+            The number of time steps to take.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+            The nodal temperatures after the last step.
+        """
+        for _ in range(num_steps):
+            self._newton_step()
+            self._step_count += 1
+            self._time += self._dt
+        return self._temps
+
+    def _newton_step(self):
+        dt = self._dt
+        free = self._free
+        T_old = self._temps.copy()
+        # the parts of the residual that are fixed during the step
+        rhs = (self._C @ T_old + self._latent_enthalpy(T_old)) / dt + self._Q
+        T = self._temps
+
+        def residual(T):
+            R = ((self._C @ T + self._latent_enthalpy(T)) / dt
+                 + self._H @ T - rhs)
+            return R[free]
+
+        R = residual(T)
+        norm = np.linalg.norm(R)
+        converged = False
+        for it in range(1, self._max_iter + 1):
+            band, K_band = self._band_jacobians(T)
+            dT = self._solve_jacobian(band, K_band / dt, R)
+            # backtrack until the residual decreases, a full step
+            # from outside the band can jump across it
+            T_try = T.copy()
+            step = 1.0
+            for _ in range(_MAX_BACKTRACK):
+                T_try[free] = T[free] - step * dT
+                R_try = residual(T_try)
+                norm_try = np.linalg.norm(R_try)
+                if norm_try <= (1.0 - 1.0e-4 * step) * norm:
+                    break
+                step *= 0.5
+            T[:] = T_try
+            R, norm = R_try, norm_try
+            update = np.abs(dT).max(initial=0.0)
+            if update <= self._tol:
+                converged = True
+                break
+        # keep only the columns of the current band nodes
+        nodes = self._band_nodes(band)
+        self._Z = {j: self._Z[j] for j in nodes.tolist() if j in self._Z}
+        self._stats = NewtonStats(
+            converged=converged,
+            iterations=it,
+            num_band_elements=len(band),
+        )
+        if not converged:
+            warnings.warn(
+                f"Newton iteration of step {self._step_count + 1} did "
+                f"not converge in {it} iterations, the last update was "
+                f"{update:.3e}",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+
+    def _solve_jacobian(self, band, mats, r):
+        # solve (A0 + U K U^T) x = r by a low-rank update of A0
+        y = self._lu0.solve(r)
+        nodes = self._band_nodes(band)
+        m = len(nodes)
+        if m == 0:
+            return y
+        if m > self._max_rank:
+            J = self._A0_ff + self._stamp_free(band, mats)
+            return splu(J.tocsc()).solve(r)
+        new = [j for j in nodes.tolist() if j not in self._Z]
+        if new:
+            E = np.zeros((len(r), len(new)))
+            E[new, np.arange(len(new))] = 1.0
+            self._Z.update(zip(new, self._lu0.solve(E).T))
+        Z = np.stack([self._Z[j] for j in nodes.tolist()], axis=1)
+        # accumulate the element matrices on the band nodes
+        idx = self._free_index[self._conn[band]]
+        pos = np.searchsorted(nodes, idx)
+        k = idx.shape[1]
+        rows = np.repeat(pos, k, axis=1).ravel()
+        cols = np.tile(pos, (1, k)).ravel()
+        keep = ((idx >= 0)[:, :, None] & (idx >= 0)[:, None, :]).ravel()
+        K = np.zeros((m, m))
+        np.add.at(K, (rows[keep], cols[keep]), mats.ravel()[keep])
+        y -= Z @ np.linalg.solve(np.eye(m) + K @ Z[nodes], K @ y[nodes])
+        return y
+
+    def _band_nodes(self, band):
+        # sorted free indices of the nodes of the band elements
+        idx = self._free_index[self._conn[band]]
+        return np.unique(idx[idx >= 0])
+
+    def _latent_enthalpy(self, T):
+        f = liquid_fraction(T[self._conn] @ self._N.T,
+                            self._melt_temp, self._half_width)
+        H_e = np.einsum("eq,eqi->ei", f, self._latent_weights)
+        return np.bincount(self._conn.ravel(), weights=H_e.ravel(),
+                           minlength=self._mesh.num_nodes)
+
+    def _band_jacobians(self, T):
+        T_q = T[self._conn] @ self._N.T
+        x = np.abs(T_q - self._melt_temp) / self._half_width
+        band = np.flatnonzero(np.any(x < 1.0, axis=1) & self._latent)
+        g = phase_change_density(T_q[band], self._melt_temp[band],
+                                 self._half_width[band])
+        K = np.einsum("eq,eqi,qj->eij", g, self._latent_weights[band],
+                      self._N)
+        return band, K
+
+    def _stamp_free(self, band, mats):
+        idx = self._free_index[self._conn[band]]
+        k = idx.shape[1]
+        rows = np.repeat(idx, k, axis=1).ravel()
+        cols = np.tile(idx, (1, k)).ravel()
+        keep = (rows >= 0) & (cols >= 0)
+        n = len(self._free)
+        return sparse.coo_matrix(
+            (mats.ravel()[keep], (rows[keep], cols[keep])), shape=(n, n),
+        ).tocsc()
@@ -0,0 +1,244 @@
+import numpy as np
+import numpy.typing as npt
+
+from .interpolation import (
+    shape,
+)
+from .mesh import (
+    Mesh,
+)
+
+# draw per-entity text labels up to this many entities
+MAX_LABELS = 100
+
+
+def minmax_decimate(
+    x: npt.ArrayLike,
+    y: npt.ArrayLike,
+    num_buckets: int,
+) -> npt.NDArray[np.integer]:
+    """Select points that preserve the envelope of a line plot.
+
+    The x range is split into equal buckets, e.g. one per pixel
+    column, and the first and last points and the minimum and
+    maximum of each bucket are kept, so the rendered line
+    looks the same as the full data at that resolution.
+
+    Inputs
+    ------
+    x : array_like, shape=(n,)
+        The positions, in non-decreasing order.
+    y : array_like, shape=(n,)
+        The values.
+    num_buckets : int
+        The number of buckets.
+
+    Returns
+    -------
+    numpy.ndarray of int
+        The sorted indices of the kept points,
+        at most 4 * num_buckets of them.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= 4 * num_buckets:
+        return np.arange(n)
+    span = x[-1] - x[0]
+    if span > 0.0:
+        bucket = np.minimum(
+            ((x - x[0]) * (num_buckets / span)).astype(int), num_buckets - 1)
+    else:
+        bucket = np.arange(n) * num_buckets // n
+    starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+    counts = np.diff(starts, append=n)
+    # first occurrence of each bucket minimum and maximum
+    keep = [starts, starts + counts - 1]
+    for reduce in (np.minimum, np.maximum):
+        extreme = np.repeat(reduce.reduceat(y, starts), counts)
+        hits = np.flatnonzero(y == extreme)
+        _, first = np.unique(bucket[hits], return_index=True)
+        keep.append(hits[first])
+    return np.unique(np.concatenate(keep))
+
+
+def lttb_decimate(
+    x: npt.ArrayLike,
+    y: npt.ArrayLike,
+    num_points: int,
+) -> npt.NDArray[np.integer]:
+    """Select points by largest-triangle-three-buckets (LTTB).
+
+    The points between the first and last are split into
+    num_points - 2 buckets, and from each bucket the point
+    forming the largest triangle with the previously selected
+    point and the mean of the next bucket is kept.
+
+    Inputs
+    ------
+    x : array_like, shape=(n,)
+        The positions, in non-decreasing order.
+    y : array_like, shape=(n,)
+        The values.
+    num_points : int
+        The number of points to keep, >= 3.
+
+    Returns
+    -------
+    numpy.ndarray of int, shape=(min(n, num_points),)
+        The sorted indices of the kept points.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= num_points or num_points < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, num_points - 1).astype(int)
+    keep = np.empty(num_points, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+    for k in range(num_points - 2):
+        lo, hi = edges[k], edges[k + 1]
+        if k + 2 < len(edges):
+            nxt = slice(edges[k + 1], edges[k + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        ax, ay = x[keep[k]], y[keep[k]]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay)
+                      - (ax - x[lo:hi]) * (cy - ay))
+        keep[k + 1] = lo + int(np.argmax(area))
+    return keep
+
+
+def decimate(
+    x: npt.ArrayLike,
+    y: npt.ArrayLike,
+    max_points: int,
+    method: str = "minmax",
+) -> npt.NDArray[np.integer]:
+    """Select at most max_points points of a line for plotting.
+
+    Inputs
+    ------
+    x : array_like, shape=(n,)
+        The positions, in non-decreasing order.
+    y : array_like, shape=(n,)
+        The values.
+    max_points : int
+        The largest number of points kept.
+    method : str, optional, default="minmax"
+        "minmax" (see minmax_decimate) or "lttb" (see lttb_decimate).
+
+    Returns
+    -------
+    numpy.ndarray of int
+        The sorted indices of the kept points.
+
+    Raises
+    ------
+    ValueError
+        If method is not valid.
+    """
+    if method == "minmax":
+        return minmax_decimate(x, y, max(max_points // 4, 1))
+    if method == "lttb":
+        return lttb_decimate(x, y, max_points)
+    raise ValueError(f"method {method} is not valid")
+
+
+def plot_field(
+    ax,
+    x: npt.ArrayLike,
+    values: npt.ArrayLike,
+    *args,
+    max_points: int = None,
+    method: str = "minmax",
+    **kwargs,
+):
+    """Plot a nodal field along the mesh with decimation.
+
+    Inputs
+    ------
+    ax : matplotlib.axes.Axes
+        The axes to draw on.
+    x : array_like, shape=(n,)
+        The node positions, in non-decreasing order.
+    values : array_like, shape=(n,)
+        The field values, e.g. temperatures.
+    *args, **kwargs
+        Passed on to ax.plot, e.g. a format string or label.
+    max_points : int, optional
+        The largest number of points drawn.
+        Default is 4 per pixel column of the axes.
+    method : str, optional, default="minmax"
+        The decimation method, see decimate.
+
+    Returns
+    -------
+    list of matplotlib.lines.Line2D
+    """
+    if max_points is None:
+        max_points = 4 * _pixel_width(ax)
+    x = np.asarray(x)
+    values = np.asarray(values)
+    keep = decimate(x, values, max_points, method)
+    return ax.plot(x[keep], values[keep], *args, **kwargs)
+
+
+def plot_mesh(
+    ax,
+    mesh: Mesh,
+    max_points: int = None,
+    max_labels: int = MAX_LABELS,
+):
+    """Plot the nodes and integration points of a mesh.
+
+    Markers are thinned to at most one per bucket of
+    the x range, one bucket per pixel column by default,
+    and index labels are only drawn for meshes with
+    at most max_labels nodes.
+
+    Inputs
+    ------
+    ax : matplotlib.axes.Axes
+        The axes to draw on.
+    mesh : Mesh
+        The finite element mesh.
+    max_points : int, optional
+        The largest number of markers of each kind.
+        Default is the pixel width of the axes.
+    max_labels : int, optional, default=MAX_LABELS
+        The largest number of nodes for which labels are drawn.
+    """
+    if max_points is None:
+        max_points = _pixel_width(ax)
+    conn = mesh.connectivity
+    s = [ip.local_coord for ip in mesh.elements[0].int_pts]
+    x_nodes = mesh.coords
+    x_ips = mesh.coords[conn] @ shape(s, conn.shape[1] - 1).T
+    for x, style, label in ((x_nodes, "or", "nodes"),
+                            (x_ips, "xg", "int_pts")):
+        x = np.sort(x, axis=None)
+        keep = _thin(x, max_points)
+        ax.plot(x[keep], np.zeros(len(keep)), style, label=label)
+    if mesh.num_nodes <= max_labels:
+        for k, x in enumerate(x_nodes):
+            ax.text(x, -0.02, f"{k}", color="r")
+        for k, x in enumerate(x_ips[:, 0]):
+            ax.text(x, 0.02, f"{k}", color="g")
+
+
+def _thin(x, max_points):
+    # one point per bucket of the x range
+    if len(x) <= max_points:
+        return np.arange(len(x))
+    span = x[-1] - x[0]
+    if span == 0.0:
+        return np.arange(1)
+    bucket = ((x - x[0]) * ((max_points - 1) / span)).astype(int)
+    return np.flatnonzero(np.diff(bucket, prepend=-1))
+
+
+def _pixel_width(ax):
+    return max(int(ax.get_window_extent().width), 1)
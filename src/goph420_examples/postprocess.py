@@ -0,0 +1,107 @@
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .interpolation import (
+    shape_deriv,
+    reference_matrices,
+)
+from .mesh import (
+    Mesh,
+)
+
+
+class HeatFlux(NamedTuple):
+    """Heat flux results for a nodal temperature field.
+
+    Attributes
+    ----------
+    gradients : numpy.ndarray, shape=(num_elements, num_int_pts)
+        The temperature gradient dT/dx at each integration point.
+    conductive_flux : numpy.ndarray, shape=(num_elements, num_int_pts)
+        The conductive heat flux -thrm_cond * dT/dx
+        at each integration point, positive in the +x direction.
+    convective_loss : numpy.ndarray, shape=(num_elements,)
+        The heat lost to the ambient fluid through each element,
+        the integral of heat_trans_coef * perimeter * (T - temp_inf).
+    nodal_flux : numpy.ndarray, shape=(num_nodes,)
+        The conductive heat flux recovered at the nodes.
+    """
+    gradients: npt.NDArray[np.floating]
+    conductive_flux: npt.NDArray[np.floating]
+    convective_loss: npt.NDArray[np.floating]
+    nodal_flux: npt.NDArray[np.floating]
+
+
+def temperature_gradients(
+    mesh: Mesh,
+    temps: npt.ArrayLike,
+) -> npt.NDArray[np.floating]:
+    """Compute the temperature gradient at all integration points.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+    temps : array_like, shape=(num_nodes,)
+        The nodal temperatures, ordered by global index.
+
+    Returns
+    -------
+    numpy.ndarray, shape=(num_elements, num_int_pts)
+    """
+    temps = np.asarray(temps, dtype=float)
+    conn = mesh.connectivity
+    # all elements share the same integration rule
+    s = [ip.local_coord for ip in mesh.elements[0].int_pts]
+    dN = shape_deriv(s, conn.shape[1] - 1)
+    return (temps[conn] @ dN.T) / mesh.jacobians[:, None]
+
+
+def heat_flux(mesh: Mesh, temps: npt.ArrayLike) -> HeatFlux:
+    """Compute conductive and convective heat flux
+    for all elements in one pass.
+
+    The nodal flux is recovered by lumped L2 projection,
+    i.e. the length-weighted average of the integration point
+    fluxes of the elements around each node.
+
+    Inputs
+    ------
+    mesh : Mesh
+        The finite element mesh.
+    temps : array_like, shape=(num_nodes,)
+        The nodal temperatures, ordered by global index.
+
+    Returns
+    -------
+    HeatFlux
+    """
+    temps = np.asarray(temps, dtype=float)
+    conn = mesh.connectivity
+    jac = mesh.jacobians
+    _, _, load = reference_matrices(conn.shape[1] - 1)
+
+    gradients = temperature_gradients(mesh, temps)
+    conductive_flux = -mesh.int_pt_values("thrm_cond") * gradients
+
+    # element properties are taken from the first integration point,
+    # consistent with the element matrices
+    h = mesh.int_pt_values("heat_trans_coef")[:, 0]
+    P = mesh.int_pt_values("perimeter")[:, 0]
+    T_inf = mesh.int_pt_values("temp_inf")[:, 0]
+    convective_loss = h * P * jac * (temps[conn] @ load - T_inf)
+
+    weights = np.outer(jac, load)
+    q_e = conductive_flux.mean(axis=1)[:, None] * weights
+    nodal_flux = (
+        np.bincount(conn.ravel(), q_e.ravel(), mesh.num_nodes)
+        / np.bincount(conn.ravel(), weights.ravel(), mesh.num_nodes)
+    )
+    return HeatFlux(
+        gradients=gradients,
+        conductive_flux=conductive_flux,
+        convective_loss=convective_loss,
+        nodal_flux=nodal_flux,
+    )
@@ -0,0 +1,401 @@
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+from scipy.linalg import lu_factor, lu_solve
+
+from .assembly import (
+    apply_dirichlet,
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+    assemble_source_vector,
+    assemble_storage_matrix,
+    assemble_unit_flux_vector,
+)
+from .forcing import (
+    TimeSeries,
+)
+from .mesh import (
+    Mesh,
+)
+from .transient import (
+    EnsembleIntegrator,
+)
+
+
+class ReducedRun(NamedTuple):
+    """The result of a transient run of a ReducedModel.
+
+    Attributes
+    ----------
+    temps : numpy.ndarray, shape=(num_nodes,)
+        The nodal temperatures after the last step.
+    coefs : numpy.ndarray, shape=(num_steps + 1, rank)
+        The reduced coordinates at every step,
+        or None if the run fell back to a full solve.
+    error_indicator : float
+        The largest relative residual of the full model equations
+        over the reduced trajectory, including the error
+        of projecting the initial temperatures onto the basis.
+    full_solve : bool
+        True if the indicator exceeded the tolerance
+        and temps are from a full solve.
+    """
+    temps: npt.NDArray[np.floating]
+    coefs: npt.NDArray[np.floating]
+    error_indicator: float
+    full_solve: bool
+
+
+def collect_snapshots(
+    integrator,
+    num_steps: int,
+    every: int = 1,
+) -> npt.NDArray[np.floating]:
+    """Advance a transient integrator and record its states.
+
+    Inputs
+    ------
+    integrator : ExplicitIntegrator or EnsembleIntegrator
+        The integrator to advance.
+    num_steps : int
+        The number of time steps to take.
+    every : int, optional, default=1
+        The number of time steps between snapshots.
+
+    Returns
+    -------
+    numpy.ndarray, shape=(num_nodes, m)
+        The initial state and every recorded state as columns,
+        with all scenarios of an ensemble side by side.
+    """
+    snapshots = [np.array(integrator.temps, dtype=float)]
+    for _ in range(num_steps // every):
+        snapshots.append(np.array(integrator.step(every), dtype=float))
+    return np.column_stack(snapshots)
+
+
+def pod_basis(
+    snapshots: npt.ArrayLike,
+    tol: float = 1.0e-8,
+    max_rank: int = None,
+):
+    """Compute a proper orthogonal decomposition (POD) basis
+    of a snapshot matrix.
+
+    Inputs
+    ------
+    snapshots : array_like, shape=(n, m)
+        The snapshots as columns.
+    tol : float, optional, default=1.0e-8
+        The largest fraction of the snapshot energy,
+        the sum of squared singular values, left out of the basis.
+    max_rank : int, optional
+        The largest number of basis vectors.
+
+    Returns
+    -------
+    basis : numpy.ndarray, shape=(n, r)
+        The orthonormal POD modes.
+    singular_values : numpy.ndarray, shape=(min(n, m),)
+        All singular values of the snapshot matrix.
+
+    Raises
+    ------
+    ValueError
+        If the snapshots are all zero.
+    """
+    U, S, _ = np.linalg.svd(np.asarray(snapshots, dtype=float),
+                            full_matrices=False)
+    energy = np.cumsum(S ** 2)
+    if energy[-1] == 0.0:
+        raise ValueError("snapshots must not all be zero")
+    rank = int(np.searchsorted(energy / energy[-1], 1.0 - tol)) + 1
+    rank = min(rank, len(S))
+    if max_rank is not None:
+        rank = min(rank, max_rank)
+    return U[:, :rank], S
+
+
+class ReducedModel:
+    """Galerkin reduced-order model of C dT/dt + H T = Q
+    on a POD basis of transient snapshots.
+
+    The theta-method system of the free nodes is projected
+    onto the basis once, so an online step costs O(r^2)
+    with an LU factorization of size r computed up front,
+    independent of the mesh size.
+
+    Each step also evaluates the residual of the full model
+    equations for the reduced solution, from Gram matrices
+    of the projected operators, again in O(r^2).
+    If the largest relative residual exceeds max_error,
+    the inputs are out of the range of the snapshots
+    and run falls back to a full solve.
+
+    Attributes
+    ----------
+    mesh
+    rank
+    basis
+    singular_values
+    dt
+    theta
+    max_error
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    snapshots : array_like, shape=(num_nodes, m)
+        Nodal temperatures from full solves, e.g. from
+        collect_snapshots.
+    dt : float
+        The time step.
+    fixed : array_like of int, optional
+        The global indices of nodes with prescribed temperature.
+    theta : float, optional, default=1.0
+        The implicitness of the time stepping.
+    tol : float, optional, default=1.0e-8
+        The POD energy tolerance, see pod_basis.
+    max_rank : int, optional
+        The largest number of basis vectors.
+    max_error : float, optional, default=1.0e-3
+        The largest error indicator accepted from the reduced model.
+
+    Raises
+    ------
+    ValueError
+        If snapshots does not have one row per node.
+        If dt <= 0.
+        If theta is not in [0.5, 1].
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        snapshots: npt.ArrayLike,
+        dt: float,
+        fixed: npt.ArrayLike = (),
+        theta: float = 1.0,
+        tol: float = 1.0e-8,
+        max_rank: int = None,
+        max_error: float = 1.0e-3,
+    ):
+        snapshots = np.asarray(snapshots, dtype=float)
+        if snapshots.ndim != 2 or snapshots.shape[0] != mesh.num_nodes:
+            raise ValueError(
+                f"snapshots has shape {snapshots.shape}, "
+                f"should be ({mesh.num_nodes}, m)"
+            )
+        dt = float(dt)
+        if dt <= 0.0:
+            raise ValueError(f"dt {dt} must be positive")
+        theta = float(theta)
+        if not 0.5 <= theta <= 1.0:
+            raise ValueError(f"theta {theta} must be in [0.5, 1]")
+
+        H = assemble_conduction_matrix(mesh)
+        C = assemble_storage_matrix(mesh)
+        A = (C + (theta * dt) * H).tocsr()
+        B = (C - ((1.0 - theta) * dt) * H).tocsr()
+        fixed = np.asarray(fixed, dtype=int)
+        A_ff, _, free = apply_dirichlet(
+            A, np.zeros(mesh.num_nodes), fixed, np.zeros(len(fixed)))
+        B_ff = B[free][:, free]
+        A_fc = A[free][:, fixed].toarray()
+        B_fc = B[free][:, fixed].toarray()
+        # load vectors for the mesh ambient temperature,
+        # a unit ambient temperature and a unit source
+        loads = np.column_stack([
+            assemble_flux_vector(mesh),
+            assemble_unit_flux_vector(mesh),
+            assemble_source_vector(mesh),
+        ])[free]
+
+        basis, singular_values = pod_basis(snapshots[free], tol, max_rank)
+        A_phi = A_ff @ basis
+        B_phi = B_ff @ basis
+        self._lu = lu_factor(basis.T @ A_phi)
+        self._B_r = basis.T @ B_phi
+        self._A_fc_r = basis.T @ A_fc
+        self._B_fc_r = basis.T @ B_fc
+        self._loads_r = basis.T @ loads
+
+        # the full residual A_ff T_new + A_fc g_new - B_ff T_old
+        # - B_fc g_old - dt * Q is R @ c for the coefficients
+        # c = [a_new, a_old, g_new, g_old, load weights]
+        R = np.column_stack([A_phi, -B_phi, A_fc, -B_fc, -dt * loads])
+        self._gram = R.T @ R
+
+        self._mesh = mesh
+        self._free = free
+        self._fixed = fixed
+        self._basis = basis
+        self._singular_values = singular_values
+        self._dt = dt
+        self._theta = theta
+        self._max_error = float(max_error)
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def rank(self) -> int:
+        return self._basis.shape[1]
+
+    @property
+    def basis(self) -> npt.NDArray[np.floating]:
+        """The POD modes of the free nodes.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_free, rank)
+        """
+        return self._basis
+
+    @property
+    def singular_values(self) -> npt.NDArray[np.floating]:
+        return self._singular_values
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @property
+    def theta(self) -> float:
+        return self._theta
+
+    @property
+    def max_error(self) -> float:
+        return self._max_error
+
+    def run(
+        self,
+        temps: npt.ArrayLike,
+        num_steps: int,
+        fixed_temps: npt.ArrayLike = (),
+        temp_inf: TimeSeries = None,
+        source: TimeSeries = None,
+        time: float = 0.0,
+        fallback: bool = True,
+    ) -> ReducedRun:
+        """Run the reduced model from an initial state.
+
+        Parameters
+        ----------
+        temps : array_like, shape=(num_nodes,)
+            The initial nodal temperatures.
+        num_steps : int
+            The number of time steps to take.
+        fixed_temps : array_like or TimeSeries, optional
+            The prescribed temperatures, or their history.
+        temp_inf : TimeSeries, optional
+            The history of a uniform ambient temperature,
+            which replaces the temp_inf of the integration points.
+        source : TimeSeries, optional
+            The history of a uniform volumetric heat source.
+        time : float, optional, default=0.0
+            The initial time.
+        fallback : bool, optional, default=True
+            If True, run a full solve when the error indicator
+            exceeds max_error.
+
+        Returns
+        -------
+        ReducedRun
+
+        Raises
+        ------
+        ValueError
+            If fixed_temps does not have one value per fixed node.
+        """
+        temps = np.asarray(temps, dtype=float)
+        dt, theta = self._dt, self._theta
+
+        def g(t):
+            values = (fixed_temps(t) if isinstance(fixed_temps, TimeSeries)
+                      else np.asarray(fixed_temps, dtype=float))
+            if values.shape != self._fixed.shape:
+                raise ValueError(
+                    f"got {np.size(values)} fixed temperatures "
+                    f"for {len(self._fixed)} fixed nodes"
+                )
+            return values
+
+        def load_weights(t):
+            return np.array([
+                1.0 if temp_inf is None else 0.0,
+                0.0 if temp_inf is None else temp_inf(t),
+                0.0 if source is None else source(t),
+            ])
+
+        # error of the initial state outside the span of the basis
+        T0 = temps[self._free]
+        a = self._basis.T @ T0
+        T0_norm = np.linalg.norm(T0)
+        indicator = (np.linalg.norm(T0 - self._basis @ a) / T0_norm
+                     if T0_norm > 0.0 else 0.0)
+
+        r = self.rank
+        coefs = np.empty((num_steps + 1, r))
+        coefs[0] = a
+        g_old = g(time)
+        w_old = load_weights(time)
+        for n in range(num_steps):
+            t_new = time + (n + 1) * dt
+            g_new = g(t_new)
+            w_new = load_weights(t_new)
+            w = (1.0 - theta) * w_old + theta * w_new
+            rhs = (self._B_r @ a + self._B_fc_r @ g_old
+                   - self._A_fc_r @ g_new + dt * (self._loads_r @ w))
+            a_new = lu_solve(self._lu, rhs)
+            c = np.concatenate([a_new, a, g_new, g_old, w])
+            res = c @ self._gram @ c
+            ref = c[r:] @ self._gram[r:, r:] @ c[r:]
+            if ref > 0.0:
+                indicator = max(indicator, np.sqrt(max(res, 0.0) / ref))
+            a, g_old, w_old = a_new, g_new, w_new
+            coefs[n + 1] = a
+
+        if fallback and indicator > self._max_error:
+            full = EnsembleIntegrator(
+                self._mesh, temps[:, None], dt, self._fixed, fixed_temps,
+                theta=theta, time=time, temp_inf=temp_inf, source=source,
+            )
+            return ReducedRun(
+                temps=full.step(num_steps)[:, 0],
+                coefs=None,
+                error_indicator=float(indicator),
+                full_solve=True,
+            )
+        return ReducedRun(
+            temps=self.reconstruct(a, g_old),
+            coefs=coefs,
+            error_indicator=float(indicator),
+            full_solve=False,
+        )
+
+    def reconstruct(
+        self,
+        coefs: npt.ArrayLike,
+        fixed_temps: npt.ArrayLike = (),
+    ) -> npt.NDArray[np.floating]:
+        """Expand reduced coordinates to nodal temperatures.
+
+        Parameters
+        ----------
+        coefs : array_like, shape=(rank,)
+            The reduced coordinates.
+        fixed_temps : array_like, optional
+            The prescribed temperatures.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+        """
+        temps = np.empty(self._mesh.num_nodes)
+        temps[self._free] = self._basis @ np.asarray(coefs, dtype=float)
+        temps[self._fixed] = fixed_temps
+        return temps
@@ -0,0 +1,375 @@
+import argparse
+import asyncio
+import collections
+import json
+import time
+
+import numpy as np
+
+from .mesh import (
+    Mesh,
+)
+from .solvers import (
+    SteadyStateSolver,
+)
+
+# keys of the mesh description in a solve request
+_MESH_KEYS = (
+    "length",
+    "num_nodes",
+    "thrm_cond",
+    "heat_trans_coef",
+    "perimeter",
+    "area",
+    "temp_inf",
+)
+
+
+class SolveMetrics:
+    """Latency and throughput statistics of a SolveServer.
+
+    Parameters
+    ----------
+    window : int, optional, default=1000
+        The number of most recent latencies to keep.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._start = time.perf_counter()
+        self._latencies = collections.deque(maxlen=window)
+        self.num_requests = 0
+        self.num_errors = 0
+        self.num_batches = 0
+        self.num_solver_builds = 0
+
+    def record_batch(self, latencies) -> None:
+        self.num_batches += 1
+        self.num_requests += len(latencies)
+        self._latencies.extend(latencies)
+
+    def as_dict(self) -> dict:
+        """Summarize the statistics.
+
+        Returns
+        -------
+        dict
+            Counts, mean batch size, throughput in requests per second
+            since the server started, and latency percentiles in
+            seconds over the most recent requests.
+        """
+        elapsed = time.perf_counter() - self._start
+        latencies = np.array(self._latencies)
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        else:
+            p50 = p95 = p99 = 0.0
+        return {
+            "num_requests": self.num_requests,
+            "num_errors": self.num_errors,
+            "num_batches": self.num_batches,
+            "num_solver_builds": self.num_solver_builds,
+            "mean_batch_size": (
+                self.num_requests / self.num_batches
+                if self.num_batches else 0.0
+            ),
+            "throughput": self.num_requests / elapsed,
+            "latency_p50": float(p50),
+            "latency_p95": float(p95),
+            "latency_p99": float(p99),
+        }
+
+
+class SolveServer:
+    """Local asyncio service for steady-state pipe problems.
+
+    Clients send newline-delimited JSON requests like
+    {"id": 1, "mesh": {...}, "T_0": 2.0, "T_L": 18.0},
+    where mesh has the keys length, num_nodes, thrm_cond,
+    heat_trans_coef, perimeter, area and temp_inf,
+    and receive {"id": 1, "temps": [...]} or {"id": 1, "error": "..."}.
+    A request {"type": "metrics"} returns the server metrics.
+
+    Factorized solvers are kept warm in an LRU cache keyed on the
+    mesh description. Requests that arrive within batch_window
+    of each other and share a mesh are solved together
+    as one multi-rhs solve.
+
+    Attributes
+    ----------
+    metrics
+
+    Parameters
+    ----------
+    batch_window : float, optional, default=0.002
+        The time in seconds to wait for more requests to batch.
+    max_batch : int, optional, default=256
+        The maximum number of requests in one batch.
+    max_cached : int, optional, default=16
+        The maximum number of factorized solvers kept.
+    """
+
+    def __init__(
+        self,
+        batch_window: float = 0.002,
+        max_batch: int = 256,
+        max_cached: int = 16,
+    ):
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._max_cached = max_cached
+        self._solvers = collections.OrderedDict()
+        self._metrics = SolveMetrics()
+        self._queue = None
+        self._batch = []
+        self._batcher = None
+        self._servers = []
+
+    @property
+    def metrics(self) -> SolveMetrics:
+        return self._metrics
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0):
+        """Listen on a TCP port.
+
+        Parameters
+        ----------
+        host : str, optional, default="127.0.0.1"
+        port : int, optional, default=0
+            Use 0 to pick a free port.
+
+        Returns
+        -------
+        int
+            The port number.
+        """
+        self._start_batcher()
+        server = await asyncio.start_server(self._handle, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path: str) -> None:
+        """Listen on a Unix domain socket.
+
+        Parameters
+        ----------
+        path : str
+            The socket path.
+        """
+        self._start_batcher()
+        server = await asyncio.start_unix_server(self._handle, path)
+        self._servers.append(server)
+
+    async def close(self) -> None:
+        """Stop listening and cancel the batching task.
+
+        Requests that are queued, or batched but not yet solved,
+        fail with ConnectionError.
+        """
+        for server in self._servers:
+            server.close()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+            pending = self._batch
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._batch = []
+            for _, _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(ConnectionError("server closed"))
+        # connections waiting on a failed request can now finish
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+
+    async def submit(self, request: dict) -> np.ndarray:
+        """Solve one request, batched with other pending requests.
+
+        Parameters
+        ----------
+        request : dict
+            The request, as described in the class docstring.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+            The nodal temperatures.
+
+        Raises
+        ------
+        KeyError
+            If a required key is missing.
+        ValueError
+            If a value is invalid.
+        """
+        mesh_spec = request["mesh"]
+        key = tuple(float(mesh_spec[k]) for k in _MESH_KEYS)
+        if key[1] != int(key[1]) or key[1] < 2:
+            raise ValueError(f"num_nodes {key[1]} must be an int >= 2")
+        g = (float(request["T_0"]), float(request["T_L"]))
+        self._start_batcher()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, g, future, time.perf_counter()))
+        return await future
+
+    def _start_batcher(self):
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.get_running_loop().create_task(
+                self._run_batches()
+            )
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self._respond(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _respond(self, line):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise TypeError("request must be a JSON object")
+            request_id = request.get("id")
+            if request.get("type") == "metrics":
+                return {"id": request_id, "metrics": self._metrics.as_dict()}
+            temps = await self.submit(request)
+            return {"id": request_id, "temps": temps.tolist()}
+        except Exception as err:
+            # report bad requests and failed solves to the client
+            self._metrics.num_errors += 1
+            return {"id": request_id, "error": f"{type(err).__name__}: {err}"}
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # kept on self so that close can fail unsolved requests
+            self._batch = batch = [await self._queue.get()]
+            deadline = loop.time() + self._batch_window
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0.0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            groups = collections.defaultdict(list)
+            for item in batch:
+                groups[item[0]].append(item)
+            for key, items in groups.items():
+                g = np.array([item[1] for item in items]).T
+                try:
+                    T = await loop.run_in_executor(None, self._solve, key, g)
+                except Exception as err:
+                    for _, _, future, _ in items:
+                        if not future.done():
+                            future.set_exception(err)
+                    continue
+                now = time.perf_counter()
+                for j, (_, _, future, _) in enumerate(items):
+                    if not future.done():
+                        future.set_result(T[:, j])
+                self._metrics.record_batch(
+                    [now - item[3] for item in items]
+                )
+
+    def _solve(self, key, g):
+        solver = self._solvers.get(key)
+        if solver is None:
+            solver = _build_solver(*key)
+            self._metrics.num_solver_builds += 1
+            self._solvers[key] = solver
+            if len(self._solvers) > self._max_cached:
+                self._solvers.popitem(last=False)
+        else:
+            self._solvers.move_to_end(key)
+        return solver.solve(g)
+
+
+async def query(request: dict, host: str = "127.0.0.1", port: int = None,
+                path: str = None) -> dict:
+    """Send one request to a SolveServer and wait for the response.
+
+    Parameters
+    ----------
+    request : dict
+        The request.
+    host : str, optional, default="127.0.0.1"
+    port : int, optional
+        The TCP port, if the server listens on TCP.
+    path : str, optional
+        The socket path, if the server listens on a Unix socket.
+
+    Returns
+    -------
+    dict
+        The response.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+def _build_solver(length, num_nodes, thrm_cond, heat_trans_coef,
+                  perimeter, area, temp_inf):
+    num_nodes = int(num_nodes)
+    mesh = Mesh.from_coords(np.linspace(0.0, length, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = thrm_cond
+            ip.heat_trans_coef = heat_trans_coef
+            ip.perimeter = perimeter
+            ip.area = area
+            ip.temp_inf = temp_inf
+    return SteadyStateSolver(mesh, [0, num_nodes - 1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve steady-state pipe heat flow solves."
+    )
+    parser.add_argument("--unix", help="listen on this Unix socket path")
+    parser.add_argument("--port", type=int, default=8420,
+                        help="listen on this localhost TCP port")
+    parser.add_argument("--batch-window", type=float, default=0.002)
+    args = parser.parse_args()
+
+    async def serve():
+        server = SolveServer(batch_window=args.batch_window)
+        if args.unix:
+            await server.start_unix(args.unix)
+            print(f"listening on {args.unix}")
+        else:
+            port = await server.start_tcp(port=args.port)
+            print(f"listening on 127.0.0.1:{port}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1017 @@
+import time
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+from scipy.linalg import cho_factor, cho_solve
+from scipy.sparse.linalg import splu, spsolve_triangular
+
+from .assembly import (
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+    apply_dirichlet,
+    stamp_element_matrices,
+)
+from .mesh import (
+    Mesh,
+)
+
+
+# the lowest default rank at which IncrementalSolver refactors
+_MIN_MAX_RANK = 32
+
+
+class CGStats(NamedTuple):
+    """Convergence statistics of a conjugate gradient solve.
+
+    Attributes
+    ----------
+    converged : bool
+        Whether the relative residual reached the tolerance.
+    iterations : int
+        The number of iterations performed.
+    residual_norms : numpy.ndarray
+        The residual 2-norm at the start and after each iteration.
+    warm_started : bool
+        Whether a nonzero initial guess was used.
+    """
+    converged: bool
+    iterations: int
+    residual_norms: npt.NDArray[np.floating]
+    warm_started: bool
+
+    @property
+    def relative_residual(self) -> float:
+        if self.residual_norms[0] == 0.0:
+            return 0.0
+        return self.residual_norms[-1] / self.residual_norms[0]
+
+
+class JacobiPreconditioner:
+    """Diagonal (Jacobi) preconditioner.
+
+    Parameters
+    ----------
+    A : scipy.sparse matrix or operator with a diagonal() method
+        The system matrix.
+
+    Raises
+    ------
+    ValueError
+        If any diagonal entry of A is not positive.
+    """
+
+    def __init__(self, A):
+        diag = np.asarray(A.diagonal(), dtype=float)
+        if np.any(diag <= 0.0):
+            raise ValueError("diagonal of A must be positive")
+        self._inv_diag = 1.0 / diag
+
+    def apply(self, r: npt.NDArray[np.floating]) -> npt.NDArray:
+        return self._inv_diag * r
+
+
+class IncompleteCholeskyPreconditioner:
+    """Zero fill-in incomplete Cholesky, IC(0), preconditioner.
+
+    The factor L has the sparsity pattern of the lower triangle of A.
+    For a single pipe the conduction matrix is tridiagonal,
+    so IC(0) is the exact Cholesky factor.
+
+    Parameters
+    ----------
+    A : scipy.sparse matrix
+        The symmetric positive definite system matrix.
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If a non-positive pivot is encountered.
+    """
+
+    def __init__(self, A):
+        L = sparse.tril(A, format="csr").astype(float)
+        L.sort_indices()
+        data, indices, indptr = L.data, L.indices, L.indptr
+        # map column index -> position in data, row by row
+        rows = [
+            dict(zip(indices[indptr[i]:indptr[i + 1]],
+                     range(indptr[i], indptr[i + 1])))
+            for i in range(L.shape[0])
+        ]
+        for i, row in enumerate(rows):
+            for k, pik in row.items():
+                row_k = rows[k]
+                s = data[pik]
+                for j, pij in row.items():
+                    if j >= k:
+                        break
+                    pkj = row_k.get(j)
+                    if pkj is not None:
+                        s -= data[pij] * data[pkj]
+                if k < i:
+                    data[pik] = s / data[row_k[k]]
+                elif s <= 0.0:
+                    raise np.linalg.LinAlgError(
+                        f"non-positive pivot {s} in row {i}"
+                    )
+                else:
+                    data[pik] = np.sqrt(s)
+        self._L = L
+        self._LT = L.T.tocsr()
+
+    def apply(self, r: npt.NDArray[np.floating]) -> npt.NDArray:
+        y = spsolve_triangular(self._L, r, lower=True)
+        return spsolve_triangular(self._LT, y, lower=False)
+
+
+class MultigridPreconditioner:
+    """Geometric multigrid V-cycle preconditioner
+    for meshes of consecutive elements along a single pipe.
+
+    Coarse levels keep every second node of the level above.
+    Prolongation is linear interpolation in x
+    and coarse operators are formed as P^T A P.
+    Damped Jacobi smoothing is used before and after
+    the coarse grid correction so the V-cycle is symmetric.
+
+    Parameters
+    ----------
+    A : scipy.sparse matrix
+        The symmetric positive definite system matrix.
+    coords : array_like, shape=(n,)
+        The position of each unknown, strictly increasing.
+    num_smooth : int, optional, default=2
+        The number of smoothing sweeps before and after
+        each coarse grid correction.
+    omega : float, optional, default=2/3
+        The Jacobi damping factor.
+    coarse_size : int, optional, default=32
+        Levels with at most this many unknowns are solved directly.
+
+    Raises
+    ------
+    ValueError
+        If coords does not match the size of A.
+        If coords is not strictly increasing.
+    """
+
+    def __init__(
+        self,
+        A,
+        coords: npt.ArrayLike,
+        num_smooth: int = 2,
+        omega: float = 2.0 / 3.0,
+        coarse_size: int = 32,
+    ):
+        coords = np.asarray(coords, dtype=float)
+        if coords.shape != (A.shape[0],):
+            raise ValueError(
+                f"coords has shape {coords.shape}, "
+                + f"should be ({A.shape[0]},)"
+            )
+        if np.any(np.diff(coords) <= 0.0):
+            raise ValueError("coords must be strictly increasing")
+        self._num_smooth = num_smooth
+        self._omega = omega
+
+        A = sparse.csr_matrix(A, dtype=float)
+        self._levels = []
+        while A.shape[0] > max(coarse_size, 2):
+            P = _linear_prolongation(coords)
+            self._levels.append((A, 1.0 / A.diagonal(), P))
+            A = (P.T @ A @ P).tocsr()
+            coords = coords[1::2]
+        self._coarse = cho_factor(A.toarray())
+
+    @property
+    def num_levels(self) -> int:
+        return len(self._levels) + 1
+
+    def apply(self, r: npt.NDArray[np.floating]) -> npt.NDArray:
+        return self._vcycle(0, r)
+
+    def _vcycle(self, level, r):
+        if level == len(self._levels):
+            return cho_solve(self._coarse, r)
+        A, inv_diag, P = self._levels[level]
+        w = self._omega * inv_diag
+        x = w * r
+        for _ in range(self._num_smooth - 1):
+            x += w * (r - A @ x)
+        x += P @ self._vcycle(level + 1, P.T @ (r - A @ x))
+        for _ in range(self._num_smooth):
+            x += w * (r - A @ x)
+        return x
+
+
+class ConjugateGradientSolver:
+    """Preconditioned conjugate gradient solver
+    for symmetric positive definite systems,
+    such as the conduction matrix after Dirichlet elimination.
+
+    Only matrix-vector products with A are required,
+    so memory use is dominated by A itself and a few vectors.
+
+    Attributes
+    ----------
+    A
+    preconditioner
+    stats
+    solution
+
+    Parameters
+    ----------
+    A : scipy.sparse matrix or LinearOperator
+        The system matrix.
+    preconditioner : str or object, optional, default="jacobi"
+        One of "jacobi", "ichol", "multigrid" or None,
+        or an object with an apply(r) method.
+    coords : array_like, optional
+        The position of each unknown,
+        required for the "multigrid" preconditioner.
+    tol : float, optional, default=1e-10
+        The relative residual tolerance.
+    max_iter : int, optional
+        The maximum number of iterations, default is 10 * n.
+    warm_start : bool, optional, default=True
+        Whether to start from the previous solution
+        when no initial guess is given.
+
+    Raises
+    ------
+    ValueError
+        If preconditioner is an unknown name.
+        If "multigrid" is requested without coords.
+    """
+
+    def __init__(
+        self,
+        A,
+        preconditioner="jacobi",
+        coords: npt.ArrayLike = None,
+        tol: float = 1.0e-10,
+        max_iter: int = None,
+        warm_start: bool = True,
+    ):
+        self._A = A
+        if preconditioner == "jacobi":
+            preconditioner = JacobiPreconditioner(A)
+        elif preconditioner == "ichol":
+            preconditioner = IncompleteCholeskyPreconditioner(A)
+        elif preconditioner == "multigrid":
+            if coords is None:
+                raise ValueError("multigrid preconditioner requires coords")
+            preconditioner = MultigridPreconditioner(A, coords)
+        elif isinstance(preconditioner, str):
+            raise ValueError(f"unknown preconditioner {preconditioner}")
+        self._preconditioner = preconditioner
+        self._tol = float(tol)
+        self._max_iter = 10 * A.shape[0] if max_iter is None else max_iter
+        self._warm_start = warm_start
+        self._solution = None
+        self._stats = None
+
+    @property
+    def A(self):
+        return self._A
+
+    @property
+    def preconditioner(self):
+        return self._preconditioner
+
+    @property
+    def stats(self) -> CGStats:
+        """The convergence statistics of the most recent solve.
+
+        Returns
+        -------
+        CGStats or None
+        """
+        return self._stats
+
+    @property
+    def solution(self) -> npt.NDArray[np.floating]:
+        """The solution of the most recent solve.
+
+        Returns
+        -------
+        numpy.ndarray or None
+        """
+        return self._solution
+
+    def solve(
+        self,
+        b: npt.ArrayLike,
+        x0: npt.ArrayLike = None,
+    ) -> npt.NDArray[np.floating]:
+        """Solve A x = b.
+
+        Parameters
+        ----------
+        b : array_like, shape=(n,)
+            The right-hand side.
+        x0 : array_like, shape=(n,), optional
+            The initial guess. If not provided and warm_start is set,
+            the previous solution is used, otherwise zero.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(n,)
+            The solution, also stored as the solution attribute.
+            Check stats.converged to see if the tolerance was met.
+        """
+        A = self._A
+        b = np.asarray(b, dtype=float)
+        if x0 is None and self._warm_start:
+            x0 = self._solution
+        warm_started = x0 is not None
+        x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+        M = self._preconditioner
+
+        r = b - A @ x if warm_started else b.copy()
+        b_norm = np.linalg.norm(b)
+        r_norm = np.linalg.norm(r)
+        norms = [r_norm]
+        target = self._tol * b_norm
+        z = r if M is None else M.apply(r)
+        p = z.copy()
+        rz = r @ z
+        it = 0
+        while r_norm > target and it < self._max_iter:
+            Ap = A @ p
+            alpha = rz / (p @ Ap)
+            x += alpha * p
+            r -= alpha * Ap
+            r_norm = np.linalg.norm(r)
+            norms.append(r_norm)
+            it += 1
+            z = r if M is None else M.apply(r)
+            rz_new = r @ z
+            p *= rz_new / rz
+            p += z
+            rz = rz_new
+
+        self._solution = x
+        self._stats = CGStats(
+            converged=bool(r_norm <= target),
+            iterations=it,
+            residual_norms=np.array(norms),
+            warm_started=warm_started,
+        )
+        return x
+
+
+class RefinementStats(NamedTuple):
+    """Convergence statistics of iterative refinement.
+
+    Attributes
+    ----------
+    converged : bool
+        Whether the relative residual reached the tolerance.
+    iterations : int
+        The number of refinement steps after the initial solve.
+    relative_residual : float
+        The final 2-norm of the residual relative to the rhs.
+    """
+    converged: bool
+    iterations: int
+    relative_residual: float
+
+
+class MixedPrecisionLU:
+    """Sparse LU factorization in single precision
+    with iterative refinement to double precision accuracy.
+
+    The factors take half the memory and bandwidth of a
+    double precision factorization. Each refinement step
+    computes the residual in double precision and solves
+    for a correction with the single precision factors,
+    which converges when cond(A) is well below 1 / eps(float32).
+
+    Attributes
+    ----------
+    shape
+    lu
+    stats
+
+    Parameters
+    ----------
+    A : scipy.sparse matrix
+        The square system matrix.
+    tol : float, optional, default=1e-12
+        The relative residual tolerance.
+    max_refinements : int, optional, default=10
+        The maximum number of refinement steps.
+    """
+
+    def __init__(self, A, tol: float = 1.0e-12, max_refinements: int = 10):
+        self._A = sparse.csr_matrix(A, dtype=np.float64)
+        self._lu = splu(sparse.csc_matrix(A, dtype=np.float32))
+        self._tol = tol
+        self._max_refinements = max_refinements
+        self._stats = None
+
+    @property
+    def shape(self) -> tuple:
+        return self._A.shape
+
+    @property
+    def lu(self):
+        """The single precision factorization.
+
+        Returns
+        -------
+        scipy.sparse.linalg.SuperLU
+        """
+        return self._lu
+
+    @property
+    def stats(self) -> RefinementStats:
+        """The statistics of the most recent solve.
+
+        Returns
+        -------
+        RefinementStats or None
+        """
+        return self._stats
+
+    def solve(self, b: npt.ArrayLike, trans: str = "N") -> npt.NDArray:
+        """Solve A x = b, or A^T x = b.
+
+        Parameters
+        ----------
+        b : array_like, shape=(n,) or (n, k)
+            The right-hand side(s).
+        trans : str, optional, default="N"
+            "N" to solve with A, "T" to solve with A^T.
+
+        Returns
+        -------
+        numpy.ndarray of float64, shape=(n,) or (n, k)
+        """
+        A = self._A if trans == "N" else self._A.T
+        b = np.asarray(b, dtype=np.float64)
+        b_norm = np.linalg.norm(b)
+        x = self._lu.solve(b.astype(np.float32), trans=trans)
+        x = x.astype(np.float64)
+        it = 0
+        while True:
+            r = b - A @ x
+            rel = np.linalg.norm(r) / b_norm if b_norm > 0.0 else 0.0
+            if rel <= self._tol or it == self._max_refinements:
+                break
+            x += self._lu.solve(r.astype(np.float32), trans=trans)
+            it += 1
+        self._stats = RefinementStats(
+            converged=bool(rel <= self._tol),
+            iterations=it,
+            relative_residual=float(rel),
+        )
+        return x
+
+
+class TriangularFactors:
+    """Solve with stored sparse LU factors P_r A P_c = L U,
+    e.g. factors of a SuperLU object saved to disk.
+
+    Attributes
+    ----------
+    shape
+    L
+    U
+    perm_r
+    perm_c
+
+    Parameters
+    ----------
+    L : scipy.sparse matrix, shape=(n, n)
+        The unit lower triangular factor.
+    U : scipy.sparse matrix, shape=(n, n)
+        The upper triangular factor.
+    perm_r : array_like of int, shape=(n,)
+        The row permutation, as in SuperLU.perm_r.
+    perm_c : array_like of int, shape=(n,)
+        The column permutation, as in SuperLU.perm_c.
+    """
+
+    def __init__(self, L, U, perm_r: npt.ArrayLike, perm_c: npt.ArrayLike):
+        self._L = sparse.csr_matrix(L)
+        self._U = sparse.csr_matrix(U)
+        self._perm_r = np.asarray(perm_r, dtype=int)
+        self._perm_c = np.asarray(perm_c, dtype=int)
+
+    @classmethod
+    def from_superlu(cls, lu):
+        """Copy the factors of a SuperLU factorization.
+
+        Parameters
+        ----------
+        lu : scipy.sparse.linalg.SuperLU
+
+        Returns
+        -------
+        TriangularFactors
+        """
+        return cls(lu.L, lu.U, lu.perm_r, lu.perm_c)
+
+    @property
+    def shape(self) -> tuple:
+        return self._L.shape
+
+    @property
+    def L(self) -> sparse.csr_matrix:
+        return self._L
+
+    @property
+    def U(self) -> sparse.csr_matrix:
+        return self._U
+
+    @property
+    def perm_r(self) -> npt.NDArray[np.integer]:
+        return self._perm_r
+
+    @property
+    def perm_c(self) -> npt.NDArray[np.integer]:
+        return self._perm_c
+
+    def solve(self, b: npt.ArrayLike, trans: str = "N") -> npt.NDArray:
+        """Solve A x = b, or A^T x = b.
+
+        Parameters
+        ----------
+        b : array_like, shape=(n,) or (n, k)
+            The right-hand side(s).
+        trans : str, optional, default="N"
+            "N" to solve with A, "T" to solve with A^T.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(n,) or (n, k)
+        """
+        b = np.asarray(b, dtype=self._U.dtype)
+        y = np.empty_like(b)
+        if trans == "N":
+            y[self._perm_r] = b
+            y = spsolve_triangular(self._L, y, lower=True,
+                                   unit_diagonal=True)
+            return spsolve_triangular(self._U, y, lower=False)[self._perm_c]
+        y[self._perm_c] = b
+        y = spsolve_triangular(self._U.T.tocsr(), y, lower=True)
+        y = spsolve_triangular(self._L.T.tocsr(), y, lower=False,
+                               unit_diagonal=True)
+        return y[self._perm_r]
+
+
+class SteadyStateSolver:
+    """Direct steady-state solver for H T = Q
+    with prescribed temperatures at fixed nodes.
+
+    The Dirichlet-reduced conduction matrix is factorized once
+    (sparse LU), so repeated solves with new fixed temperatures
+    or several sets of fixed temperatures at once
+    only cost triangular solves.
+    The system is assembled in the mesh dtype.
+
+    Attributes
+    ----------
+    mesh
+    fixed
+    free
+    factorization
+    coupling
+    flux
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    fixed : array_like of int
+        The global indices of nodes with prescribed temperature.
+    precision : str, optional, default="native"
+        "native" factorizes in the mesh dtype.
+        "mixed" factorizes in float32 and recovers float64 accuracy
+        by iterative refinement (see MixedPrecisionLU).
+
+    Raises
+    ------
+    ValueError
+        If fixed contains repeated indices.
+        If precision is not valid.
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        fixed: npt.ArrayLike,
+        precision: str = "native",
+    ):
+        if precision not in ("native", "mixed"):
+            raise ValueError(f"precision {precision} is not valid")
+        self._mesh = mesh
+        self._fixed = np.asarray(fixed, dtype=int)
+        self._precision = precision
+        self.refactor()
+
+    @classmethod
+    def from_system(
+        cls,
+        mesh: Mesh,
+        fixed: npt.ArrayLike,
+        factorization,
+        H_fc,
+        Q_f: npt.ArrayLike,
+    ):
+        """Create a solver from an already reduced and factorized
+        system, without assembly.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            The finite element mesh.
+        fixed : array_like of int
+            The global indices of nodes with prescribed temperature.
+        factorization : object
+            A factorization of H_ff with a solve(b, trans) method,
+            e.g. TriangularFactors.
+        H_fc : scipy.sparse matrix, shape=(num_free, len(fixed))
+            The coupling of the free nodes to the fixed nodes.
+        Q_f : array_like, shape=(num_free,)
+            The flux vector of the free nodes.
+
+        Returns
+        -------
+        SteadyStateSolver
+        """
+        self = cls.__new__(cls)
+        self._mesh = mesh
+        self._fixed = np.asarray(fixed, dtype=int)
+        self._precision = "native"
+        self._free = np.setdiff1d(np.arange(mesh.num_nodes), self._fixed)
+        self._lu = factorization
+        self._H_fc = sparse.csr_matrix(H_fc)
+        self._Q_f = np.asarray(Q_f)
+        return self
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def fixed(self) -> npt.NDArray[np.integer]:
+        return self._fixed
+
+    @property
+    def coupling(self) -> sparse.csr_matrix:
+        """The columns of the conduction matrix for the fixed nodes,
+        restricted to the free rows.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix, shape=(num_free, len(fixed))
+        """
+        return self._H_fc
+
+    @property
+    def flux(self) -> npt.NDArray[np.floating]:
+        """The flux vector of the free nodes.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_free,)
+        """
+        return self._Q_f
+
+    @property
+    def free(self) -> npt.NDArray[np.integer]:
+        return self._free
+
+    @property
+    def factorization(self):
+        """The sparse LU factorization of the reduced matrix.
+
+        Returns
+        -------
+        scipy.sparse.linalg.SuperLU or MixedPrecisionLU
+        """
+        return self._lu
+
+    def refactor(self) -> None:
+        """Assemble and factorize the system
+        from the current integration point properties."""
+        H = assemble_conduction_matrix(self._mesh)
+        Q = assemble_flux_vector(self._mesh)
+        H_ff, _, free = apply_dirichlet(
+            H, Q, self._fixed, np.zeros(len(self._fixed)))
+        self._H_fc = H[free][:, self._fixed]
+        self._Q_f = Q[free]
+        self._free = free
+        if self._precision == "mixed":
+            self._lu = MixedPrecisionLU(H_ff)
+        else:
+            self._lu = splu(H_ff.tocsc())
+
+    def solve(self, fixed_temps: npt.ArrayLike) -> npt.NDArray:
+        """Solve for the nodal temperatures.
+
+        Parameters
+        ----------
+        fixed_temps : array_like, shape=(len(fixed),) or (len(fixed), k)
+            The prescribed temperatures. Each column of a 2D array
+            is a separate set, solved together.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,) or (num_nodes, k)
+        """
+        g = np.asarray(fixed_temps, dtype=self._Q_f.dtype)
+        b = self._H_fc @ g
+        b *= -1.0
+        b += self._Q_f if g.ndim == 1 else self._Q_f[:, None]
+        x = self._lu.solve(b)
+        T = np.empty((self._mesh.num_nodes,) + g.shape[1:], dtype=x.dtype)
+        T[self._fixed] = g
+        T[self._free] = x
+        return T
+
+
+class IncrementalSolver:
+    """Direct steady-state solver that applies changes to a few
+    elements as low-rank updates of an existing factorization.
+
+    Solves H T = Q with prescribed temperatures at fixed nodes.
+    After elements change, the free-node matrix is A0 + U C U^T,
+    where U selects the m free nodes of the changed elements
+    and C is the accumulated change of their element matrices.
+    Solves use the Sherman-Morrison-Woodbury identity
+    A^-1 b = y - Z (I + C U^T Z)^-1 C U^T y,
+    with y = A0^-1 b and Z = A0^-1 U, reusing the factorization of A0.
+    Columns of Z are cached, so each changed node costs one extra
+    pair of triangular solves. The matrix is refactored once the
+    rank m exceeds max_rank.
+
+    By default max_rank comes from a cost model of the first
+    factorization: refactoring costs about sum_k l_k u_k
+    multiply-adds, with l_k and u_k the off-diagonal entries in
+    column k of L and row k of U, while each extra rank costs
+    one solve of about nnz(L) + nnz(U), so the default is the
+    ratio of the two. It depends only on the sparsity of the
+    factors, so refactoring points are the same on every run.
+    The model leaves out reassembling the matrix, which loops over
+    the elements in Python and is what dominates a refactor when
+    the factors have little fill, as on a pipe. The ratio is
+    therefore never taken below a floor of 32.
+
+    Attributes
+    ----------
+    mesh
+    rank
+    max_rank
+    num_factorizations
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    fixed : array_like of int
+        The global indices of nodes with prescribed temperature.
+    fixed_temps : array_like
+        The prescribed temperatures.
+    max_rank : int or str, optional
+        The rank above which the matrix is refactored.
+        Default is the ratio of the factorization cost to the cost
+        of one solve, counted from the nonzeros of the factors,
+        and at least 32.
+        "timed" instead measures the time of the first factorization
+        and of one solve, which is not reproducible between runs,
+        with the same floor.
+
+    Raises
+    ------
+    ValueError
+        If fixed and fixed_temps have different lengths.
+        If max_rank is a str other than "timed".
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        fixed: npt.ArrayLike,
+        fixed_temps: npt.ArrayLike,
+        max_rank: int = None,
+    ):
+        self._mesh = mesh
+        self._fixed = np.asarray(fixed, dtype=int)
+        self._fixed_temps = np.asarray(fixed_temps, dtype=float)
+        if self._fixed.shape != self._fixed_temps.shape:
+            raise ValueError(
+                f"got {len(self._fixed_temps)} values "
+                + f"for {len(self._fixed)} fixed nodes"
+            )
+        if isinstance(max_rank, str) and max_rank != "timed":
+            raise ValueError(f"max_rank {max_rank} is not valid")
+        self._free = np.setdiff1d(np.arange(mesh.num_nodes), self._fixed)
+        # position of each global node in the free set, -1 if fixed
+        self._free_pos = np.full(mesh.num_nodes, -1)
+        self._free_pos[self._free] = np.arange(len(self._free))
+
+        k = mesh.connectivity.shape[1]
+        self._H_e = np.empty((mesh.num_elements, k, k))
+        self._Q_e = np.empty((mesh.num_elements, k))
+        for e, H_e, Q_e in zip(mesh.elements, self._H_e, self._Q_e):
+            e.compute_conduction_matrix(out=H_e)
+            e.compute_flux_vector(out=Q_e)
+        self._max_rank = max_rank
+        self._num_factorizations = 0
+        self._factorize()
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def rank(self) -> int:
+        """The rank of the accumulated update.
+
+        Returns
+        -------
+        int
+        """
+        return len(self._update_nodes())
+
+    @property
+    def max_rank(self) -> int:
+        return self._max_rank
+
+    @property
+    def num_factorizations(self) -> int:
+        return self._num_factorizations
+
+    def update_element(self, index: int, **properties) -> None:
+        """Change the properties of one element.
+
+        Parameters
+        ----------
+        index : int
+            The index of the element in mesh.elements.
+        **properties
+            IntegrationPoint property values to assign
+            to all integration points of the element,
+            e.g. thrm_cond=2.5, heat_trans_coef=1.2.
+            With no properties, the element matrices are recomputed
+            from the current integration point values.
+
+        Raises
+        ------
+        AttributeError
+            If a property is not an IntegrationPoint property.
+        ValueError
+            If a property value is invalid.
+        """
+        e = self._mesh.elements[index]
+        for ip in e.int_pts:
+            for name, value in properties.items():
+                setattr(ip, name, value)
+        e.compute_conduction_matrix(out=self._H_e[index])
+        e.compute_flux_vector(out=self._Q_e[index])
+        self._changed.add(index)
+        if self.rank > self._max_rank:
+            self._factorize()
+
+    def solve(self, fixed_temps: npt.ArrayLike = None) -> npt.NDArray:
+        """Solve for the nodal temperatures.
+
+        Parameters
+        ----------
+        fixed_temps : array_like, optional
+            New prescribed temperatures for the fixed nodes.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+        """
+        if fixed_temps is not None:
+            self._fixed_temps = np.asarray(fixed_temps, dtype=float)
+        changed = np.array(sorted(self._changed), dtype=int)
+        conn = self._mesh.connectivity[changed]
+        dH_e = self._H_e[changed] - self._H0_e[changed]
+        dQ_e = self._Q_e[changed] - self._Q0_e[changed]
+
+        Q = self._Q0.copy()
+        np.add.at(Q, conn, dQ_e)
+        T = np.zeros(self._mesh.num_nodes)
+        T[self._fixed] = self._fixed_temps
+        # move the fixed node terms of the current matrix to the rhs
+        dH_T = np.zeros_like(Q)
+        np.add.at(dH_T, conn, np.einsum("eij,ej->ei", dH_e, T[conn]))
+        b = (Q - self._H0 @ T - dH_T)[self._free]
+
+        y = self._lu.solve(b)
+        nodes = self._update_nodes()
+        if len(nodes):
+            Z = self._columns(nodes)
+            C = self._update_matrix(nodes, conn, dH_e)
+            Uy = y[self._free_pos[nodes]]
+            V = Z[self._free_pos[nodes]]
+            y -= Z @ np.linalg.solve(np.eye(len(nodes)) + C @ V, C @ Uy)
+        T[self._free] = y
+        return T
+
+    def refactor(self) -> None:
+        """Assemble and factorize the current matrix,
+        discarding the accumulated update."""
+        self._factorize()
+
+    def _factorize(self):
+        mesh = self._mesh
+        self._H0_e = self._H_e.copy()
+        self._Q0_e = self._Q_e.copy()
+        self._H0 = stamp_element_matrices(mesh, self._H0_e)
+        self._Q0 = np.bincount(
+            mesh.connectivity.ravel(),
+            weights=self._Q0_e.ravel(),
+            minlength=mesh.num_nodes,
+        )
+        A0 = self._H0[self._free][:, self._free].tocsc()
+        tic = time.perf_counter()
+        self._lu = splu(A0)
+        t_factor = time.perf_counter() - tic
+        self._num_factorizations += 1
+        if self._max_rank is None:
+            self._max_rank = max(
+                _MIN_MAX_RANK, _factor_solve_ratio(self._lu))
+        elif self._max_rank == "timed":
+            tic = time.perf_counter()
+            self._lu.solve(np.ones(A0.shape[0]))
+            t_solve = time.perf_counter() - tic
+            self._max_rank = max(
+                _MIN_MAX_RANK, int(t_factor / max(t_solve, 1e-9)))
+        self._changed = set()
+        self._Z = {}
+
+    def _update_nodes(self):
+        # free nodes of the changed elements
+        conn = self._mesh.connectivity[sorted(self._changed)]
+        nodes = np.unique(conn)
+        return nodes[self._free_pos[nodes] >= 0]
+
+    def _columns(self, nodes):
+        for nd in nodes:
+            if nd not in self._Z:
+                u = np.zeros(len(self._free))
+                u[self._free_pos[nd]] = 1.0
+                self._Z[nd] = self._lu.solve(u)
+        return np.stack([self._Z[nd] for nd in nodes], axis=1)
+
+    def _update_matrix(self, nodes, conn, dH_e):
+        # accumulate element changes on the free update nodes
+        pos = np.searchsorted(nodes, conn)
+        pos[(pos == len(nodes))] = 0
+        keep = nodes[pos] == conn
+        C = np.zeros((len(nodes), len(nodes)))
+        for e in range(len(conn)):
+            p = pos[e][keep[e]]
+            C[np.ix_(p, p)] += dH_e[e][np.ix_(keep[e], keep[e])]
+        return C
+
+
+def _factor_solve_ratio(lu):
+    # multiply-adds of the factorization over those of one solve,
+    # L has a unit diagonal and U is upper triangular, both csc
+    L, U = lu.L, lu.U
+    n = L.shape[0]
+    lower = np.diff(L.indptr) - 1
+    upper = np.bincount(U.indices, minlength=n) - 1
+    factor = np.dot(lower, upper) + L.nnz
+    solve = L.nnz + U.nnz
+    return max(1, int(factor // solve))
+
+
+def _linear_prolongation(coords):
+    # fine nodes at odd positions are kept on the coarse level,
+    # nodes at even positions are interpolated from their neighbours
+    n = len(coords)
+    nc = n // 2
+    rows = [np.arange(1, n, 2)]
+    cols = [np.arange(nc)]
+    vals = [np.ones(nc)]
+    even = np.arange(0, n, 2)
+    left = (even - 1) // 2
+    right = (even + 1) // 2
+    has_left = even > 0
+    has_right = even < n - 1
+    both = has_left & has_right
+    wl = np.full(len(even), 0.5)
+    wr = np.full(len(even), 0.5)
+    i = even[both]
+    wl[both] = (coords[i + 1] - coords[i]) / (coords[i + 1] - coords[i - 1])
+    wr[both] = 1.0 - wl[both]
+    rows += [even[has_left], even[has_right]]
+    cols += [left[has_left], right[has_right]]
+    vals += [wl[has_left], wr[has_right]]
+    return sparse.csr_matrix(
+        (np.concatenate(vals),
+         (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n, nc),
+    )
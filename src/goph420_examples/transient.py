@@ -0,0 +1,661 @@
+import numpy as np
+import numpy.typing as npt
+from scipy.sparse.linalg import splu
+
+from .assembly import (
+    apply_dirichlet,
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+    assemble_lumped_storage,
+    assemble_source_vector,
+    assemble_storage_matrix,
+    assemble_unit_flux_vector,
+)
+from .forcing import (
+    TimeSeries,
+)
+from .interpolation import (
+    reference_matrices,
+)
+from .mesh import (
+    Mesh,
+)
+from .operators import (
+    MatrixFreeOperator,
+)
+
+# forcing histories that can be given as a TimeSeries
+_FORCING = ("fixed_temps", "temp_inf", "source")
+
+# extent of the stability region of each explicit method
+# along the negative real axis
+_STABILITY_LIMITS = {
+    "euler": 2.0,
+    "rk2": 2.0,
+    "rk4": 2.785293563405282,
+}
+
+
+def stable_time_step(
+    conduction: MatrixFreeOperator,
+    storage: MatrixFreeOperator,
+    method: str = "euler",
+) -> float:
+    """Estimate the largest stable explicit time step
+    with the row-sum lumped storage matrix.
+
+    The largest eigenvalue of C_L^-1 H is bounded by the largest
+    element eigenvalue, which depends on the element jacobians
+    and the thermal diffusivity.
+
+    Inputs
+    ------
+    conduction : MatrixFreeOperator
+        The conduction operator.
+    storage : MatrixFreeOperator
+        The storage operator.
+    method : str, optional, default="euler"
+        The explicit method, one of "euler", "rk2", "rk4".
+
+    Returns
+    -------
+    float
+
+    Raises
+    ------
+    ValueError
+        If method is not valid.
+        If any element has zero storage.
+    """
+    if method not in _STABILITY_LIMITS:
+        raise ValueError(f"method {method} is not valid")
+    order = conduction.mesh.connectivity.shape[1] - 1
+    mass, stiffness, _ = reference_matrices(order)
+    H_e = (conduction.mass_coef[:, None, None] * mass
+           + conduction.stiffness_coef[:, None, None] * stiffness)
+    c_e = storage.mass_coef[:, None] * mass.sum(axis=1)
+    if np.any(c_e <= 0.0):
+        raise ValueError("explicit time stepping requires storage > 0")
+    s = 1.0 / np.sqrt(c_e)
+    lam = np.linalg.eigvalsh(s[:, :, None] * H_e * s[:, None, :])
+    lam_max = lam[:, -1].max()
+    if lam_max <= 0.0:
+        return np.inf
+    return _STABILITY_LIMITS[method] / lam_max
+
+
+class ExplicitIntegrator:
+    """Integrate C dT/dt + H T = Q explicitly
+    using the row-sum lumped storage matrix.
+
+    Since the lumped storage matrix is diagonal,
+    each stage is a matrix-free product with H
+    and an elementwise scaling, with no linear solve.
+
+    Attributes
+    ----------
+    mesh
+    method
+    dt
+    stable_dt
+    time
+    step_count
+    temps
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    fixed : array_like of int, optional
+        The global indices of nodes with prescribed temperature.
+    fixed_temps : array_like or TimeSeries, optional
+        The prescribed temperatures, or their history
+        with one channel per fixed node.
+    temps : array_like, shape=(num_nodes,), optional
+        The initial nodal temperatures, default is zero.
+        Values at fixed nodes are replaced by fixed_temps.
+    method : str, optional, default="euler"
+        One of "euler", "rk2" (Heun) or "rk4".
+    dt : float, optional
+        The time step. Default is safety * stable_dt.
+    safety : float, optional, default=0.9
+        The fraction of the stable time step used by default.
+    time : float, optional, default=0.0
+        The initial time.
+    step_count : int, optional, default=0
+        The initial step count, e.g. when resuming a run.
+    temp_inf : TimeSeries, optional
+        The history of a uniform ambient temperature,
+        which replaces the temp_inf of the integration points.
+    source : TimeSeries, optional
+        The history of a uniform volumetric heat source.
+
+    Raises
+    ------
+    ValueError
+        If method is not valid.
+        If dt exceeds the stable time step.
+        If fixed_temps does not have one value per fixed node.
+        If temp_inf or source has more than one channel.
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        fixed: npt.ArrayLike = (),
+        fixed_temps: npt.ArrayLike = (),
+        temps: npt.ArrayLike = None,
+        method: str = "euler",
+        dt: float = None,
+        safety: float = 0.9,
+        time: float = 0.0,
+        step_count: int = 0,
+        temp_inf: TimeSeries = None,
+        source: TimeSeries = None,
+    ):
+        if method not in _STABILITY_LIMITS:
+            raise ValueError(f"method {method} is not valid")
+        self._mesh = mesh
+        self._method = method
+        self._H = MatrixFreeOperator.conduction(mesh)
+        self._stable_dt = stable_time_step(
+            self._H, MatrixFreeOperator.storage(mesh), method)
+        c_lumped = assemble_lumped_storage(mesh)
+
+        # time-varying loads are the static flux vector
+        # plus cached unit vectors scaled by the current values
+        if temp_inf is None:
+            self._Q = assemble_flux_vector(mesh)
+            unit_flux = None
+        else:
+            self._Q = np.zeros(mesh.num_nodes, dtype=mesh.dtype)
+            unit_flux = assemble_unit_flux_vector(mesh)
+        unit_source = None if source is None else assemble_source_vector(mesh)
+        self._set_forcing(fixed, fixed_temps, temp_inf, source,
+                          unit_flux, unit_source, time)
+        # zero inverse storage at fixed nodes keeps them constant
+        self._inv_c = 1.0 / c_lumped
+        self._inv_c[self._fixed] = 0.0
+
+        if dt is None:
+            dt = safety * self._stable_dt
+        dt = float(dt)
+        if dt > self._stable_dt:
+            raise ValueError(
+                f"dt {dt} exceeds stable time step {self._stable_dt}"
+            )
+        self._dt = dt
+
+        self._temps = np.zeros(mesh.num_nodes)
+        if temps is not None:
+            self._temps[:] = temps
+        self._temps[self._fixed] = self._fixed_temps
+        self._time = float(time)
+        self._step_count = int(step_count)
+
+    def _set_forcing(self, fixed, fixed_temps, temp_inf, source,
+                     unit_flux, unit_source, time):
+        self._fixed = np.asarray(fixed, dtype=int)
+        if isinstance(fixed_temps, TimeSeries):
+            self._fixed_series = fixed_temps
+            fixed_temps = fixed_temps(time)
+        else:
+            self._fixed_series = None
+        self._fixed_temps = np.asarray(fixed_temps, dtype=float)
+        if self._fixed_temps.shape != self._fixed.shape:
+            raise ValueError(
+                f"got {self._fixed_temps.size} fixed temperatures "
+                f"for {len(self._fixed)} fixed nodes"
+            )
+        for name, series in (("temp_inf", temp_inf), ("source", source)):
+            if series is not None and series.values.ndim != 1:
+                raise ValueError(f"{name} must have a single channel")
+        self._temp_inf = temp_inf
+        self._source = source
+        self._unit_flux = unit_flux
+        self._unit_source = unit_source
+        self._forced = temp_inf is not None or source is not None
+        self._load = np.empty_like(self._Q)
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @property
+    def stable_dt(self) -> float:
+        return self._stable_dt
+
+    @property
+    def time(self) -> float:
+        return self._time
+
+    @property
+    def step_count(self) -> int:
+        return self._step_count
+
+    @property
+    def temps(self) -> npt.NDArray[np.floating]:
+        """The current nodal temperatures.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+        """
+        return self._temps
+
+    def step(self, num_steps: int = 1) -> npt.NDArray[np.floating]:
+        """Advance the solution.
+
+        Parameters
+        ----------
+        num_steps : int, optional, default=1
+            The number of time steps to take.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+            The nodal temperatures after the last step.
+        """
+        dt = self._dt
+        T = self._temps
+        f = self._rate
+        for _ in range(num_steps):
+            t = self._time
+            if self._method == "euler":
+                T += dt * f(T, t)
+            elif self._method == "rk2":
+                k1 = f(T, t)
+                k2 = f(T + dt * k1, t + dt)
+                T += (0.5 * dt) * (k1 + k2)
+            else:
+                k1 = f(T, t)
+                k2 = f(T + (0.5 * dt) * k1, t + 0.5 * dt)
+                k3 = f(T + (0.5 * dt) * k2, t + 0.5 * dt)
+                k4 = f(T + dt * k3, t + dt)
+                T += (dt / 6.0) * (k1 + 2.0 * (k2 + k3) + k4)
+            self._step_count += 1
+            self._time += dt
+            if self._fixed_series is not None:
+                self._fixed_temps = self._fixed_series(self._time)
+                T[self._fixed] = self._fixed_temps
+        return T
+
+    def advance_to(self, time: float) -> npt.NDArray[np.floating]:
+        """Advance the solution by whole steps up to a given time.
+
+        Parameters
+        ----------
+        time : float
+            The target time. The last step is shortened
+            so that the target is met exactly.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes,)
+        """
+        num_steps = int(np.floor((time - self._time) / self._dt))
+        self.step(num_steps)
+        remaining = time - self._time
+        if remaining > 1.0e-12 * self._dt:
+            dt = self._dt
+            self._dt = remaining
+            try:
+                self.step()
+            finally:
+                self._dt = dt
+        return self._temps
+
+    def get_state(self) -> dict:
+        """Copy the integrator state, including the assembled operators.
+
+        Returns
+        -------
+        dict
+            The method, dt, stable_dt, time, step_count,
+            nodal temps, fixed nodes and temperatures,
+            and the assembled arrays needed to resume
+            without re-assembly.
+        """
+        state = {
+            "method": self._method,
+            "dt": self._dt,
+            "stable_dt": self._stable_dt,
+            "time": self._time,
+            "step_count": self._step_count,
+            "temps": self._temps.copy(),
+            "fixed": self._fixed.copy(),
+            "fixed_temps": self._fixed_temps.copy(),
+            "mass_coef": self._H.mass_coef.copy(),
+            "stiffness_coef": self._H.stiffness_coef.copy(),
+            "flux": self._Q.copy(),
+            "inv_c": self._inv_c.copy(),
+        }
+        forcing = {
+            "fixed_temps": self._fixed_series,
+            "temp_inf": self._temp_inf,
+            "source": self._source,
+        }
+        for name, series in forcing.items():
+            if series is not None:
+                state[f"{name}_times"] = series.times.copy()
+                state[f"{name}_values"] = series.values.copy()
+        if self._unit_flux is not None:
+            state["unit_flux"] = self._unit_flux.copy()
+        if self._unit_source is not None:
+            state["unit_source"] = self._unit_source.copy()
+        return state
+
+    @classmethod
+    def from_state(cls, mesh: Mesh, state: dict, reassemble: bool = False):
+        """Recreate an integrator from a state returned by get_state.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            The mesh to resume on.
+        state : dict
+            The integrator state.
+        reassemble : bool, optional, default=False
+            If False, the stored operators are reused, which is only
+            valid if the mesh is the one the state was computed on.
+            If True, the operators are assembled from the mesh
+            and dt is checked against its stable time step.
+
+        Returns
+        -------
+        ExplicitIntegrator
+
+        Raises
+        ------
+        ValueError
+            If the state does not match the mesh size.
+            If reassemble and dt exceeds the stable time step.
+        """
+        if len(state["temps"]) != mesh.num_nodes:
+            raise ValueError(
+                f"state has {len(state['temps'])} nodes, "
+                f"mesh has {mesh.num_nodes}"
+            )
+        forcing = {
+            name: TimeSeries(state[f"{name}_times"], state[f"{name}_values"])
+            for name in _FORCING if f"{name}_times" in state
+        }
+        fixed_temps = forcing.pop("fixed_temps", state["fixed_temps"])
+        if reassemble:
+            return cls(
+                mesh,
+                fixed=state["fixed"],
+                fixed_temps=fixed_temps,
+                temps=state["temps"],
+                method=str(state["method"]),
+                dt=float(state["dt"]),
+                time=float(state["time"]),
+                step_count=int(state["step_count"]),
+                **forcing,
+            )
+        self = cls.__new__(cls)
+        self._mesh = mesh
+        self._method = str(state["method"])
+        self._H = MatrixFreeOperator(
+            mesh, state["mass_coef"], state["stiffness_coef"])
+        self._Q = np.array(state["flux"], dtype=mesh.dtype)
+        self._stable_dt = float(state["stable_dt"])
+        self._inv_c = np.array(state["inv_c"], dtype=mesh.dtype)
+        self._set_forcing(
+            state["fixed"], fixed_temps,
+            forcing.get("temp_inf"), forcing.get("source"),
+            state.get("unit_flux"), state.get("unit_source"),
+            float(state["time"]),
+        )
+        self._dt = float(state["dt"])
+        self._temps = np.array(state["temps"], dtype=float)
+        self._time = float(state["time"])
+        self._step_count = int(state["step_count"])
+        return self
+
+    def _rate(self, T, t):
+        if self._fixed_series is not None:
+            T[self._fixed] = self._fixed_series(t)
+        return self._inv_c * (self._load_at(t) - self._H @ T)
+
+    def _load_at(self, t):
+        if not self._forced:
+            return self._Q
+        Q = self._load
+        Q[:] = self._Q
+        if self._temp_inf is not None:
+            Q += self._temp_inf(t) * self._unit_flux
+        if self._source is not None:
+            Q += self._source(t) * self._unit_source
+        return Q
+
+
+class EnsembleIntegrator:
+    """Integrate C dT/dt + H T = Q implicitly for many scenarios
+    on the same mesh in lock-step, using the theta method.
+
+    The k scenarios are the columns of an (n, k) state matrix.
+    The matrix C + theta * dt * H of the free nodes is factorized
+    once and shared by all scenarios, so each step is one sparse
+    matrix product and one block triangular solve with k
+    right-hand sides.
+
+    Attributes
+    ----------
+    mesh
+    num_scenarios
+    theta
+    dt
+    time
+    step_count
+    temps
+    factorization
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The finite element mesh.
+    temps : array_like, shape=(num_nodes, k)
+        The initial nodal temperatures of each scenario.
+        Values at fixed nodes are replaced by fixed_temps.
+    dt : float
+        The time step.
+    fixed : array_like of int, optional
+        The global indices of nodes with prescribed temperature.
+    fixed_temps : array_like or TimeSeries, optional
+        The prescribed temperatures, shape=(num_fixed,) shared by
+        all scenarios or shape=(num_fixed, k),
+        or a history with one channel per fixed node.
+    theta : float, optional, default=1.0
+        The implicitness, 1.0 for backward Euler
+        and 0.5 for Crank-Nicolson.
+    time : float, optional, default=0.0
+        The initial time.
+    temp_inf : TimeSeries, optional
+        The history of a uniform ambient temperature,
+        which replaces the temp_inf of the integration points,
+        with one channel shared by all scenarios or k channels.
+    source : TimeSeries, optional
+        The history of a uniform volumetric heat source,
+        with one channel shared by all scenarios or k channels.
+
+    Raises
+    ------
+    ValueError
+        If temps is not 2D with one row per node.
+        If dt <= 0.
+        If theta is not in [0.5, 1].
+        If fixed_temps does not match fixed and temps.
+        If temp_inf or source does not have 1 or k channels.
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        temps: npt.ArrayLike,
+        dt: float,
+        fixed: npt.ArrayLike = (),
+        fixed_temps: npt.ArrayLike = (),
+        theta: float = 1.0,
+        time: float = 0.0,
+        temp_inf: TimeSeries = None,
+        source: TimeSeries = None,
+    ):
+        temps = np.array(temps, dtype=float)
+        if temps.ndim != 2 or temps.shape[0] != mesh.num_nodes:
+            raise ValueError(
+                f"temps has shape {temps.shape}, "
+                f"should be ({mesh.num_nodes}, k)"
+            )
+        k = temps.shape[1]
+        dt = float(dt)
+        if dt <= 0.0:
+            raise ValueError(f"dt {dt} must be positive")
+        theta = float(theta)
+        if not 0.5 <= theta <= 1.0:
+            raise ValueError(f"theta {theta} must be in [0.5, 1]")
+        for name, series in (("temp_inf", temp_inf), ("source", source)):
+            if series is not None and np.size(series(time)) not in (1, k):
+                raise ValueError(f"{name} must have 1 or {k} channels")
+
+        self._fixed = np.asarray(fixed, dtype=int)
+        if isinstance(fixed_temps, TimeSeries):
+            self._fixed_series = fixed_temps
+            fixed_temps = fixed_temps(time)
+        else:
+            self._fixed_series = None
+        fixed_temps = np.asarray(fixed_temps, dtype=float)
+        if fixed_temps.ndim == 1:
+            fixed_temps = fixed_temps[:, None]
+        if (fixed_temps.shape[0] != len(self._fixed)
+                or fixed_temps.shape[1] not in (1, k)):
+            raise ValueError(
+                f"fixed_temps has shape {fixed_temps.shape}, "
+                f"should be ({len(self._fixed)},) "
+                f"or ({len(self._fixed)}, {k})"
+            )
+
+        H = assemble_conduction_matrix(mesh)
+        C = assemble_storage_matrix(mesh)
+        A = (C + (theta * dt) * H).tocsr()
+        self._B = (C - ((1.0 - theta) * dt) * H).tocsr()
+        A_ff, _, self._free = apply_dirichlet(
+            A, np.zeros(mesh.num_nodes), self._fixed,
+            np.zeros(len(self._fixed)),
+        )
+        self._A_fc = A[self._free][:, self._fixed]
+        self._lu = splu(A_ff.tocsc())
+
+        if temp_inf is None:
+            self._Q = assemble_flux_vector(mesh)[:, None]
+            self._unit_flux = None
+        else:
+            self._Q = np.zeros((mesh.num_nodes, 1), dtype=mesh.dtype)
+            self._unit_flux = assemble_unit_flux_vector(mesh)[:, None]
+        self._unit_source = (
+            None if source is None else assemble_source_vector(mesh)[:, None]
+        )
+        self._temp_inf = temp_inf
+        self._source = source
+
+        self._mesh = mesh
+        self._theta = theta
+        self._dt = dt
+        self._temps = temps
+        self._temps[self._fixed] = fixed_temps
+        self._time = float(time)
+        self._step_count = 0
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def num_scenarios(self) -> int:
+        return self._temps.shape[1]
+
+    @property
+    def theta(self) -> float:
+        return self._theta
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @property
+    def time(self) -> float:
+        return self._time
+
+    @property
+    def step_count(self) -> int:
+        return self._step_count
+
+    @property
+    def temps(self) -> npt.NDArray[np.floating]:
+        """The current nodal temperatures of all scenarios.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes, k)
+        """
+        return self._temps
+
+    @property
+    def factorization(self):
+        """The shared LU factorization of C + theta * dt * H
+        for the free nodes.
+
+        Returns
+        -------
+        scipy.sparse.linalg.SuperLU
+        """
+        return self._lu
+
+    def step(self, num_steps: int = 1) -> npt.NDArray[np.floating]:
+        """Advance all scenarios.
+
+        Parameters
+        ----------
+        num_steps : int, optional, default=1
+            The number of time steps to take.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(num_nodes, k)
+            The nodal temperatures after the last step.
+        """
+        dt = self._dt
+        theta = self._theta
+        T = self._temps
+        free = self._free
+        fixed = self._fixed
+        Q_old = self._load_at(self._time)
+        for _ in range(num_steps):
+            t_new = self._time + dt
+            Q_new = self._load_at(t_new)
+            rhs = self._B @ T
+            rhs += dt * ((1.0 - theta) * Q_old + theta * Q_new)
+            if self._fixed_series is not None:
+                T[fixed] = self._fixed_series(t_new)[:, None]
+            rhs_f = rhs[free] - self._A_fc @ T[fixed]
+            T[free] = self._lu.solve(rhs_f)
+            Q_old = Q_new
+            self._time = t_new
+            self._step_count += 1
+        return T
+
+    def _load_at(self, t):
+        Q = self._Q
+        if self._temp_inf is not None:
+            Q = Q + self._unit_flux * self._temp_inf(t)
+        if self._source is not None:
+            Q = Q + self._unit_source * self._source(t)
+        return Q
@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.assembly import (
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+    apply_dirichlet,
+)
+from goph420_examples.solvers import (
+    ConjugateGradientSolver,
+    MultigridPreconditioner,
+)
+
+
+class TestConjugateGradientSolver(unittest.TestCase):
+
+    def setUp(self):
+        x = np.linspace(0.0, 5.0, 201)
+        x[1:-1] += 0.004 * np.sin(7.0 * x[1:-1])
+        self.mesh = Mesh.from_coords(x)
+        D = 0.5
+        for e in self.mesh.elements:
+            for ip in e.int_pts:
+                ip.thrm_cond = 25.0
+                ip.heat_trans_coef = 2.0
+                ip.perimeter = np.pi * D
+                ip.area = 0.25 * np.pi * D ** 2
+                ip.temp_inf = 35.0
+        H = assemble_conduction_matrix(self.mesh)
+        Q = assemble_flux_vector(self.mesh)
+        n = self.mesh.num_nodes
+        self.H, self.Q, self.free = apply_dirichlet(
+            H, Q, [0, n - 1], [2.0, 18.0])
+        self.expected = np.linalg.solve(self.H.toarray(), self.Q)
+
+    def check_solver(self, preconditioner, **kwargs):
+        solver = ConjugateGradientSolver(
+            self.H, preconditioner=preconditioner, **kwargs)
+        x = solver.solve(self.Q)
+        self.assertTrue(solver.stats.converged)
+        self.assertTrue(np.allclose(x, self.expected, rtol=1e-8))
+        return solver
+
+    def test_no_preconditioner(self):
+        self.check_solver(None)
+
+    def test_jacobi(self):
+        self.check_solver("jacobi")
+
+    def test_ichol(self):
+        solver = self.check_solver("ichol")
+        # IC(0) is exact for a tridiagonal matrix
+        self.assertLessEqual(solver.stats.iterations, 2)
+
+    def test_multigrid(self):
+        solver = self.check_solver(
+            "multigrid", coords=self.mesh.coords[self.free])
+        jacobi = self.check_solver("jacobi")
+        self.assertLess(solver.stats.iterations, jacobi.stats.iterations)
+
+    def test_warm_start(self):
+        solver = self.check_solver("jacobi")
+        solver.solve(self.Q)
+        self.assertTrue(solver.stats.warm_started)
+        self.assertEqual(solver.stats.iterations, 0)
+
+    def test_no_warm_start(self):
+        solver = self.check_solver("jacobi", warm_start=False)
+        solver.solve(self.Q)
+        self.assertFalse(solver.stats.warm_started)
+        self.assertGreater(solver.stats.iterations, 0)
+
+    def test_residual_history(self):
+        solver = self.check_solver("jacobi")
+        stats = solver.stats
+        self.assertEqual(len(stats.residual_norms), stats.iterations + 1)
+        self.assertLess(stats.relative_residual, 1e-10)
+
+    def test_invalid_preconditioner(self):
+        with self.assertRaises(ValueError):
+            ConjugateGradientSolver(self.H, preconditioner="ilu")
+
+    def test_multigrid_requires_coords(self):
+        with self.assertRaises(ValueError):
+            ConjugateGradientSolver(self.H, preconditioner="multigrid")
+
+    def test_multigrid_levels(self):
+        mg = MultigridPreconditioner(
+            self.H, self.mesh.coords[self.free], coarse_size=8)
+        self.assertGreater(mg.num_levels, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
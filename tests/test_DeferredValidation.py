@@ -0,0 +1,193 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.classes import (
+    DeferredValidation,
+    Element,
+    IntegrationPoint,
+    Node,
+)
+from goph420_examples.mesh import (
+    Mesh,
+)
+
+
+class TestDeferredValidation(unittest.TestCase):
+
+    def strict_message(self, func, *args, **kwargs):
+        with self.assertRaises((TypeError, ValueError)) as cm:
+            func(*args, **kwargs)
+        return type(cm.exception), str(cm.exception)
+
+    def assert_same_error(self, indices, cls, valid, invalid):
+        error_type, message = self.strict_message(cls, *invalid)
+        with self.assertRaises(error_type) as cm:
+            with DeferredValidation():
+                for k in range(5):
+                    cls(*(invalid if k in indices else valid))
+        self.assertTrue(str(cm.exception).startswith(message))
+        self.assertTrue(np.array_equal(cm.exception.indices, indices))
+
+    def test_valid_objects(self):
+        with DeferredValidation() as batch:
+            nodes = [Node(k, k) for k in range(4)]
+            elements = [Element(nodes[k:k + 2], order=1) for k in range(3)]
+            self.assertEqual(batch.num_pending, 7)
+        self.assertEqual(batch.num_pending, 0)
+        for k, nd in enumerate(nodes):
+            self.assertIsInstance(nd.x, float)
+            self.assertEqual(nd.x, k)
+            self.assertIsInstance(nd.temp, float)
+        for k, e in enumerate(elements):
+            self.assertAlmostEqual(e.int_pts[0].x, k + 0.5)
+            self.assertEqual(e.jacobian, 1.0)
+
+    def test_values_converted(self):
+        with DeferredValidation():
+            ip = IntegrationPoint("0.5", 1, np.float32(2.0), density=3)
+        for value in (ip.local_coord, ip.weight, ip.x, ip.density):
+            self.assertIs(type(value), float)
+        self.assertEqual(ip.local_coord, 0.5)
+        self.assertEqual(ip.density, 3.0)
+
+    def test_index_type(self):
+        self.assert_same_error([1, 3], Node, (0, 0.0), (1.0, 0.0))
+
+    def test_index_negative(self):
+        self.assert_same_error([2], Node, (0, 0.0), (-1, 0.0))
+
+    def test_invalid_float(self):
+        self.assert_same_error([0, 4], Node, (0, 0.0), (0, "abc"))
+
+    def test_none_float(self):
+        self.assert_same_error([3], Node, (0, 0.0), (0, 0.0, None))
+
+    def test_negative_weight(self):
+        self.assert_same_error([1], IntegrationPoint, (0.5, 1.0, 0.0),
+                               (0.5, -1.0, 0.0))
+
+    def test_negative_properties(self):
+        for name in ("density", "thrm_cond", "spec_heat_cap",
+                     "heat_trans_coef", "perimeter", "area"):
+            error_type, message = self.strict_message(
+                IntegrationPoint, 0.5, 1.0, 0.0, **{name: -2.0})
+            with self.assertRaises(error_type) as cm:
+                with DeferredValidation():
+                    for k in range(4):
+                        IntegrationPoint(0.5, 1.0, 0.0,
+                                         **{name: -2.0 if k == 2 else 1.0})
+            self.assertTrue(str(cm.exception).startswith(message))
+            self.assertTrue(np.array_equal(cm.exception.indices, [2]))
+
+    def test_element_nodes(self):
+        class FakeNode:
+            x = 1.0
+
+        nodes = (Node(0, 0.0), Node(1, 1.0))
+        error_type, message = self.strict_message(
+            Element, (nodes[0], FakeNode()), order=1)
+        with self.assertRaises(error_type) as cm:
+            with DeferredValidation():
+                Element(nodes, order=1)
+                Element((nodes[0], FakeNode()), order=1)
+        self.assertTrue(str(cm.exception).startswith(message))
+        self.assertTrue(np.array_equal(cm.exception.indices, [1]))
+
+    def test_element_invalid_node(self):
+        error_type, message = self.strict_message(Node, 1, "a")
+        with self.assertRaises(error_type) as cm:
+            with DeferredValidation():
+                nodes = [Node(k, x) for k, x in enumerate([0.0, "a", 2.0])]
+                Element(nodes[:2], order=1)
+        self.assertTrue(str(cm.exception).startswith(message))
+        self.assertTrue(np.array_equal(cm.exception.indices, [1]))
+
+    def test_element_non_node_without_x(self):
+        with self.assertRaises(TypeError):
+            with DeferredValidation():
+                Element((Node(0, 0.0), object()), order=1)
+
+    def test_exception_skips_validation(self):
+        with self.assertRaises(KeyError):
+            with DeferredValidation():
+                Node(-1, 0.0)
+                raise KeyError("other")
+
+    def test_strict_after_block(self):
+        with DeferredValidation():
+            Node(0, 0.0)
+        with self.assertRaises(ValueError):
+            Node(-1, 0.0)
+
+    def test_setters_are_strict(self):
+        ip = IntegrationPoint(0.5, 1.0, 0.0)
+        with DeferredValidation():
+            with self.assertRaises(ValueError):
+                ip.density = -1.0
+
+    def test_validate_early(self):
+        with DeferredValidation() as batch:
+            Node(-1, 0.0)
+            with self.assertRaises(ValueError):
+                batch.validate()
+            self.assertEqual(batch.num_pending, 0)
+            Node(0, 0.0)
+
+
+class TestSetValues(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords(np.linspace(0.0, 1.0, 11))
+        self.int_pts = [e.int_pts[0] for e in self.mesh.elements]
+
+    def test_set_values(self):
+        IntegrationPoint.set_values(self.int_pts, "thrm_cond",
+                                    np.arange(10))
+        values = self.mesh.int_pt_values("thrm_cond")[:, 0]
+        self.assertTrue(np.array_equal(values, np.arange(10.0)))
+        self.assertIs(type(self.int_pts[3].thrm_cond), float)
+
+    def test_scalar(self):
+        IntegrationPoint.set_values(self.int_pts, "temp_inf", 35.0)
+        self.assertTrue(np.all(self.mesh.int_pt_values("temp_inf") == 35.0))
+
+    def test_negative(self):
+        ip = IntegrationPoint(0.5, 1.0, 0.0)
+        with self.assertRaises(ValueError) as strict:
+            ip.area = -3.0
+        values = np.ones(10)
+        values[[4, 7]] = -3.0
+        with self.assertRaises(ValueError) as cm:
+            IntegrationPoint.set_values(self.int_pts, "area", values)
+        self.assertTrue(str(cm.exception).startswith(str(strict.exception)))
+        self.assertTrue(np.array_equal(cm.exception.indices, [4, 7]))
+        # nothing is assigned if any value is invalid
+        self.assertTrue(np.all(self.mesh.int_pt_values("area") == 0.0))
+
+    def test_invalid_float(self):
+        values = [1.0] * 10
+        values[5] = "abc"
+        with self.assertRaises(ValueError) as cm:
+            IntegrationPoint.set_values(self.int_pts, "temp", values)
+        self.assertTrue(np.array_equal(cm.exception.indices, [5]))
+
+    def test_invalid_name(self):
+        for name in ("x", "weight", "nonsense"):
+            with self.assertRaises(AttributeError):
+                IntegrationPoint.set_values(self.int_pts, name, 1.0)
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            IntegrationPoint.set_values(self.int_pts, "temp", np.ones(3))
+
+    def test_mesh_set_int_pt_values(self):
+        self.mesh.set_int_pt_values("density", np.arange(10.0)[:, None])
+        self.assertTrue(np.array_equal(
+            self.mesh.int_pt_values("density"), np.arange(10.0)[:, None]))
+        with self.assertRaises(ValueError):
+            self.mesh.set_int_pt_values("density", -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
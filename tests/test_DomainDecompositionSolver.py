@@ -0,0 +1,122 @@
+import multiprocessing
+import unittest
+
+import numpy as np
+
+from goph420_examples.decomposition import (
+    DomainDecompositionSolver,
+)
+from goph420_examples.mesh import (
+    Mesh,
+    PipeSegment,
+)
+from goph420_examples.solvers import (
+    SteadyStateSolver,
+)
+
+
+def set_properties(mesh):
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = 25.0
+            ip.heat_trans_coef = 2.0
+            ip.perimeter = 1.5
+            ip.area = 0.2
+            ip.temp_inf = 35.0
+
+
+class TestDomainDecompositionSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords(np.linspace(0.0, 5.0, 201))
+        set_properties(self.mesh)
+        self.fixed = [0, 200]
+        self.reference = SteadyStateSolver(self.mesh, self.fixed)
+
+    def test_in_process(self):
+        with DomainDecompositionSolver(self.mesh, self.fixed, 5,
+                                       num_workers=0) as dd:
+            self.assertEqual(dd.num_workers, 0)
+            T = dd.solve([2.0, 18.0])
+        self.assertTrue(np.allclose(T, self.reference.solve([2.0, 18.0])))
+
+    def test_worker_processes(self):
+        with DomainDecompositionSolver(self.mesh, self.fixed, 4,
+                                       num_workers=2) as dd:
+            self.assertEqual(dd.num_workers, 2)
+            T = dd.solve([2.0, 18.0])
+        self.assertTrue(np.allclose(T, self.reference.solve([2.0, 18.0])))
+
+    def test_interface(self):
+        with DomainDecompositionSolver(self.mesh, self.fixed, 4,
+                                       num_workers=0) as dd:
+            self.assertTrue(np.array_equal(dd.interface, [50, 100, 150]))
+            S = dd.schur_complement
+        self.assertEqual(S.shape, (3, 3))
+        self.assertTrue(np.allclose(S, S.T))
+        self.assertTrue(np.all(np.linalg.eigvalsh(S) > 0.0))
+
+    def test_reuse_and_multiple_rhs(self):
+        g = np.array([[2.0, 10.0, -5.0], [18.0, 0.0, 40.0]])
+        with DomainDecompositionSolver(self.mesh, self.fixed, 3,
+                                       num_workers=0) as dd:
+            for j in range(3):
+                self.assertTrue(np.allclose(
+                    dd.solve(g[:, j]), self.reference.solve(g[:, j])))
+            T = dd.solve(g)
+        self.assertEqual(T.shape, (201, 3))
+        self.assertTrue(np.allclose(T, self.reference.solve(g)))
+
+    def test_single_subdomain(self):
+        with DomainDecompositionSolver(self.mesh, self.fixed, 1,
+                                       num_workers=0) as dd:
+            self.assertEqual(len(dd.interface), 0)
+            T = dd.solve([2.0, 18.0])
+        self.assertTrue(np.allclose(T, self.reference.solve([2.0, 18.0])))
+
+    def test_one_element_subdomains(self):
+        mesh = Mesh.from_coords(np.linspace(0.0, 5.0, 6))
+        set_properties(mesh)
+        with DomainDecompositionSolver(mesh, [0, 5], 10,
+                                       num_workers=0) as dd:
+            self.assertEqual(dd.num_subdomains, 5)
+            T = dd.solve([2.0, 18.0])
+        expected = SteadyStateSolver(mesh, [0, 5]).solve([2.0, 18.0])
+        self.assertTrue(np.allclose(T, expected))
+
+    def test_network(self):
+        mesh = Mesh.from_network((
+            PipeSegment(0, 1, 10.0, 20, 1.0, 0.1),
+            PipeSegment(1, 2, 5.0, 10, 0.5, 0.02),
+            PipeSegment(2, 0, 4.0, 8, 0.5, 0.02),
+            PipeSegment(1, 3, 6.0, 12, 0.3, 0.01),
+        ))
+        for e in mesh.elements:
+            for ip in e.int_pts:
+                ip.heat_trans_coef = 2.0
+                ip.temp_inf = 35.0
+        fixed = [0, 3]
+        with DomainDecompositionSolver(mesh, fixed, 4, num_workers=0) as dd:
+            T = dd.solve([2.0, 18.0])
+        expected = SteadyStateSolver(mesh, fixed).solve([2.0, 18.0])
+        self.assertTrue(np.allclose(T, expected))
+
+    def test_worker_error_stops_workers(self):
+        # a subdomain without conduction or convection is singular
+        for e in self.mesh.elements[60:90]:
+            for ip in e.int_pts:
+                ip.thrm_cond = 0.0
+                ip.heat_trans_coef = 0.0
+        for num_workers in (0, 2):
+            with self.assertRaises(RuntimeError):
+                DomainDecompositionSolver(self.mesh, self.fixed, 4,
+                                          num_workers=num_workers)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_invalid_num_subdomains(self):
+        with self.assertRaises(ValueError):
+            DomainDecompositionSolver(self.mesh, self.fixed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
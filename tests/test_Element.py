@@ -47,6 +47,21 @@ class TestElementValidInitializer(unittest.TestCase):
         self.assertIsInstance(self.e.jacobian, float)
 
 
+class TestElementLength(unittest.TestCase):
+
+    def test_default_jacobian(self):
+        e = Element((Node(0, 1.5), Node(1, 2.0)), order=1)
+        self.assertAlmostEqual(e.jacobian, 0.5)
+
+    def test_length_jacobian(self):
+        e = Element((Node(0, 1.5), Node(1, 0.0)), order=1, length=2.5)
+        self.assertAlmostEqual(e.jacobian, 2.5)
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            Element((Node(0, 1.5), Node(1, 2.0)), order=1, length=0.0)
+
+
 class TestElementInvalidInitializers(unittest.TestCase):
 
     def test_no_nodes(self):
@@ -120,14 +135,73 @@ class TestElementMatricesAndVectors(unittest.TestCase):
             ip.density = 1.5e3
             ip.spec_heat_cap = 2.5
             ip.heat_trans_coef = 1.2
+            ip.perimeter = 2.0
+            ip.area = 0.5
+            ip.temp_inf = 7.5
 
     def test_storage_matrix(self):
         expected = (
-            1.5e3 * 2.5 * 0.5 / 6.0
+            1.5e3 * 2.5 * 0.5 * 0.5 / 6.0
             * np.array([[2.0, 1.0], [1.0, 2.0]])
         )
         self.assertTrue(np.allclose(expected, self.e.storage_matrix))
 
+    def test_conduction_matrix(self):
+        expected = (
+            1.2 * 2.0 * 0.5 / 6.0
+            * np.array([[2.0, 1.0], [1.0, 2.0]])
+            + 1.3e6 * 0.5 / 0.5 * np.array([[1.0, -1.0], [-1.0, 1.0]])
+        )
+        self.assertTrue(np.allclose(expected, self.e.conduction_matrix))
+
+    def test_flux_vector(self):
+        expected = 1.2 * 2.0 * 0.5 * 7.5 * np.array([0.5, 0.5])
+        self.assertTrue(np.allclose(expected, self.e.flux_vector))
+
+
+class TestElementOutputBuffers(unittest.TestCase):
+    def setUp(self):
+        self.e = Element(
+            (Node(0, 1.5), Node(1, 2.0), ),
+            order=1,
+        )
+        for ip in self.e.int_pts:
+            ip.thrm_cond = 1.3e6
+            ip.density = 1.5e3
+            ip.spec_heat_cap = 2.5
+            ip.heat_trans_coef = 1.2
+            ip.perimeter = 2.0
+            ip.area = 0.5
+            ip.temp_inf = 7.5
+
+    def test_conduction_matrix_out(self):
+        out = np.zeros((2, 2))
+        result = self.e.compute_conduction_matrix(out=out)
+        self.assertIs(result, out)
+        self.assertTrue(np.allclose(out, self.e.conduction_matrix))
+
+    def test_storage_matrix_out(self):
+        out = np.zeros((2, 2))
+        result = self.e.compute_storage_matrix(out=out)
+        self.assertIs(result, out)
+        self.assertTrue(np.allclose(out, self.e.storage_matrix))
+
+    def test_flux_vector_out(self):
+        out = np.zeros(2)
+        result = self.e.compute_flux_vector(out=out)
+        self.assertIs(result, out)
+        self.assertTrue(np.allclose(out, self.e.flux_vector))
+
+    def test_out_view_of_stacked_buffer(self):
+        buf = np.zeros((3, 2, 2))
+        self.e.compute_conduction_matrix(out=buf[1])
+        self.assertTrue(np.allclose(buf[1], self.e.conduction_matrix))
+        self.assertTrue(np.allclose(buf[0], 0.0))
+
+    def test_invalid_out_shape(self):
+        with self.assertRaises(ValueError):
+            self.e.compute_conduction_matrix(out=np.zeros((3, 3)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.forcing import (
+    TimeSeries,
+)
+from goph420_examples.transient import (
+    EnsembleIntegrator,
+)
+
+
+def _unit_mesh(num_nodes, heat_trans_coef=0.0):
+    mesh = Mesh.from_coords(np.linspace(0.0, 1.0, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = 1.0
+            ip.density = 1.0
+            ip.spec_heat_cap = 1.0
+            ip.perimeter = 1.0
+            ip.area = 1.0
+            ip.heat_trans_coef = heat_trans_coef
+    return mesh
+
+
+class TestEnsembleIntegrator(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = _unit_mesh(41)
+        self.x = self.mesh.coords
+        self.modes = np.column_stack(
+            [np.sin(m * np.pi * self.x) for m in (1, 2, 3)]
+        )
+
+    def test_decay(self):
+        it = EnsembleIntegrator(self.mesh, self.modes, dt=1.0e-4,
+                                fixed=[0, 40], fixed_temps=[0.0, 0.0],
+                                theta=0.5)
+        it.step(500)
+        self.assertAlmostEqual(it.time, 0.05)
+        self.assertEqual(it.step_count, 500)
+        decay = np.exp(-np.array([1, 4, 9]) * np.pi ** 2 * 0.05)
+        self.assertTrue(np.allclose(it.temps, self.modes * decay,
+                                    atol=2e-3))
+
+    def test_matches_single_runs(self):
+        ens = EnsembleIntegrator(self.mesh, self.modes, dt=1.0e-3,
+                                 fixed=[0, 40], fixed_temps=[1.0, 2.0])
+        ens.step(20)
+        for j in range(3):
+            single = EnsembleIntegrator(
+                self.mesh, self.modes[:, [j]], dt=1.0e-3,
+                fixed=[0, 40], fixed_temps=[1.0, 2.0])
+            single.step(20)
+            self.assertTrue(np.allclose(ens.temps[:, j],
+                                        single.temps[:, 0]))
+
+    def test_per_scenario_fixed_temps(self):
+        it = EnsembleIntegrator(self.mesh, np.zeros((41, 2)), dt=0.5,
+                                fixed=[0, 40],
+                                fixed_temps=[[0.0, 1.0], [2.0, 3.0]])
+        it.step(20)
+        self.assertTrue(np.allclose(it.temps[:, 0], 2.0 * self.x))
+        self.assertTrue(np.allclose(it.temps[:, 1], 1.0 + 2.0 * self.x))
+
+    def test_fixed_temps_history(self):
+        ramp = TimeSeries([0.0, 1.0], [[0.0, 0.0], [4.0, -2.0]])
+        it = EnsembleIntegrator(self.mesh, np.zeros((41, 2)), dt=0.05,
+                                fixed=[0, 40], fixed_temps=ramp)
+        it.step(5)
+        self.assertTrue(np.allclose(it.temps[0], 1.0))
+        self.assertTrue(np.allclose(it.temps[-1], -0.5))
+
+    def test_per_scenario_temp_inf(self):
+        mesh = _unit_mesh(41, heat_trans_coef=1.0)
+        temp_inf = TimeSeries([0.0], [[1.0, 3.0]])
+        it = EnsembleIntegrator(mesh, np.zeros((41, 2)), dt=1.0,
+                                temp_inf=temp_inf)
+        it.step(50)
+        self.assertTrue(np.allclose(it.temps[:, 0], 1.0))
+        self.assertTrue(np.allclose(it.temps[:, 1], 3.0))
+
+    def test_shared_source(self):
+        it = EnsembleIntegrator(self.mesh, np.zeros((41, 3)), dt=0.5,
+                                fixed=[0, 40], fixed_temps=[0.0, 0.0],
+                                source=TimeSeries([0.0], [8.0]))
+        it.step(20)
+        expected = 4.0 * self.x * (1.0 - self.x)
+        for j in range(3):
+            self.assertTrue(np.allclose(it.temps[:, j], expected,
+                                        atol=1e-6))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            EnsembleIntegrator(self.mesh, np.zeros(41), dt=1.0)
+        with self.assertRaises(ValueError):
+            EnsembleIntegrator(self.mesh, self.modes, dt=0.0)
+        with self.assertRaises(ValueError):
+            EnsembleIntegrator(self.mesh, self.modes, dt=1.0, theta=0.2)
+        with self.assertRaises(ValueError):
+            EnsembleIntegrator(self.mesh, self.modes, dt=1.0,
+                               fixed=[0, 40], fixed_temps=[[0.0, 1.0]])
+        with self.assertRaises(ValueError):
+            EnsembleIntegrator(self.mesh, self.modes, dt=1.0,
+                               source=TimeSeries([0.0], [[1.0, 2.0]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
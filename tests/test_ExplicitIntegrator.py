@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.assembly import (
+    assemble_storage_matrix,
+    assemble_lumped_storage,
+)
+from goph420_examples.transient import (
+    ExplicitIntegrator,
+)
+
+
+def _unit_mesh(num_nodes):
+    mesh = Mesh.from_coords(np.linspace(0.0, 1.0, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = 1.0
+            ip.density = 1.0
+            ip.spec_heat_cap = 1.0
+            ip.perimeter = 1.0
+            ip.area = 1.0
+    return mesh
+
+
+class TestLumpedStorage(unittest.TestCase):
+
+    def test_row_sums(self):
+        mesh = _unit_mesh(11)
+        C = assemble_storage_matrix(mesh)
+        expected = np.asarray(C.sum(axis=1)).ravel()
+        self.assertTrue(np.allclose(assemble_lumped_storage(mesh), expected))
+
+
+class TestExplicitIntegrator(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = _unit_mesh(51)
+        self.x = self.mesh.coords
+        self.T0 = np.sin(np.pi * self.x)
+
+    def test_stable_dt_euler(self):
+        it = ExplicitIntegrator(self.mesh, [0, 50], [0.0, 0.0])
+        self.assertAlmostEqual(it.stable_dt, 0.5 * 0.02 ** 2)
+
+    def test_default_dt(self):
+        it = ExplicitIntegrator(self.mesh, [0, 50], [0.0, 0.0])
+        self.assertAlmostEqual(it.dt, 0.9 * it.stable_dt)
+
+    def test_decay(self):
+        for method in ("euler", "rk2", "rk4"):
+            it = ExplicitIntegrator(
+                self.mesh, [0, 50], [0.0, 0.0],
+                temps=self.T0, method=method,
+            )
+            it.advance_to(0.05)
+            expected = np.exp(-np.pi ** 2 * 0.05) * self.T0
+            self.assertAlmostEqual(it.time, 0.05)
+            self.assertTrue(np.allclose(it.temps, expected, atol=5e-4))
+
+    def test_fixed_nodes_constant(self):
+        it = ExplicitIntegrator(self.mesh, [0, 50], [2.0, 3.0])
+        it.step(10)
+        self.assertEqual(it.step_count, 10)
+        self.assertEqual(it.temps[0], 2.0)
+        self.assertEqual(it.temps[-1], 3.0)
+
+    def test_steady_state(self):
+        it = ExplicitIntegrator(self.mesh, [0, 50], [2.0, 3.0])
+        it.advance_to(2.0)
+        self.assertTrue(np.allclose(it.temps, 2.0 + self.x, atol=1e-6))
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            ExplicitIntegrator(self.mesh, method="rk3")
+
+    def test_unstable_dt(self):
+        with self.assertRaises(ValueError):
+            ExplicitIntegrator(self.mesh, dt=1.0e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
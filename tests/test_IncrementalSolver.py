@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.assembly import (
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+    apply_dirichlet,
+)
+from goph420_examples.solvers import (
+    IncrementalSolver,
+)
+
+
+def _direct_solve(mesh, fixed, fixed_temps):
+    H = assemble_conduction_matrix(mesh)
+    Q = assemble_flux_vector(mesh)
+    H_ff, Q_f, free = apply_dirichlet(H, Q, fixed, fixed_temps)
+    T = np.zeros(mesh.num_nodes)
+    T[fixed] = fixed_temps
+    T[free] = np.linalg.solve(H_ff.toarray(), Q_f)
+    return T
+
+
+class TestIncrementalSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords(np.linspace(0.0, 5.0, 41))
+        for e in self.mesh.elements:
+            for ip in e.int_pts:
+                ip.thrm_cond = 25.0
+                ip.heat_trans_coef = 2.0
+                ip.perimeter = 1.5
+                ip.area = 0.2
+                ip.temp_inf = 35.0
+        self.fixed = [0, 40]
+        self.fixed_temps = [2.0, 18.0]
+        self.solver = IncrementalSolver(
+            self.mesh, self.fixed, self.fixed_temps, max_rank=100)
+
+    def check(self):
+        expected = _direct_solve(self.mesh, self.fixed, self.fixed_temps)
+        self.assertTrue(np.allclose(self.solver.solve(), expected))
+
+    def test_base_solve(self):
+        self.check()
+
+    def test_interior_update(self):
+        self.solver.update_element(10, thrm_cond=5.0)
+        self.solver.update_element(20, heat_trans_coef=8.0)
+        self.assertEqual(self.solver.rank, 4)
+        self.assertEqual(self.solver.num_factorizations, 1)
+        self.check()
+
+    def test_boundary_update(self):
+        self.solver.update_element(0, thrm_cond=3.0, heat_trans_coef=0.5)
+        self.solver.update_element(39, temp_inf=-5.0)
+        self.assertEqual(self.solver.rank, 2)
+        self.check()
+
+    def test_repeated_update(self):
+        self.solver.update_element(5, thrm_cond=3.0)
+        self.solver.solve()
+        self.solver.update_element(5, thrm_cond=40.0)
+        self.solver.update_element(6, thrm_cond=40.0)
+        self.assertEqual(self.solver.rank, 3)
+        self.check()
+
+    def test_new_fixed_temps(self):
+        self.solver.update_element(5, thrm_cond=3.0)
+        self.fixed_temps = [-1.0, 4.0]
+        expected = _direct_solve(self.mesh, self.fixed, self.fixed_temps)
+        T = self.solver.solve(self.fixed_temps)
+        self.assertTrue(np.allclose(T, expected))
+
+    def test_automatic_refactor(self):
+        solver = IncrementalSolver(
+            self.mesh, self.fixed, self.fixed_temps, max_rank=3)
+        solver.update_element(10, thrm_cond=5.0)
+        solver.update_element(20, thrm_cond=5.0)
+        self.assertEqual(solver.num_factorizations, 2)
+        self.assertEqual(solver.rank, 0)
+        expected = _direct_solve(self.mesh, self.fixed, self.fixed_temps)
+        self.assertTrue(np.allclose(solver.solve(), expected))
+
+    def test_default_max_rank(self):
+        # a single element change takes the low-rank path
+        solver = IncrementalSolver(self.mesh, self.fixed, self.fixed_temps)
+        self.assertGreaterEqual(solver.max_rank, 32)
+        solver.update_element(10, thrm_cond=5.0)
+        self.assertEqual(solver.rank, 2)
+        self.assertEqual(solver.num_factorizations, 1)
+        expected = _direct_solve(self.mesh, self.fixed, self.fixed_temps)
+        self.assertTrue(np.allclose(solver.solve(), expected))
+
+    def test_timed_max_rank(self):
+        solver = IncrementalSolver(
+            self.mesh, self.fixed, self.fixed_temps, max_rank="timed")
+        self.assertIsInstance(solver.max_rank, int)
+        self.assertGreaterEqual(solver.max_rank, 32)
+
+    def test_invalid_max_rank(self):
+        with self.assertRaises(ValueError):
+            IncrementalSolver(
+                self.mesh, self.fixed, self.fixed_temps, max_rank="fast")
+
+    def test_invalid_property(self):
+        with self.assertRaises(ValueError):
+            self.solver.update_element(3, thrm_cond=-1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.operators import (
+    IntegrationPointTransfer,
+)
+
+
+class TestIntegrationPointTransfer(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords([0.0, 1.0, 3.0, 4.0, 4.5])
+        self.transfer = IntegrationPointTransfer(self.mesh)
+        self.temps = 2.0 * self.mesh.coords - 1.0
+
+    def test_interpolation_matrix_shape(self):
+        self.assertEqual(self.transfer.interpolation_matrix.shape, (4, 5))
+
+    def test_to_int_pts(self):
+        values = self.transfer.to_int_pts(self.temps)
+        expected = 2.0 * np.array([[0.5], [2.0], [3.5], [4.25]]) - 1.0
+        self.assertTrue(np.allclose(values, expected))
+
+    def test_to_nodes_constant(self):
+        values = self.transfer.to_nodes(np.full((4, 1), 3.0))
+        self.assertTrue(np.allclose(values, 3.0))
+
+    def test_to_nodes_preserves_integral(self):
+        v = np.array([[1.0], [-2.0], [0.5], [4.0]])
+        u = self.transfer.to_nodes(v)
+        # integral of the projected field equals that of v
+        ip = self.transfer.to_int_pts(u)
+        jac = self.mesh.jacobians
+        self.assertAlmostEqual(ip.ravel() @ jac, v.ravel() @ jac)
+
+    def test_update_int_pt_temps(self):
+        self.transfer.update_int_pt_temps(self.temps)
+        temps = self.mesh.int_pt_values("temp")
+        self.assertTrue(np.allclose(
+            temps, self.transfer.to_int_pts(self.temps)))
+
+
+if __name__ == "__main__":
+    unittest.main()
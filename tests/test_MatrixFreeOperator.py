@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.assembly import (
+    assemble_conduction_matrix,
+    assemble_storage_matrix,
+    assemble_flux_vector,
+    apply_dirichlet,
+)
+from goph420_examples.operators import (
+    MatrixFreeOperator,
+)
+from goph420_examples.solvers import (
+    ConjugateGradientSolver,
+)
+
+
+class TestMatrixFreeOperator(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords(np.linspace(0.0, 3.0, 12) ** 1.5)
+        for k, e in enumerate(self.mesh.elements):
+            for ip in e.int_pts:
+                ip.thrm_cond = 2.0 + k
+                ip.density = 1.5
+                ip.spec_heat_cap = 4.0 + 0.1 * k
+                ip.heat_trans_coef = 0.7
+                ip.perimeter = 1.2
+                ip.area = 0.3
+                ip.temp_inf = 5.0
+        self.H = assemble_conduction_matrix(self.mesh)
+        self.C = assemble_storage_matrix(self.mesh)
+        self.u = np.cos(self.mesh.coords)
+
+    def test_is_linear_operator(self):
+        op = MatrixFreeOperator.conduction(self.mesh)
+        self.assertIsInstance(op, LinearOperator)
+        self.assertEqual(op.shape, (12, 12))
+
+    def test_conduction_matvec(self):
+        op = MatrixFreeOperator.conduction(self.mesh)
+        self.assertTrue(np.allclose(op @ self.u, self.H @ self.u))
+
+    def test_storage_matvec(self):
+        op = MatrixFreeOperator.storage(self.mesh)
+        self.assertTrue(np.allclose(op @ self.u, self.C @ self.u))
+
+    def test_matmat(self):
+        op = MatrixFreeOperator.conduction(self.mesh)
+        U = np.stack([self.u, self.u ** 2], axis=1)
+        self.assertTrue(np.allclose(op @ U, self.H @ U))
+
+    def test_diagonal(self):
+        op = MatrixFreeOperator.conduction(self.mesh)
+        self.assertTrue(np.allclose(op.diagonal(), self.H.diagonal()))
+
+    def test_free_subset(self):
+        free = np.arange(1, 11)
+        op = MatrixFreeOperator.conduction(self.mesh, free=free)
+        H_ff = self.H[free][:, free]
+        self.assertEqual(op.shape, (10, 10))
+        self.assertTrue(np.allclose(op @ self.u[free], H_ff @ self.u[free]))
+        self.assertTrue(np.allclose(op.diagonal(), H_ff.diagonal()))
+
+    def test_cg_solve(self):
+        Q = assemble_flux_vector(self.mesh)
+        H_ff, Q_f, free = apply_dirichlet(self.H, Q, [0, 11], [1.0, 3.0])
+        op = MatrixFreeOperator.conduction(self.mesh, free=free)
+        solver = ConjugateGradientSolver(op, preconditioner="jacobi")
+        x = solver.solve(Q_f)
+        expected = np.linalg.solve(H_ff.toarray(), Q_f)
+        self.assertTrue(np.allclose(x, expected))
+
+    def test_invalid_coef_shape(self):
+        with self.assertRaises(ValueError):
+            MatrixFreeOperator(self.mesh, np.ones(3), np.ones(11))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.classes import (
+    Node,
+    Element,
+)
+from goph420_examples.mesh import (
+    Mesh,
+    PipeSegment,
+)
+from goph420_examples.assembly import (
+    assemble_conduction_matrix,
+    apply_dirichlet,
+)
+from goph420_examples.postprocess import (
+    temperature_gradients,
+)
+
+
+class TestMeshFromCoords(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.array([0.0, 0.5, 1.5, 3.0])
+        self.mesh = Mesh.from_coords(self.x)
+
+    def test_num_nodes(self):
+        self.assertEqual(self.mesh.num_nodes, 4)
+
+    def test_num_elements(self):
+        self.assertEqual(self.mesh.num_elements, 3)
+
+    def test_coords(self):
+        self.assertTrue(np.allclose(self.mesh.coords, self.x))
+
+    def test_connectivity(self):
+        expected = np.array([[0, 1], [1, 2], [2, 3]])
+        self.assertTrue(np.array_equal(self.mesh.connectivity, expected))
+
+    def test_jacobians(self):
+        self.assertTrue(np.allclose(self.mesh.jacobians, [0.5, 1.0, 1.5]))
+
+    def test_coords_read_only(self):
+        with self.assertRaises(ValueError):
+            self.mesh.coords[0] = 1.0
+
+    def test_int_pt_values(self):
+        for k, e in enumerate(self.mesh.elements):
+            e.int_pts[0].thrm_cond = k + 1.0
+        values = self.mesh.int_pt_values("thrm_cond")
+        self.assertEqual(values.shape, (3, 1))
+        self.assertTrue(np.allclose(values[:, 0], [1.0, 2.0, 3.0]))
+
+    def test_revision(self):
+        other = Mesh.from_coords(self.x)
+        revision = self.mesh.revision
+        other_revision = other.revision
+        self.mesh.elements[1].int_pts[0].thrm_cond = 2.0
+        changed = self.mesh.revision
+        self.assertNotEqual(changed, revision)
+        self.mesh.set_int_pt_values("area", 3.0)
+        self.assertNotEqual(self.mesh.revision, changed)
+        # temperatures do not change the revision, nor other meshes
+        changed = self.mesh.revision
+        self.mesh.set_int_pt_values("temp", 5.0)
+        self.assertEqual(self.mesh.revision, changed)
+        self.assertEqual(other.revision, other_revision)
+
+    def test_dtype(self):
+        mesh = Mesh.from_coords(self.x, dtype=np.float32)
+        self.assertEqual(mesh.dtype, np.float32)
+        self.assertEqual(mesh.coords.dtype, np.float32)
+        self.assertEqual(mesh.jacobians.dtype, np.float32)
+        self.assertEqual(mesh.int_pt_values("temp").dtype, np.float32)
+
+    def test_invalid_dtype(self):
+        with self.assertRaises(ValueError):
+            Mesh.from_coords(self.x, dtype=int)
+
+    def test_invalid_decreasing(self):
+        with self.assertRaises(ValueError):
+            Mesh.from_coords([0.0, 2.0, 1.0])
+
+
+class TestMeshInvalidInitializers(unittest.TestCase):
+
+    def setUp(self):
+        self.nodes = (Node(0, 0.0), Node(1, 1.0))
+        self.elements = (Element(self.nodes, order=1),)
+
+    def test_unsorted_nodes(self):
+        mesh = Mesh(self.nodes[::-1], self.elements)
+        self.assertIs(mesh.nodes[0], self.nodes[0])
+
+    def test_invalid_nodes(self):
+        with self.assertRaises(TypeError):
+            Mesh((0, 1), self.elements)
+
+    def test_invalid_elements(self):
+        with self.assertRaises(TypeError):
+            Mesh(self.nodes, (1,))
+
+    def test_missing_index(self):
+        with self.assertRaises(ValueError):
+            Mesh((Node(0, 0.0), Node(2, 1.0)), ())
+
+    def test_foreign_node(self):
+        other = (Node(0, 0.0), Node(1, 1.0))
+        with self.assertRaises(ValueError):
+            Mesh(self.nodes, (Element(other, order=1),))
+
+
+class TestMeshFromNetwork(unittest.TestCase):
+
+    def setUp(self):
+        # a loop of three pipes with a branch off junction 1
+        self.segments = (
+            PipeSegment(0, 1, 10.0, 20, 1.0, 0.1),
+            PipeSegment(1, 2, 5.0, 10, 0.5, 0.02),
+            PipeSegment(2, 0, 4.0, 8, 0.5, 0.02),
+            PipeSegment(1, 3, 6.0, 12, 0.3, 0.01),
+        )
+        self.mesh = Mesh.from_network(self.segments)
+
+    def test_num_nodes(self):
+        # 4 junctions plus interior nodes of each pipe
+        self.assertEqual(self.mesh.num_nodes, 4 + 19 + 9 + 7 + 11)
+
+    def test_num_elements(self):
+        self.assertEqual(self.mesh.num_elements, 50)
+
+    def test_total_length(self):
+        self.assertAlmostEqual(self.mesh.jacobians.sum(), 25.0)
+
+    def test_junction_shared(self):
+        # junction 1 joins three pipes
+        counts = np.bincount(self.mesh.connectivity.ravel())
+        self.assertEqual(counts.max(), 3)
+        self.assertEqual(np.sum(counts == 1), 1)
+
+    def test_segment_properties(self):
+        areas = self.mesh.int_pt_values("area")[:, 0]
+        self.assertEqual(np.sum(areas == 0.1), 20)
+        self.assertEqual(np.sum(areas == 0.01), 12)
+
+    def test_reorder_bandwidth(self):
+        unordered = Mesh.from_network(self.segments, reorder=False)
+        self.assertLess(self.mesh.bandwidth, unordered.bandwidth)
+        self.assertLessEqual(self.mesh.bandwidth, 4)
+
+    def test_same_system_after_reorder(self):
+        unordered = Mesh.from_network(self.segments, reorder=False)
+        for mesh in (self.mesh, unordered):
+            for e in mesh.elements:
+                e.int_pts[0].thrm_cond = 2.0
+        H = assemble_conduction_matrix(self.mesh).toarray()
+        H0 = assemble_conduction_matrix(unordered).toarray()
+        self.assertTrue(np.allclose(
+            np.linalg.eigvalsh(H), np.linalg.eigvalsh(H0)))
+
+    def test_junction_conserves_heat(self):
+        # two pipes in series, areas 1 and 4, no convection
+        mesh = Mesh.from_network((
+            PipeSegment(0, 1, 1.0, 4, 0.0, 1.0),
+            PipeSegment(1, 2, 1.0, 4, 0.0, 4.0),
+        ), reorder=False)
+        for e in mesh.elements:
+            e.int_pts[0].thrm_cond = 2.0
+        H = assemble_conduction_matrix(mesh)
+        H_ff, Q_f, free = apply_dirichlet(
+            H, np.zeros(mesh.num_nodes), [0, 2], [0.0, 1.0])
+        T = np.zeros(mesh.num_nodes)
+        T[2] = 1.0
+        T[free] = np.linalg.solve(H_ff.toarray(), Q_f)
+        # series thermal resistances 1 / (2 * 1) and 1 / (2 * 4)
+        self.assertAlmostEqual(T[1], 0.8)
+        # the same k * A * dT/dx flows through every element
+        k = mesh.int_pt_values("thrm_cond")[:, 0]
+        A = mesh.int_pt_values("area")[:, 0]
+        flow = k * A * temperature_gradients(mesh, T)[:, 0]
+        self.assertTrue(np.allclose(flow, 1.6))
+
+    def test_invalid_loop_pipe(self):
+        with self.assertRaises(ValueError):
+            Mesh.from_network((PipeSegment(0, 0, 1.0, 2),))
+
+    def test_invalid_unused_junction(self):
+        with self.assertRaises(ValueError):
+            Mesh.from_network((PipeSegment(0, 2, 1.0, 2),))
+
+
+if __name__ == "__main__":
+    unittest.main()
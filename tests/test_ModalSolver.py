@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.transient import (
+    EnsembleIntegrator,
+)
+from goph420_examples.modal import (
+    ModalSolver,
+)
+
+
+def _unit_mesh(num_nodes, heat_trans_coef=0.0):
+    mesh = Mesh.from_coords(np.linspace(0.0, 1.0, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = 1.0
+            ip.density = 1.0
+            ip.spec_heat_cap = 1.0
+            ip.perimeter = 1.0
+            ip.area = 1.0
+            ip.heat_trans_coef = heat_trans_coef
+            ip.temp_inf = 5.0
+    return mesh
+
+
+class TestModalSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = _unit_mesh(101)
+        self.x = self.mesh.coords
+
+    def test_eigenvalues(self):
+        solver = ModalSolver(self.mesh, np.zeros(101), [0, 100],
+                             [0.0, 0.0], num_modes=3)
+        expected = (np.array([1, 2, 3]) * np.pi) ** 2
+        self.assertTrue(np.allclose(solver.eigenvalues, expected,
+                                    rtol=1e-3))
+        self.assertTrue(np.allclose(solver.time_constants,
+                                    1.0 / solver.eigenvalues))
+
+    def test_sparse_eigenvalues(self):
+        mesh = _unit_mesh(401)
+        solver = ModalSolver(mesh, np.zeros(401), [0, 400], [0.0, 0.0],
+                             num_modes=4)
+        expected = (np.arange(1, 5) * np.pi) ** 2
+        self.assertTrue(np.allclose(solver.eigenvalues, expected,
+                                    rtol=1e-3))
+
+    def test_single_mode_decay(self):
+        T0 = np.sin(np.pi * self.x)
+        solver = ModalSolver(self.mesh, T0, [0, 100], [0.0, 0.0])
+        times = np.array([0.0, 0.01, 0.1])
+        temps = solver.evaluate(times)
+        self.assertEqual(temps.shape, (3, 101))
+        for t, T in zip(times, temps):
+            self.assertTrue(np.allclose(
+                T, np.exp(-np.pi ** 2 * t) * T0, atol=1e-3))
+
+    def test_steady_state(self):
+        solver = ModalSolver(self.mesh, np.zeros(101), [0, 100],
+                             [1.0, 3.0])
+        self.assertTrue(np.allclose(solver.steady_state, 1.0 + 2.0 * self.x))
+        self.assertTrue(np.allclose(solver.evaluate(100.0),
+                                    solver.steady_state))
+
+    def test_matches_time_stepping(self):
+        mesh = _unit_mesh(101, heat_trans_coef=2.0)
+        T0 = np.full(101, 10.0)
+        solver = ModalSolver(mesh, T0, [0, 100], [10.0, 0.0],
+                             num_modes=100)
+        self.assertAlmostEqual(solver.truncation_error, 0.0)
+        it = EnsembleIntegrator(mesh, T0[:, None], 1.0e-4, [0, 100],
+                                [10.0, 0.0], theta=0.5)
+        it.step(500)
+        self.assertTrue(np.allclose(solver.evaluate(0.05), it.temps[:, 0],
+                                    atol=1e-3))
+
+    def test_truncation_error(self):
+        T0 = np.sin(np.pi * self.x) + np.sin(7.0 * np.pi * self.x)
+        solver = ModalSolver(self.mesh, T0, [0, 100], [0.0, 0.0],
+                             num_modes=3)
+        self.assertAlmostEqual(solver.truncation_error, np.sqrt(0.5),
+                               places=2)
+
+    def test_initial_time(self):
+        T0 = np.sin(np.pi * self.x)
+        solver = ModalSolver(self.mesh, T0, [0, 100], [0.0, 0.0],
+                             time=5.0)
+        self.assertTrue(np.allclose(solver.evaluate(5.0), T0, atol=1e-3))
+        with self.assertRaises(ValueError):
+            solver.evaluate(4.0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ModalSolver(self.mesh, np.zeros(101), num_modes=0)
+        with self.assertRaises(ValueError):
+            ModalSolver(self.mesh, np.zeros(101), [0, 100], [0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
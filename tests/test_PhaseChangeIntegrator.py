@@ -0,0 +1,133 @@
+import unittest
+import warnings
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.transient import (
+    EnsembleIntegrator,
+)
+from goph420_examples.phase_change import (
+    PhaseChangeIntegrator,
+    liquid_fraction,
+    phase_change_density,
+)
+
+
+def _soil_mesh(num_nodes):
+    mesh = Mesh.from_coords(np.linspace(0.0, 1.0, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = 1.5
+            ip.density = 1800.0
+            ip.spec_heat_cap = 1000.0
+            ip.perimeter = 1.0
+            ip.area = 1.0
+    return mesh
+
+
+class TestLiquidFraction(unittest.TestCase):
+
+    def test_limits(self):
+        f = liquid_fraction([-2.0, -1.0, 0.0, 1.0, 2.0], 0.0, 1.0)
+        self.assertTrue(np.allclose(f, [0.0, 0.0, 0.5, 1.0, 1.0]))
+
+    def test_derivative(self):
+        T = np.linspace(-1.5, 1.5, 31)
+        h = 1.0e-6
+        numeric = (liquid_fraction(T + h, 0.2, 0.5)
+                   - liquid_fraction(T - h, 0.2, 0.5)) / (2.0 * h)
+        self.assertTrue(np.allclose(phase_change_density(T, 0.2, 0.5),
+                                    numeric, atol=1e-6))
+
+    def test_density_integral(self):
+        T = np.linspace(-2.0, 2.0, 40001)
+        g = phase_change_density(T, 0.0, 0.5)
+        self.assertAlmostEqual(np.trapezoid(g, T), 1.0, places=6)
+
+
+class TestPhaseChangeIntegrator(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = _soil_mesh(51)
+        self.T0 = np.full(51, 5.0)
+
+    def _freeze(self, latent_heat, **kwargs):
+        it = PhaseChangeIntegrator(
+            self.mesh, 3600.0, latent_heat, melt_temp=0.0,
+            half_width=0.5, fixed=[0], fixed_temps=[-10.0],
+            temps=self.T0, **kwargs,
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            it.step(48)
+        return it
+
+    def test_no_latent_heat_is_linear(self):
+        it = self._freeze(0.0)
+        ens = EnsembleIntegrator(self.mesh, self.T0[:, None], 3600.0,
+                                 [0], [-10.0])
+        ens.step(48)
+        self.assertTrue(np.allclose(it.temps, ens.temps[:, 0]))
+        self.assertEqual(it.stats.num_band_elements, 0)
+
+    def test_latent_heat_delays_freezing(self):
+        sensible = self._freeze(0.0)
+        latent = self._freeze(1.0e5)
+        self.assertTrue(latent.stats.converged)
+        self.assertTrue(np.all(latent.temps[1:] > sensible.temps[1:]))
+        frozen = latent.liquid_fraction < 0.5
+        self.assertTrue(0 < frozen.sum() < frozen.size)
+
+    def test_energy_conserved(self):
+        T0 = np.where(self.mesh.coords < 0.5, -3.0, 3.0)
+        it = PhaseChangeIntegrator(self.mesh, 3600.0, 3.0e5, 0.0, 0.5,
+                                   temps=T0, tol=1e-10)
+        E0 = it.enthalpy()
+        it.step(24)
+        self.assertTrue(it.stats.converged)
+        self.assertGreater(it.stats.num_band_elements, 0)
+        self.assertAlmostEqual(it.enthalpy() / E0, 1.0, places=10)
+
+    def test_band_elements_only(self):
+        T0 = np.where(self.mesh.coords < 0.5, -3.0, 3.0)
+        it = PhaseChangeIntegrator(self.mesh, 1.0, 3.0e5, 0.0, 0.5,
+                                   temps=T0)
+        it.step()
+        self.assertEqual(it.stats.num_band_elements, 1)
+
+    def test_low_rank_matches_factorization(self):
+        low_rank = self._freeze(1.0e5, tol=1e-10)
+        factorized = self._freeze(1.0e5, tol=1e-10, max_rank=0)
+        self.assertTrue(np.allclose(low_rank.temps, factorized.temps,
+                                    rtol=0.0, atol=1e-8))
+
+    def test_not_converged_warns(self):
+        it = PhaseChangeIntegrator(
+            self.mesh, 3600.0, 1.0e5, 0.0, 0.5, fixed=[0],
+            fixed_temps=[-10.0], temps=self.T0, max_iter=1)
+        with self.assertWarns(RuntimeWarning):
+            it.step()
+        self.assertFalse(it.stats.converged)
+
+    def test_int_pt_temps(self):
+        it = PhaseChangeIntegrator(self.mesh, 1.0, 1.0e5, 0.0, 0.5,
+                                   temps=self.mesh.coords)
+        self.assertEqual(it.int_pt_temps.shape, (50, 1))
+        mid = 0.5 * (self.mesh.coords[:-1] + self.mesh.coords[1:])
+        self.assertTrue(np.allclose(it.int_pt_temps[:, 0], mid))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            PhaseChangeIntegrator(self.mesh, 0.0, 1.0e5, 0.0, 0.5)
+        with self.assertRaises(ValueError):
+            PhaseChangeIntegrator(self.mesh, 1.0, 1.0e5, 0.0, 0.0)
+        with self.assertRaises(ValueError):
+            PhaseChangeIntegrator(self.mesh, 1.0, 1.0e5, 0.0, 0.5,
+                                  fixed=[0], fixed_temps=[1.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.interpolation import (
+    PiecewiseInterpolator,
+)
+
+
+class TestPiecewiseInterpolator(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.linspace(-5.0, 5.0, 13)
+        self.y = np.exp(self.x)
+
+    def test_reproduces_data(self):
+        for order in (1, 2, 3):
+            f = PiecewiseInterpolator(self.x, self.y, order=order)
+            self.assertTrue(np.allclose(f(self.x), self.y))
+
+    def test_linear(self):
+        f = PiecewiseInterpolator(self.x, self.y)
+        xq = np.linspace(-5.0, 5.0, 97)
+        self.assertTrue(np.allclose(f(xq), np.interp(xq, self.x, self.y)))
+
+    def test_exact_for_polynomials(self):
+        x = np.sort(np.random.default_rng(0).uniform(0.0, 2.0, 13))
+        xq = np.linspace(x[0], x[-1], 50)
+        for order in (1, 2, 3):
+            poly = np.polynomial.Polynomial(np.arange(1.0, order + 2.0))
+            f = PiecewiseInterpolator(x, poly(x), order=order)
+            self.assertTrue(np.allclose(f(xq), poly(xq)))
+
+    def test_higher_order_more_accurate(self):
+        xq = np.linspace(-5.0, 5.0, 200)
+        errors = [
+            np.abs(PiecewiseInterpolator(self.x, self.y, order=p)(xq)
+                   - np.exp(xq)).max()
+            for p in (1, 2, 3)
+        ]
+        self.assertTrue(errors[0] > errors[1] > errors[2])
+
+    def test_sorted_fast_path(self):
+        xq = np.linspace(-6.0, 6.0, 301)
+        for order in (1, 2, 3):
+            f = PiecewiseInterpolator(self.x, self.y, order=order,
+                                      extrapolate=True)
+            self.assertTrue(np.allclose(f(xq, assume_sorted=True), f(xq),
+                                        equal_nan=True))
+
+    def test_outside(self):
+        f = PiecewiseInterpolator(self.x, self.y)
+        self.assertTrue(np.isnan(f(-6.0)))
+        self.assertTrue(np.isnan(f(6.0)))
+        g = PiecewiseInterpolator(self.x, self.x, extrapolate=True)
+        self.assertAlmostEqual(g(6.0), 6.0)
+
+    def test_shape(self):
+        f = PiecewiseInterpolator(self.x, self.y)
+        self.assertIsInstance(f(0.0), float)
+        self.assertEqual(f(np.zeros((3, 4))).shape, (3, 4))
+        self.assertEqual(f.coefficients.shape, (12, 2))
+        self.assertEqual(len(f.breakpoints), 13)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            PiecewiseInterpolator(self.x, self.y, order=4)
+        with self.assertRaises(ValueError):
+            PiecewiseInterpolator(self.x[::-1], self.y)
+        with self.assertRaises(ValueError):
+            PiecewiseInterpolator(self.x, self.y[:-1])
+        with self.assertRaises(ValueError):
+            PiecewiseInterpolator(self.x[:12], self.y[:12], order=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
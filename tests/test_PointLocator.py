@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+    PipeSegment,
+    PointLocator,
+)
+
+
+class TestPointLocator(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.array([0.0, 0.5, 1.5, 3.0, 3.25])
+        self.mesh = Mesh.from_coords(self.x)
+        self.locator = self.mesh.locator
+
+    def test_cached(self):
+        self.assertIs(self.mesh.locator, self.locator)
+
+    def test_locate_interior(self):
+        ids, s = self.locator.locate([0.25, 1.0, 2.625])
+        self.assertTrue(np.array_equal(ids, [0, 1, 2]))
+        self.assertTrue(np.allclose(s, [0.5, 0.5, 0.75]))
+
+    def test_locate_nodes(self):
+        ids, s = self.locator.locate(self.x)
+        self.assertTrue(np.array_equal(ids, [0, 1, 2, 3, 3]))
+        self.assertTrue(np.allclose(s, [0.0, 0.0, 0.0, 0.0, 1.0]))
+
+    def test_locate_outside(self):
+        ids, s = self.locator.locate([-0.1, 3.5])
+        self.assertTrue(np.array_equal(ids, [-1, -1]))
+        self.assertTrue(np.all(np.isnan(s)))
+
+    def test_probe_linear_field(self):
+        field = 2.0 * self.x + 1.0
+        xs = np.linspace(0.0, 3.25, 101)
+        values = self.locator.probe(field, xs)
+        self.assertTrue(np.allclose(values, 2.0 * xs + 1.0))
+
+    def test_probe_outside(self):
+        values = self.locator.probe(self.x, [4.0])
+        self.assertTrue(np.isnan(values[0]))
+
+    def test_probe_matrix(self):
+        field = np.sin(self.x)
+        xs = np.array([0.1, 2.0, 3.2, 5.0])
+        P = self.locator.probe_matrix(xs)
+        self.assertEqual(P.shape, (4, 5))
+        self.assertTrue(np.allclose(
+            P[:3] @ field, self.locator.probe(field, xs[:3])))
+        self.assertEqual(P[3].nnz, 0)
+
+    def test_scalar_input(self):
+        ids, _ = self.locator.locate(1.0)
+        self.assertEqual(ids.shape, (1,))
+
+    def test_overlapping_elements(self):
+        mesh = Mesh.from_network((
+            PipeSegment(0, 1, 1.0, 2),
+            PipeSegment(0, 2, 1.0, 2),
+        ))
+        with self.assertRaises(ValueError):
+            PointLocator(mesh)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.forcing import (
+    TimeSeries,
+)
+from goph420_examples.transient import (
+    EnsembleIntegrator,
+)
+from goph420_examples.reduced import (
+    ReducedModel,
+    collect_snapshots,
+    pod_basis,
+)
+
+DT = 0.01
+
+
+def _unit_mesh(num_nodes):
+    mesh = Mesh.from_coords(np.linspace(0.0, 1.0, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = 1.0
+            ip.density = 1.0
+            ip.spec_heat_cap = 1.0
+            ip.perimeter = 1.0
+            ip.area = 1.0
+            ip.heat_trans_coef = 2.0
+    return mesh
+
+
+class TestPODBasis(unittest.TestCase):
+
+    def test_low_rank(self):
+        rng = np.random.default_rng(0)
+        snapshots = rng.normal(size=(50, 3)) @ rng.normal(size=(3, 20))
+        basis, S = pod_basis(snapshots)
+        self.assertEqual(basis.shape, (50, 3))
+        self.assertTrue(np.allclose(basis.T @ basis, np.eye(3)))
+        self.assertTrue(np.allclose(basis @ (basis.T @ snapshots),
+                                    snapshots))
+
+    def test_max_rank(self):
+        rng = np.random.default_rng(1)
+        basis, _ = pod_basis(rng.normal(size=(30, 10)), max_rank=4)
+        self.assertEqual(basis.shape, (30, 4))
+
+    def test_zero_snapshots(self):
+        with self.assertRaises(ValueError):
+            pod_basis(np.zeros((5, 3)))
+
+
+class TestReducedModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mesh = _unit_mesh(101)
+        # responses to each end temperature and the ambient
+        # temperature from a cold start span all such runs
+        training = np.array([[1.0, 0.0, 0.0],
+                             [0.0, 1.0, 0.0],
+                             [0.0, 0.0, 1.0]])
+        it = EnsembleIntegrator(
+            cls.mesh, np.zeros((101, 3)), DT, [0, 100], training[:2],
+            temp_inf=TimeSeries([0.0], [training[2]]),
+        )
+        cls.snapshots = collect_snapshots(it, 100)
+        cls.rom = ReducedModel(cls.mesh, cls.snapshots, DT, [0, 100],
+                               tol=1e-12)
+
+    def _full(self, temps, num_steps, fixed_temps, temp_inf):
+        it = EnsembleIntegrator(self.mesh, temps[:, None], DT, [0, 100],
+                                fixed_temps, temp_inf=temp_inf)
+        return it.step(num_steps)[:, 0]
+
+    def test_snapshot_shape(self):
+        self.assertEqual(self.snapshots.shape, (101, 303))
+
+    def test_rank_reduced(self):
+        self.assertLess(self.rom.rank, 60)
+
+    def test_in_range(self):
+        temp_inf = TimeSeries([0.0], [3.0])
+        result = self.rom.run(np.zeros(101), 50, [2.0, -1.0],
+                              temp_inf=temp_inf)
+        self.assertFalse(result.full_solve)
+        self.assertLess(result.error_indicator, self.rom.max_error)
+        self.assertEqual(result.coefs.shape, (51, self.rom.rank))
+        expected = self._full(np.zeros(101), 50, [2.0, -1.0], temp_inf)
+        self.assertTrue(np.allclose(result.temps, expected, atol=1e-5))
+
+    def test_out_of_range_falls_back(self):
+        x = self.mesh.coords
+        temps = np.sin(40.0 * np.pi * x)
+        result = self.rom.run(temps, 10, [0.0, 0.0])
+        self.assertTrue(result.full_solve)
+        self.assertGreater(result.error_indicator, self.rom.max_error)
+        expected = self._full(temps, 10, [0.0, 0.0], None)
+        self.assertTrue(np.allclose(result.temps, expected))
+
+    def test_no_fallback(self):
+        temps = np.sin(40.0 * np.pi * self.mesh.coords)
+        result = self.rom.run(temps, 10, [0.0, 0.0], fallback=False)
+        self.assertFalse(result.full_solve)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ReducedModel(self.mesh, self.snapshots[:50], DT)
+        with self.assertRaises(ValueError):
+            ReducedModel(self.mesh, self.snapshots, 0.0)
+        with self.assertRaises(ValueError):
+            self.rom.run(np.zeros(101), 1, [0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.solvers import (
+    SteadyStateSolver,
+    TriangularFactors,
+)
+from goph420_examples.cache import (
+    SolutionCache,
+)
+
+
+def _pipe_mesh(num_nodes, thrm_cond=25.0):
+    mesh = Mesh.from_coords(np.linspace(0.0, 5.0, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = thrm_cond
+            ip.heat_trans_coef = 2.0
+            ip.perimeter = 1.5
+            ip.area = 0.2
+            ip.temp_inf = 35.0
+    return mesh
+
+
+class TestTriangularFactors(unittest.TestCase):
+
+    def setUp(self):
+        mesh = _pipe_mesh(21)
+        self.solver = SteadyStateSolver(mesh, [0, 20])
+        self.factors = TriangularFactors.from_superlu(
+            self.solver.factorization)
+        self.b = np.linspace(1.0, 2.0, 19)
+
+    def test_solve(self):
+        self.assertTrue(np.allclose(
+            self.factors.solve(self.b),
+            self.solver.factorization.solve(self.b)))
+
+    def test_solve_transpose(self):
+        self.assertTrue(np.allclose(
+            self.factors.solve(self.b, trans="T"),
+            self.solver.factorization.solve(self.b, trans="T")))
+
+    def test_multiple_rhs(self):
+        B = np.column_stack([self.b, 2.0 * self.b])
+        self.assertTrue(np.allclose(
+            self.factors.solve(B),
+            self.solver.factorization.solve(B)))
+
+
+class TestSolutionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = SolutionCache(self.tmp.name)
+        self.expected = SteadyStateSolver(
+            _pipe_mesh(51), [0, 50]).solve([2.0, 18.0])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_miss_then_hit(self):
+        T = self.cache.solve(_pipe_mesh(51), [0, 50], [2.0, 18.0])
+        self.assertTrue(np.allclose(T, self.expected))
+        self.assertEqual(self.cache.num_misses, 1)
+        T = self.cache.solve(_pipe_mesh(51), [0, 50], [2.0, 18.0])
+        self.assertTrue(np.array_equal(T, self.expected))
+        self.assertEqual(self.cache.num_hits, 1)
+
+    def test_persistent(self):
+        self.cache.solve(_pipe_mesh(51), [0, 50], [2.0, 18.0])
+        cache = SolutionCache(self.tmp.name)
+        cache.solve(_pipe_mesh(51), [0, 50], [2.0, 18.0])
+        self.assertEqual(cache.num_hits, 1)
+
+    def test_near_repeat_reuses_factorization(self):
+        self.cache.solve(_pipe_mesh(51), [0, 50], [0.0, 0.0])
+        T = self.cache.solve(_pipe_mesh(51), [0, 50], [2.0, 18.0])
+        self.assertTrue(np.allclose(T, self.expected))
+        self.assertEqual(self.cache.num_factor_hits, 1)
+        self.assertEqual(self.cache.num_misses, 1)
+
+    def test_cached_solver(self):
+        self.cache.solver(_pipe_mesh(51), [0, 50])
+        solver = self.cache.solver(_pipe_mesh(51), [0, 50])
+        self.assertIsInstance(solver.factorization, TriangularFactors)
+        self.assertTrue(np.allclose(solver.solve([2.0, 18.0]),
+                                    self.expected))
+
+    def test_changed_property_misses(self):
+        self.cache.solve(_pipe_mesh(51), [0, 50], [2.0, 18.0])
+        self.cache.solve(_pipe_mesh(51, thrm_cond=30.0), [0, 50],
+                         [2.0, 18.0])
+        self.assertEqual(self.cache.num_hits, 0)
+        self.assertEqual(self.cache.num_misses, 2)
+
+    def test_changed_property_same_mesh_misses(self):
+        mesh = _pipe_mesh(51)
+        self.cache.solve(mesh, [0, 50], [2.0, 18.0])
+        self.cache.solve(mesh, [0, 50], [2.0, 18.0])
+        self.assertEqual(self.cache.num_hits, 1)
+        mesh.set_int_pt_values("thrm_cond", 30.0)
+        T = self.cache.solve(mesh, [0, 50], [2.0, 18.0])
+        self.assertEqual(self.cache.num_hits, 1)
+        self.assertEqual(self.cache.num_misses, 2)
+        expected = SteadyStateSolver(mesh, [0, 50]).solve([2.0, 18.0])
+        self.assertTrue(np.allclose(T, expected))
+
+    def test_size_bounded(self):
+        self.cache.solve(_pipe_mesh(51), [0, 50], [2.0, 18.0])
+        size = self.cache.size
+        self.assertGreater(size, 0)
+        cache = SolutionCache(self.tmp.name, max_bytes=size)
+        for k in range(5):
+            cache.solve(_pipe_mesh(51), [0, 50], [float(k), 18.0])
+        self.assertLessEqual(cache.size, size)
+
+    def test_lru_eviction(self):
+        mesh = _pipe_mesh(51)
+        self.cache.solve(mesh, [0, 50], [1.0, 1.0])
+        one = self.cache.size
+        # room for the factorization and two solutions
+        cache = SolutionCache(self.tmp.name, max_bytes=one + 1000)
+        for g in ([2.0, 2.0], [1.0, 1.0], [3.0, 3.0], [1.0, 1.0]):
+            time.sleep(0.01)
+            cache.solve(mesh, [0, 50], g)
+        # [2.0, 2.0] was least recently used
+        self.assertEqual(cache.num_hits, 2)
+        cache.solve(mesh, [0, 50], [2.0, 2.0])
+        self.assertEqual(cache.num_hits, 2)
+
+    def test_clear(self):
+        self.cache.solve(_pipe_mesh(51), [0, 50], [2.0, 18.0])
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.solvers import (
+    SteadyStateSolver,
+)
+from goph420_examples.server import (
+    SolveServer,
+    query,
+)
+
+MESH = {
+    "length": 5.0,
+    "num_nodes": 21,
+    "thrm_cond": 25.0,
+    "heat_trans_coef": 2.0,
+    "perimeter": 1.5,
+    "area": 0.2,
+    "temp_inf": 35.0,
+}
+
+
+def _expected(T_0, T_L):
+    mesh = Mesh.from_coords(np.linspace(0.0, 5.0, 21))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = 25.0
+            ip.heat_trans_coef = 2.0
+            ip.perimeter = 1.5
+            ip.area = 0.2
+            ip.temp_inf = 35.0
+    return SteadyStateSolver(mesh, [0, 20]).solve([T_0, T_L])
+
+
+class TestSolveServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = SolveServer(batch_window=0.05)
+        self.port = await self.server.start_tcp()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_single_request(self):
+        response = await query(
+            {"id": 7, "mesh": MESH, "T_0": 2.0, "T_L": 18.0},
+            port=self.port,
+        )
+        self.assertEqual(response["id"], 7)
+        self.assertTrue(np.allclose(response["temps"], _expected(2.0, 18.0)))
+
+    async def test_concurrent_requests_batched(self):
+        requests = [
+            {"id": k, "mesh": MESH, "T_0": float(k), "T_L": 18.0}
+            for k in range(8)
+        ]
+        responses = await asyncio.gather(
+            *(query(r, port=self.port) for r in requests)
+        )
+        for k, response in enumerate(responses):
+            self.assertEqual(response["id"], k)
+            self.assertTrue(np.allclose(
+                response["temps"], _expected(float(k), 18.0)))
+        metrics = self.server.metrics.as_dict()
+        self.assertEqual(metrics["num_requests"], 8)
+        self.assertLess(metrics["num_batches"], 8)
+        self.assertEqual(metrics["num_solver_builds"], 1)
+
+    async def test_metrics_request(self):
+        await query({"mesh": MESH, "T_0": 1.0, "T_L": 2.0}, port=self.port)
+        response = await query({"type": "metrics"}, port=self.port)
+        metrics = response["metrics"]
+        self.assertEqual(metrics["num_requests"], 1)
+        self.assertGreater(metrics["latency_p50"], 0.0)
+        self.assertGreater(metrics["throughput"], 0.0)
+
+    async def test_invalid_request(self):
+        response = await query({"id": 3, "mesh": {}}, port=self.port)
+        self.assertEqual(response["id"], 3)
+        self.assertIn("KeyError", response["error"])
+
+    async def test_close_fails_pending_requests(self):
+        server = SolveServer(batch_window=10.0)
+        request = {"mesh": MESH, "T_0": 2.0, "T_L": 18.0}
+        batched = asyncio.ensure_future(server.submit(request))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(server.submit(request))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(server.close(), 1.0)
+        for task in (batched, queued):
+            with self.assertRaises(ConnectionError):
+                await asyncio.wait_for(task, 1.0)
+
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"),
+                         "requires Unix sockets")
+    async def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "solve.sock")
+            await self.server.start_unix(path)
+            response = await query(
+                {"mesh": MESH, "T_0": 2.0, "T_L": 18.0}, path=path)
+            self.assertTrue(np.allclose(
+                response["temps"], _expected(2.0, 18.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
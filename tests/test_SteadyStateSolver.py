@@ -0,0 +1,126 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.assembly import (
+    assemble_conduction_matrix,
+    assemble_flux_vector,
+    apply_dirichlet,
+)
+from goph420_examples.solvers import (
+    SteadyStateSolver,
+    MixedPrecisionLU,
+)
+
+
+class TestSteadyStateSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords(np.linspace(0.0, 5.0, 21))
+        for e in self.mesh.elements:
+            for ip in e.int_pts:
+                ip.thrm_cond = 25.0
+                ip.heat_trans_coef = 2.0
+                ip.perimeter = 1.5
+                ip.area = 0.2
+                ip.temp_inf = 35.0
+        self.solver = SteadyStateSolver(self.mesh, [0, 20])
+
+    def expected(self, fixed_temps):
+        H = assemble_conduction_matrix(self.mesh)
+        Q = assemble_flux_vector(self.mesh)
+        H_ff, Q_f, free = apply_dirichlet(H, Q, [0, 20], fixed_temps)
+        T = np.zeros(21)
+        T[[0, 20]] = fixed_temps
+        T[free] = np.linalg.solve(H_ff.toarray(), Q_f)
+        return T
+
+    def test_solve(self):
+        T = self.solver.solve([2.0, 18.0])
+        self.assertTrue(np.allclose(T, self.expected([2.0, 18.0])))
+
+    def test_multiple_rhs(self):
+        g = np.array([[2.0, -1.0, 0.0], [18.0, 4.0, 0.0]])
+        T = self.solver.solve(g)
+        self.assertEqual(T.shape, (21, 3))
+        for j in range(3):
+            self.assertTrue(np.allclose(T[:, j], self.expected(g[:, j])))
+
+    def test_refactor(self):
+        for e in self.mesh.elements:
+            e.int_pts[0].thrm_cond = 5.0
+        self.solver.refactor()
+        T = self.solver.solve([2.0, 18.0])
+        self.assertTrue(np.allclose(T, self.expected([2.0, 18.0])))
+
+    def test_repeated_fixed(self):
+        with self.assertRaises(ValueError):
+            SteadyStateSolver(self.mesh, [0, 0])
+
+    def test_mixed_precision(self):
+        solver = SteadyStateSolver(self.mesh, [0, 20], precision="mixed")
+        T = solver.solve([2.0, 18.0])
+        self.assertEqual(T.dtype, np.float64)
+        self.assertTrue(solver.factorization.stats.converged)
+        self.assertTrue(np.allclose(
+            T, self.expected([2.0, 18.0]), rtol=1e-11, atol=0.0))
+
+    def test_invalid_precision(self):
+        with self.assertRaises(ValueError):
+            SteadyStateSolver(self.mesh, [0, 20], precision="half")
+
+
+class TestSteadyStateSolverSingle(unittest.TestCase):
+
+    def setUp(self):
+        self.meshes = [
+            Mesh.from_coords(np.linspace(0.0, 5.0, 21), dtype=dtype)
+            for dtype in (np.float32, np.float64)
+        ]
+        for mesh in self.meshes:
+            for e in mesh.elements:
+                for ip in e.int_pts:
+                    ip.thrm_cond = 25.0
+                    ip.heat_trans_coef = 2.0
+                    ip.perimeter = 1.5
+                    ip.area = 0.2
+                    ip.temp_inf = 35.0
+
+    def test_single_precision(self):
+        T32, T64 = (SteadyStateSolver(mesh, [0, 20]).solve([2.0, 18.0])
+                    for mesh in self.meshes)
+        self.assertEqual(T32.dtype, np.float32)
+        self.assertTrue(np.allclose(T32, T64, rtol=1e-4))
+
+
+class TestMixedPrecisionLU(unittest.TestCase):
+
+    def setUp(self):
+        n = 50
+        rng = np.random.default_rng(1)
+        self.A = (np.diag(np.full(n, 4.0)) + np.diag(np.ones(n - 1), 1)
+                  + 0.1 * rng.standard_normal((n, n)))
+        self.b = rng.standard_normal((n, 2))
+        self.lu = MixedPrecisionLU(self.A)
+
+    def test_solve(self):
+        x = self.lu.solve(self.b)
+        self.assertTrue(np.allclose(x, np.linalg.solve(self.A, self.b),
+                                    rtol=1e-12, atol=1e-12))
+        self.assertTrue(self.lu.stats.converged)
+        self.assertGreater(self.lu.stats.iterations, 0)
+
+    def test_solve_transposed(self):
+        x = self.lu.solve(self.b[:, 0], trans="T")
+        expected = np.linalg.solve(self.A.T, self.b[:, 0])
+        self.assertTrue(np.allclose(x, expected, rtol=1e-12, atol=1e-12))
+
+    def test_single_precision_factors(self):
+        self.assertEqual(self.lu.lu.L.dtype, np.float32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.solvers import (
+    SteadyStateSolver,
+)
+from goph420_examples.adjoint import (
+    adjoint_sensitivities,
+    probe_misfit,
+)
+
+
+class TestAdjointSensitivities(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords(np.linspace(0.0, 5.0, 21))
+        rng = np.random.default_rng(42)
+        for e in self.mesh.elements:
+            for ip in e.int_pts:
+                ip.thrm_cond = 25.0 * rng.uniform(0.5, 1.5)
+                ip.heat_trans_coef = 2.0 * rng.uniform(0.5, 1.5)
+                ip.perimeter = 1.5
+                ip.area = 0.2
+                ip.temp_inf = 35.0
+        self.xs = np.array([0.3, 1.7, 2.2, 4.1])
+        self.observed = np.array([10.0, 20.0, 25.0, 21.0])
+
+    def misfit(self):
+        solver = SteadyStateSolver(self.mesh, [0, 20])
+        T = solver.solve([2.0, 18.0])
+        J, dJ_dT = probe_misfit(self.mesh.locator, T, self.xs, self.observed)
+        return J, dJ_dT, solver, T
+
+    def finite_difference(self, k, name):
+        ip = self.mesh.elements[k].int_pts[0]
+        value = getattr(ip, name)
+        eps = 1.0e-6 * value
+        setattr(ip, name, value + eps)
+        J_plus = self.misfit()[0]
+        setattr(ip, name, value - eps)
+        J_minus = self.misfit()[0]
+        setattr(ip, name, value)
+        return (J_plus - J_minus) / (2.0 * eps)
+
+    def test_gradients(self):
+        _, dJ_dT, solver, T = self.misfit()
+        sens = adjoint_sensitivities(solver, T, dJ_dT)
+        self.assertEqual(sens.thrm_cond.shape, (20,))
+        for k in (0, 7, 19):
+            for name in ("thrm_cond", "heat_trans_coef"):
+                self.assertAlmostEqual(
+                    getattr(sens, name)[k],
+                    self.finite_difference(k, name),
+                    delta=1e-5 * max(1.0, abs(getattr(sens, name)[k])),
+                )
+
+    def test_misfit_outside(self):
+        T = np.zeros(self.mesh.num_nodes)
+        with self.assertRaises(ValueError):
+            probe_misfit(self.mesh.locator, T, [6.0], [1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.assembly import (
+    assemble_conduction_matrix,
+    assemble_storage_matrix,
+    assemble_flux_vector,
+    apply_dirichlet,
+)
+
+
+def _loop_assembly(mesh):
+    n = mesh.num_nodes
+    H = np.zeros((n, n))
+    C = np.zeros((n, n))
+    Q = np.zeros(n)
+    for e in mesh.elements:
+        ind = [nd.index for nd in e.nodes]
+        H[np.ix_(ind, ind)] += e.conduction_matrix
+        C[np.ix_(ind, ind)] += e.storage_matrix
+        Q[ind] += e.flux_vector
+    return H, C, Q
+
+
+class TestAssembly(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords(np.linspace(0.0, 2.0, 6) ** 2)
+        for k, e in enumerate(self.mesh.elements):
+            for ip in e.int_pts:
+                ip.thrm_cond = 1.0 + k
+                ip.density = 2.0
+                ip.spec_heat_cap = 3.0
+                ip.heat_trans_coef = 0.5
+                ip.perimeter = 1.5
+                ip.area = 0.25
+                ip.temp_inf = 10.0 - k
+        self.H, self.C, self.Q = _loop_assembly(self.mesh)
+
+    def test_conduction_matrix(self):
+        H = assemble_conduction_matrix(self.mesh)
+        self.assertTrue(np.allclose(H.toarray(), self.H))
+
+    def test_storage_matrix(self):
+        C = assemble_storage_matrix(self.mesh)
+        self.assertTrue(np.allclose(C.toarray(), self.C))
+
+    def test_flux_vector(self):
+        Q = assemble_flux_vector(self.mesh)
+        self.assertTrue(np.allclose(Q, self.Q))
+
+    def test_single_precision(self):
+        mesh = Mesh.from_coords(self.mesh.coords, dtype=np.float32)
+        for e, e64 in zip(mesh.elements, self.mesh.elements):
+            for ip, ip64 in zip(e.int_pts, e64.int_pts):
+                for name in ("thrm_cond", "density", "spec_heat_cap",
+                             "heat_trans_coef", "perimeter", "area",
+                             "temp_inf"):
+                    setattr(ip, name, getattr(ip64, name))
+        H = assemble_conduction_matrix(mesh)
+        Q = assemble_flux_vector(mesh)
+        self.assertEqual(H.dtype, np.float32)
+        self.assertEqual(Q.dtype, np.float32)
+        self.assertTrue(np.allclose(H.toarray(), self.H, rtol=1e-6))
+        self.assertTrue(np.allclose(Q, self.Q, rtol=1e-6))
+
+    def test_apply_dirichlet(self):
+        H = assemble_conduction_matrix(self.mesh)
+        H_ff, Q_f, free = apply_dirichlet(H, self.Q, [0, 5], [2.0, 18.0])
+        Q_expected = self.Q - self.H[:, 0] * 2.0 - self.H[:, -1] * 18.0
+        self.assertTrue(np.array_equal(free, [1, 2, 3, 4]))
+        self.assertTrue(np.allclose(H_ff.toarray(), self.H[1:-1, 1:-1]))
+        self.assertTrue(np.allclose(Q_f, Q_expected[1:-1]))
+
+    def test_apply_dirichlet_repeated(self):
+        with self.assertRaises(ValueError):
+            apply_dirichlet(self.H, self.Q, [0, 0], [1.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
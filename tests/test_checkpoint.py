@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.transient import (
+    ExplicitIntegrator,
+)
+from goph420_examples.checkpoint import (
+    Checkpointer,
+    mesh_fingerprint,
+    read_checkpoint,
+    write_checkpoint,
+)
+
+
+def _unit_mesh(num_nodes, thrm_cond=1.0):
+    mesh = Mesh.from_coords(np.linspace(0.0, 1.0, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = thrm_cond
+            ip.density = 1.0
+            ip.spec_heat_cap = 1.0
+            ip.perimeter = 1.0
+            ip.area = 1.0
+            ip.heat_trans_coef = 0.5
+            ip.temp_inf = 1.0
+    return mesh
+
+
+class TestMeshFingerprint(unittest.TestCase):
+
+    def test_equal_meshes(self):
+        self.assertEqual(mesh_fingerprint(_unit_mesh(11)),
+                         mesh_fingerprint(_unit_mesh(11)))
+
+    def test_changed_property(self):
+        self.assertNotEqual(mesh_fingerprint(_unit_mesh(11)),
+                            mesh_fingerprint(_unit_mesh(11, thrm_cond=2.0)))
+
+    def test_changed_property_same_mesh(self):
+        mesh = _unit_mesh(11)
+        fingerprint = mesh_fingerprint(mesh)
+        self.assertEqual(mesh_fingerprint(mesh), fingerprint)
+        mesh.elements[3].int_pts[0].thrm_cond = 2.0
+        changed = mesh_fingerprint(mesh)
+        self.assertNotEqual(changed, fingerprint)
+        mesh.set_int_pt_values("area", 3.0)
+        self.assertNotEqual(mesh_fingerprint(mesh), changed)
+
+    def test_ignores_int_pt_temps(self):
+        mesh = _unit_mesh(11)
+        fingerprint = mesh_fingerprint(mesh)
+        mesh.elements[0].int_pts[0].temp = 5.0
+        self.assertEqual(mesh_fingerprint(mesh), fingerprint)
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "run.ckpt")
+        self.T0 = np.sin(np.pi * np.linspace(0.0, 1.0, 21))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _integrator(self, mesh):
+        return ExplicitIntegrator(mesh, [0, 20], [0.0, 2.0],
+                                  temps=self.T0, method="rk2")
+
+    def test_resume_bit_for_bit(self):
+        reference = self._integrator(_unit_mesh(21))
+        reference.step(100)
+
+        mesh = _unit_mesh(21)
+        it = self._integrator(mesh)
+        it.step(40)
+        write_checkpoint(self.path, it)
+        resumed = read_checkpoint(self.path, mesh)
+        self.assertEqual(resumed.step_count, 40)
+        self.assertEqual(resumed.time, it.time)
+        self.assertEqual(resumed.dt, it.dt)
+        resumed.step(60)
+        self.assertTrue(np.array_equal(resumed.temps, reference.temps))
+        self.assertEqual(resumed.time, reference.time)
+
+    def test_int_pt_temps_restored(self):
+        mesh = _unit_mesh(21)
+        mesh.elements[3].int_pts[0].temp = 7.5
+        write_checkpoint(self.path, self._integrator(mesh))
+        mesh.elements[3].int_pts[0].temp = 0.0
+        read_checkpoint(self.path, mesh)
+        self.assertEqual(mesh.elements[3].int_pts[0].temp, 7.5)
+
+    def test_changed_mesh_reassembles(self):
+        it = self._integrator(_unit_mesh(21))
+        it.step(10)
+        write_checkpoint(self.path, it)
+        mesh = _unit_mesh(21, thrm_cond=0.5)
+        resumed = read_checkpoint(self.path, mesh)
+        self.assertEqual(resumed.step_count, 10)
+        self.assertTrue(np.array_equal(resumed.temps, it.temps))
+        self.assertAlmostEqual(resumed.stable_dt, 2.0 * it.stable_dt,
+                               delta=0.1 * it.stable_dt)
+
+    def test_wrong_mesh_size(self):
+        write_checkpoint(self.path, self._integrator(_unit_mesh(21)))
+        with self.assertRaises(ValueError):
+            read_checkpoint(self.path, _unit_mesh(11))
+
+    def test_no_temporary_files(self):
+        write_checkpoint(self.path, self._integrator(_unit_mesh(21)))
+        write_checkpoint(self.path, self._integrator(_unit_mesh(21)))
+        self.assertEqual(os.listdir(self.tmp.name), ["run.ckpt"])
+
+    def test_checkpointer_interval(self):
+        mesh = _unit_mesh(21)
+        it = self._integrator(mesh)
+        with Checkpointer(self.path, interval=30) as checkpointer:
+            checkpointer.step(it, 100)
+        self.assertEqual(it.step_count, 100)
+        resumed = read_checkpoint(self.path, mesh)
+        self.assertEqual(resumed.step_count, 90)
+
+    def test_checkpointer_snapshot(self):
+        mesh = _unit_mesh(21)
+        it = self._integrator(mesh)
+        it.step(5)
+        expected = it.temps.copy()
+        with Checkpointer(self.path) as checkpointer:
+            checkpointer.save(it)
+            it.step(5)
+        self.assertTrue(np.array_equal(
+            read_checkpoint(self.path, mesh).temps, expected))
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            Checkpointer(self.path, interval=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.functions import (
+    fin_temperature,
+)
+
+PARAMS = dict(
+    length=5.0,
+    temp_0=2.0,
+    temp_L=18.0,
+    temp_inf=35.0,
+    thrm_cond=25.0,
+    heat_trans_coef=2.0,
+    perimeter=np.pi * 0.5,
+    area=0.25 * np.pi * 0.5 ** 2,
+)
+
+
+class TestFinTemperature(unittest.TestCase):
+
+    def test_end_temperatures(self):
+        T = fin_temperature([0.0, 5.0], **PARAMS)
+        self.assertTrue(np.allclose(T, [2.0, 18.0]))
+
+    def test_scalar(self):
+        T = fin_temperature(2.5, **PARAMS)
+        self.assertEqual(np.shape(T), ())
+
+    def test_satisfies_fin_equation(self):
+        x = np.linspace(0.0, 5.0, 2001)
+        T = fin_temperature(x, **PARAMS)
+        h = x[1] - x[0]
+        d2T = (T[2:] - 2.0 * T[1:-1] + T[:-2]) / h ** 2
+        m2 = (PARAMS["heat_trans_coef"] * PARAMS["perimeter"]
+              / (PARAMS["thrm_cond"] * PARAMS["area"]))
+        residual = d2T - m2 * (T[1:-1] - PARAMS["temp_inf"])
+        self.assertLess(np.abs(residual).max(), 1.0e-4)
+
+    def test_long_fin_no_overflow(self):
+        params = dict(PARAMS, length=1.0e4)
+        x = np.linspace(0.0, 1.0e4, 11)
+        T = fin_temperature(x, **params)
+        self.assertTrue(np.all(np.isfinite(T)))
+        self.assertAlmostEqual(T[5], 35.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.assembly import (
+    assemble_flux_vector,
+    assemble_source_vector,
+    assemble_unit_flux_vector,
+)
+from goph420_examples.forcing import (
+    TimeSeries,
+)
+from goph420_examples.transient import (
+    ExplicitIntegrator,
+)
+from goph420_examples.checkpoint import (
+    read_checkpoint,
+    write_checkpoint,
+)
+
+
+def _unit_mesh(num_nodes, temp_inf=0.0):
+    mesh = Mesh.from_coords(np.linspace(0.0, 1.0, num_nodes))
+    for e in mesh.elements:
+        for ip in e.int_pts:
+            ip.thrm_cond = 1.0
+            ip.density = 1.0
+            ip.spec_heat_cap = 1.0
+            ip.perimeter = 2.0
+            ip.area = 1.0
+            ip.heat_trans_coef = 0.5
+            ip.temp_inf = temp_inf
+    return mesh
+
+
+class TestTimeSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.series = TimeSeries([0.0, 1.0, 3.0], [2.0, 4.0, 0.0])
+
+    def test_table_values(self):
+        for t, v in zip(self.series.times, self.series.values):
+            self.assertEqual(self.series(t), v)
+
+    def test_interpolation(self):
+        self.assertAlmostEqual(self.series(0.5), 3.0)
+        self.assertAlmostEqual(self.series(2.0), 2.0)
+
+    def test_hold_outside(self):
+        self.assertEqual(self.series(-1.0), 2.0)
+        self.assertEqual(self.series(10.0), 0.0)
+
+    def test_vectorized(self):
+        t = np.linspace(-1.0, 4.0, 101)
+        expected = np.interp(t, self.series.times, self.series.values)
+        self.assertTrue(np.allclose(self.series(t), expected))
+
+    def test_channels(self):
+        series = TimeSeries([0.0, 2.0], [[0.0, 10.0], [2.0, 20.0]])
+        self.assertTrue(np.allclose(series(1.0), [1.0, 15.0]))
+        self.assertEqual(series([0.0, 1.0, 2.0]).shape, (3, 2))
+
+    def test_single_time(self):
+        series = TimeSeries([1.0], [5.0])
+        self.assertEqual(series(0.0), 5.0)
+        self.assertEqual(series(2.0), 5.0)
+
+    def test_read_only(self):
+        with self.assertRaises(ValueError):
+            self.series.values[0] = 1.0
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TimeSeries([0.0, 0.0], [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            TimeSeries([0.0, 1.0], [1.0, 2.0, 3.0])
+        with self.assertRaises(ValueError):
+            TimeSeries([], [])
+
+
+class TestUnitVectors(unittest.TestCase):
+
+    def test_unit_flux_scales(self):
+        mesh = _unit_mesh(11, temp_inf=3.0)
+        self.assertTrue(np.allclose(
+            3.0 * assemble_unit_flux_vector(mesh),
+            assemble_flux_vector(mesh),
+        ))
+
+    def test_source_vector(self):
+        mesh = _unit_mesh(11)
+        self.assertAlmostEqual(assemble_source_vector(mesh).sum(), 1.0)
+
+
+class TestForcedIntegrator(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.linspace(0.0, 1.0, 21)
+        self.T0 = np.sin(np.pi * self.x)
+
+    def test_constant_temp_inf(self):
+        static = ExplicitIntegrator(
+            _unit_mesh(21, temp_inf=3.0), [0, 20], [0.0, 0.0],
+            temps=self.T0, method="rk4")
+        forced = ExplicitIntegrator(
+            _unit_mesh(21), [0, 20], [0.0, 0.0], temps=self.T0,
+            method="rk4", temp_inf=TimeSeries([0.0], [3.0]))
+        static.step(200)
+        forced.step(200)
+        self.assertTrue(np.allclose(forced.temps, static.temps))
+
+    def test_fixed_temps_history(self):
+        ramp = TimeSeries([0.0, 1.0], [[0.0, 0.0], [4.0, -2.0]])
+        it = ExplicitIntegrator(_unit_mesh(21), [0, 20], ramp,
+                                method="rk2")
+        it.advance_to(0.25)
+        self.assertAlmostEqual(it.temps[0], 1.0)
+        self.assertAlmostEqual(it.temps[-1], -0.5)
+
+    def test_source_steady_state(self):
+        mesh = Mesh.from_coords(self.x)
+        for e in mesh.elements:
+            for ip in e.int_pts:
+                ip.thrm_cond = 1.0
+                ip.density = 1.0
+                ip.spec_heat_cap = 1.0
+                ip.perimeter = 1.0
+                ip.area = 1.0
+        it = ExplicitIntegrator(mesh, [0, 20], [0.0, 0.0],
+                                source=TimeSeries([0.0], [8.0]))
+        it.advance_to(2.0)
+        expected = 4.0 * self.x * (1.0 - self.x)
+        self.assertTrue(np.allclose(it.temps, expected, atol=1e-6))
+
+    def test_invalid_channels(self):
+        with self.assertRaises(ValueError):
+            ExplicitIntegrator(_unit_mesh(21), [0, 20],
+                               TimeSeries([0.0], [[1.0, 2.0, 3.0]]))
+        with self.assertRaises(ValueError):
+            ExplicitIntegrator(_unit_mesh(21),
+                               temp_inf=TimeSeries([0.0], [[1.0, 2.0]]))
+
+    def test_checkpoint_resume(self):
+        kwargs = dict(
+            fixed=[0, 20],
+            fixed_temps=TimeSeries([0.0, 0.1], [[0.0, 0.0], [1.0, 2.0]]),
+            temp_inf=TimeSeries([0.0, 0.05, 0.1], [0.0, 5.0, 1.0]),
+            source=TimeSeries([0.0, 0.1], [1.0, 0.0]),
+            method="rk4",
+        )
+        reference = ExplicitIntegrator(_unit_mesh(21), **kwargs)
+        reference.step(150)
+        mesh = _unit_mesh(21)
+        it = ExplicitIntegrator(mesh, **kwargs)
+        it.step(70)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "run.ckpt")
+            write_checkpoint(path, it)
+            resumed = read_checkpoint(path, mesh)
+        resumed.step(80)
+        self.assertTrue(np.array_equal(resumed.temps, reference.temps))
+
+
+if __name__ == "__main__":
+    unittest.main()
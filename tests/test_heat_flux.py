@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.mesh import (
+    Mesh,
+)
+from goph420_examples.postprocess import (
+    temperature_gradients,
+    heat_flux,
+)
+
+
+class TestHeatFlux(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.from_coords([0.0, 1.0, 3.0, 4.0])
+        for k, e in enumerate(self.mesh.elements):
+            for ip in e.int_pts:
+                ip.thrm_cond = 2.0 + k
+                ip.heat_trans_coef = 0.5
+                ip.perimeter = 2.0
+                ip.area = 0.25
+                ip.temp_inf = 1.0
+        self.temps = 3.0 * self.mesh.coords + 1.0
+        self.result = heat_flux(self.mesh, self.temps)
+
+    def test_gradients(self):
+        grad = temperature_gradients(self.mesh, self.temps)
+        self.assertEqual(grad.shape, (3, 1))
+        self.assertTrue(np.allclose(grad, 3.0))
+        self.assertTrue(np.allclose(self.result.gradients, 3.0))
+
+    def test_conductive_flux(self):
+        expected = -3.0 * np.array([[2.0], [3.0], [4.0]])
+        self.assertTrue(np.allclose(self.result.conductive_flux, expected))
+
+    def test_convective_loss(self):
+        # h * P * integral of (3 x) over each element
+        x0 = np.array([0.0, 1.0, 3.0])
+        x1 = np.array([1.0, 3.0, 4.0])
+        expected = 0.5 * 2.0 * 1.5 * (x1 ** 2 - x0 ** 2)
+        self.assertTrue(np.allclose(self.result.convective_loss, expected))
+
+    def test_nodal_flux(self):
+        expected = np.array([-6.0, (-6.0 - 18.0) / 3.0,
+                             (-18.0 - 12.0) / 3.0, -12.0])
+        self.assertTrue(np.allclose(self.result.nodal_flux, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from goph420_examples.mesh import (  # noqa: E402
+    Mesh,
+)
+from goph420_examples.plotting import (  # noqa: E402
+    decimate,
+    lttb_decimate,
+    minmax_decimate,
+    plot_field,
+    plot_mesh,
+)
+
+
+class TestDecimate(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.linspace(0.0, 1.0, 100001)
+        self.y = np.sin(20.0 * self.x) + 0.1 * rng.standard_normal(
+            len(self.x))
+
+    def test_minmax_size(self):
+        keep = minmax_decimate(self.x, self.y, 500)
+        self.assertLessEqual(len(keep), 2000)
+        self.assertTrue(np.all(np.diff(keep) > 0))
+        self.assertEqual(keep[0], 0)
+        self.assertEqual(keep[-1], len(self.x) - 1)
+
+    def test_minmax_preserves_envelope(self):
+        num_buckets = 500
+        keep = minmax_decimate(self.x, self.y, num_buckets)
+        bucket = np.minimum((self.x * num_buckets).astype(int),
+                            num_buckets - 1)
+        for b in (0, 137, num_buckets - 1):
+            in_b = bucket == b
+            kept = bucket[keep] == b
+            self.assertEqual(self.y[keep][kept].max(), self.y[in_b].max())
+            self.assertEqual(self.y[keep][kept].min(), self.y[in_b].min())
+
+    def test_minmax_keeps_spike(self):
+        y = np.zeros(len(self.x))
+        y[54321] = 10.0
+        self.assertIn(54321, minmax_decimate(self.x, y, 100))
+
+    def test_short_input_unchanged(self):
+        x = np.arange(10.0)
+        self.assertTrue(np.array_equal(minmax_decimate(x, x, 5),
+                                       np.arange(10)))
+        self.assertTrue(np.array_equal(lttb_decimate(x, x, 20),
+                                       np.arange(10)))
+
+    def test_lttb(self):
+        keep = lttb_decimate(self.x, self.y, 300)
+        self.assertEqual(len(keep), 300)
+        self.assertTrue(np.all(np.diff(keep) > 0))
+        self.assertEqual(keep[0], 0)
+        self.assertEqual(keep[-1], len(self.x) - 1)
+
+    def test_lttb_keeps_spike(self):
+        y = np.zeros(len(self.x))
+        y[54321] = 10.0
+        self.assertIn(54321, lttb_decimate(self.x, y, 100))
+
+    def test_decimate_invalid_method(self):
+        with self.assertRaises(ValueError):
+            decimate(self.x, self.y, 100, method="stride")
+
+
+class TestPlotHelpers(unittest.TestCase):
+
+    def setUp(self):
+        self.fig, self.ax = plt.subplots(figsize=(4.0, 2.0), dpi=100)
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def test_plot_field_bounded_by_pixels(self):
+        x = np.linspace(0.0, 1.0, 200001)
+        line, = plot_field(self.ax, x, np.sin(50.0 * x), "-r")
+        width = self.ax.get_window_extent().width
+        self.assertLessEqual(len(line.get_xdata()), 4 * width)
+
+    def test_plot_mesh_labels_small(self):
+        mesh = Mesh.from_coords(np.linspace(0.0, 1.0, 11))
+        plot_mesh(self.ax, mesh)
+        self.assertEqual(len(self.ax.texts), 21)
+        nodes, int_pts = self.ax.lines
+        self.assertTrue(np.allclose(nodes.get_xdata(), mesh.coords))
+        self.assertTrue(np.allclose(int_pts.get_xdata(),
+                                    mesh.int_pt_values("x").ravel()))
+
+    def test_plot_mesh_large(self):
+        mesh = Mesh.from_coords(np.linspace(0.0, 1.0, 20001))
+        plot_mesh(self.ax, mesh, max_points=300)
+        self.assertEqual(len(self.ax.texts), 0)
+        for line in self.ax.lines:
+            self.assertLessEqual(len(line.get_xdata()), 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from goph420_examples.interpolation import (
+    shape,
+    shape_deriv,
+    reference_matrices,
+)
+
+
+class TestShapeArrayInput(unittest.TestCase):
+
+    def test_scalar_shape(self):
+        self.assertEqual(shape(0.25).shape, (1, 2))
+
+    def test_array_values(self):
+        s = np.array([0.0, 0.25, 1.0])
+        expected = np.array([[1.0, 0.0], [0.75, 0.25], [0.0, 1.0]])
+        self.assertTrue(np.allclose(shape(s), expected))
+
+    def test_deriv_values(self):
+        s = np.array([0.0, 0.5])
+        expected = np.array([[-1.0, 1.0], [-1.0, 1.0]])
+        self.assertTrue(np.allclose(shape_deriv(s), expected))
+
+    def test_invalid_str(self):
+        with self.assertRaises(ValueError):
+            shape("one")
+
+    def test_invalid_2d(self):
+        with self.assertRaises(ValueError):
+            shape(np.zeros((2, 2)))
+
+
+class TestReferenceMatricesLinear(unittest.TestCase):
+
+    def setUp(self):
+        self.mass, self.stiffness, self.load = reference_matrices(1)
+
+    def test_mass(self):
+        expected = np.array([[2.0, 1.0], [1.0, 2.0]]) / 6.0
+        self.assertTrue(np.allclose(self.mass, expected))
+
+    def test_stiffness(self):
+        expected = np.array([[1.0, -1.0], [-1.0, 1.0]])
+        self.assertTrue(np.allclose(self.stiffness, expected))
+
+    def test_load(self):
+        self.assertTrue(np.allclose(self.load, [0.5, 0.5]))
+
+    def test_cached(self):
+        self.assertIs(reference_matrices(1)[0], self.mass)
+
+    def test_read_only(self):
+        with self.assertRaises(ValueError):
+            self.mass[0, 0] = 1.0
+
+    def test_invalid_order(self):
+        with self.assertRaises(ValueError):
+            reference_matrices(4)
+
+    def test_invalid_num_quad_pts(self):
+        with self.assertRaises(ValueError):
+            reference_matrices(1, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()